@@ -0,0 +1,99 @@
+"""
+Benchmark: loading one cases parquet into Postgres, rows/sec.
+
+Compares the old `DataFrame.to_sql(method="multi", chunksize=1000)` path with
+`ingest_sql.copy_parquet` (Arrow batches → CSV → COPY into a staging table →
+INSERT … SELECT). Both load into a scratch table shaped like `cases` in the
+database DATABASE_URL points at – keyed like it too, so on the partitioned
+schema the merge runs on (case_id, filing_date) as ingest's does; the
+scratch table is dropped afterwards.
+
+    python -m benchmarks.bench_ingest                 # 200k rows
+    python -m benchmarks.bench_ingest --rows 1e6
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import text
+
+from src.data import partitions
+from src.data.ingest_sql import WANTED_COLS, copy_parquet, ensure_schema
+from src.data.nos_map import NOS_MAP
+from src.data.transform import SCHEMA
+from src.utils.db import get_engine
+
+SCRATCH = "cases_bench"
+
+
+def synthetic(path: Path, rows: int, seed: int = 0) -> None:
+    rng   = np.random.default_rng(seed)
+    ids   = np.arange(1, rows + 1, dtype=np.int64)
+    filed = np.datetime64("2000-01-01") + rng.integers(0, 9000, rows).astype("timedelta64[D]")
+    codes = rng.choice(np.array(sorted(NOS_MAP), dtype=np.int16), rows)
+    tbl = pa.table({
+        "case_id":                ids,
+        "url":                    pa.array([f"/docket/{i}/x/" for i in ids]),
+        "court_slug":             pa.array(rng.choice(["dcd", "nysd", "cand", "txsd"], rows)),
+        "docket_number":          pa.array([f"1:{i % 100:02d}-cv-{i:05d}" for i in ids]),
+        "filing_date":            pa.array(filed, pa.date32()),
+        "closing_date":           pa.array(filed + rng.integers(30, 900, rows).astype("timedelta64[D]"),
+                                           pa.date32(), mask=rng.random(rows) < 0.3),
+        "nature_of_suit":         pa.array([f"{c} {NOS_MAP[c]}" for c in codes]),
+        "nature_of_suit_numeric": pa.array(codes, pa.int16()),
+        "judge_id":               pa.array(rng.integers(1, 2000, rows), pa.int64()),
+    }, schema=SCHEMA)
+    pq.write_table(tbl, path, compression="zstd")
+
+
+def _reset(engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {SCRATCH}"))
+        conn.execute(text(f"CREATE TABLE {SCRATCH} (LIKE cases INCLUDING ALL)"))
+
+
+def to_sql_multi(engine, path: Path) -> int:
+    df = pd.read_parquet(path).reindex(columns=WANTED_COLS)
+    df.to_sql(SCRATCH, engine, if_exists="append", index=False, method="multi", chunksize=1000)
+    return len(df)
+
+
+def copy(engine, path: Path) -> int:
+    with engine.connect() as conn:
+        # LIKE copies the primary key, which is (case_id, filing_date) on the partitioned schema
+        partitioned = partitions.is_partitioned(conn)
+        conn.commit()
+        return copy_parquet(conn, path, target=SCRATCH, partitioned=partitioned)["inserted"]
+
+
+def main(rows: int = 200_000) -> None:
+    ensure_schema()
+    engine = get_engine()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "cases.parquet"
+        synthetic(path, rows)
+        print(f"{rows:,} rows, {path.stat().st_size / 2**20:.1f} MiB parquet")
+        try:
+            for label, load in (("to_sql(method='multi')", to_sql_multi),
+                                ("COPY via staging table", copy)):
+                _reset(engine)
+                t0 = time.perf_counter()
+                n  = load(engine, path)
+                dt = time.perf_counter() - t0
+                print(f"  {label:<26} {n:>10,} rows  {dt:7.2f}s  {n / dt:>10,.0f} rows/s")
+        finally:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP TABLE IF EXISTS {SCRATCH}"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=float, default=200_000)
+    main(int(parser.parse_args().rows))
@@ -0,0 +1,82 @@
+"""
+Microbenchmark: NOS code parsing + title/chapter lookup on synthetic rows.
+
+Compares the per-row regex / dict path the transform and treemap used to take
+with the dense-array helpers in `src.data.nos_map`, and checks both agree.
+
+    python -m benchmarks.bench_nos              # 10M rows
+    python -m benchmarks.bench_nos --rows 1e6
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.data import nos_map
+
+
+def synthetic(rows: int, seed: int = 0) -> pa.Array:
+    """`"<code> <title>"` strings like the API serves, ~5 % junk / null."""
+    rng    = np.random.default_rng(seed)
+    labels = [f"{c} {t}" for c, t in nos_map.NOS_MAP.items()] + ["Unknown", "Other", None]
+    weights = np.r_[np.full(len(labels) - 3, 0.95 / (len(labels) - 3)), [0.02, 0.02, 0.01]]
+    pick   = rng.choice(len(labels), size=rows, p=weights)
+    return pa.DictionaryArray.from_arrays(pa.array(pick, pa.int32()), pa.array(labels)).cast(pa.string())
+
+
+def _timed(label: str, fn, *args):
+    t0  = time.perf_counter()
+    out = fn(*args)
+    print(f"  {label:<42} {time.perf_counter() - t0:7.3f}s")
+    return out
+
+
+# ── the old paths ─────────────────────────────────────────────────────
+def regex_arrow(arr: pa.Array) -> np.ndarray:
+    code = pc.struct_field(pc.extract_regex(arr, r"^(?P<code>\d{3})"), [0]).cast(pa.int16())
+    return code.fill_null(-1).to_numpy()
+
+def regex_pandas(s: pd.Series) -> pd.Series:
+    return s.str.extract(r"^(\d{3})", expand=False).astype("float")
+
+def dict_lookup(codes: pd.Series) -> tuple[pd.Series, pd.Series]:
+    return codes.map(nos_map.NOS_MAP), codes.map(nos_map.NOS_CHAPTER)
+
+
+# ── the dense-array paths ─────────────────────────────────────────────
+def dense_lookup(codes: np.ndarray) -> tuple[pd.Categorical, pd.Categorical]:
+    return nos_map.nos_categorical(codes), nos_map.chapter_categorical(codes)
+
+
+def main(rows: int = 10_000_000) -> None:
+    arr = synthetic(rows)
+    ser = arr.to_pandas()
+    print(f"{rows:,} rows")
+
+    print("parse")
+    old_arrow  = _timed("pyarrow extract_regex", regex_arrow, arr)
+    old_pandas = _timed("pandas str.extract", regex_pandas, ser)
+    new        = _timed("nos_map.parse_codes (arrow buffers)", nos_map.parse_codes, arr)
+    assert (old_arrow == new).all()
+    assert (old_pandas.fillna(-1).to_numpy() == new).all()
+
+    print("lookup (title, chapter)")
+    titles, chapters = _timed("Series.map(dict) ×2", dict_lookup, pd.Series(new))
+    cat_nos, cat_ch  = _timed("dense arrays → categoricals", dense_lookup, new)
+    assert (pd.Series(cat_ch).astype(object).fillna("-").to_numpy()
+            == chapters.fillna("-").to_numpy()).all()
+    assert (pd.Series(nos_map.titles(new)).fillna("-").to_numpy()
+            == titles.fillna("-").to_numpy()).all()
+    print(f"  memory: title strings {titles.memory_usage(deep=True) / 2**20:.0f} MiB"
+          f" vs categorical {cat_nos.memory_usage(deep=True) / 2**20:.0f} MiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=float, default=10_000_000)
+    main(int(parser.parse_args().rows))
@@ -1,10 +1,9 @@
 import streamlit as st
 import pandas as pd
 from datetime import date
-from sqlalchemy import text
 from dashboard import data_access as da
 from dashboard import charts as ch
-from dashboard.data_access import days_to_close_df
+from dashboard.query_plan import QueryPlan
 
 st.set_page_config(page_title="Case Landscape Dashboard",
                    layout="wide",
@@ -12,12 +11,7 @@ st.set_page_config(page_title="Case Landscape Dashboard",
                    initial_sidebar_state="expanded")
 
 # ── Sidebar filters ───────────────────────────────────
-min_dt = pd.to_datetime(
-    pd.read_sql("SELECT MIN(filing_date) FROM cases", da.ENG).iat[0, 0]
-).date()
-max_dt = pd.to_datetime(
-    pd.read_sql("SELECT MAX(filing_date) FROM cases", da.ENG).iat[0, 0]
-).date()
+min_dt, max_dt = da.date_bounds()
 
 start_dt, end_dt = st.sidebar.date_input(
     "Date Range",
@@ -26,10 +20,7 @@ start_dt, end_dt = st.sidebar.date_input(
     max_value=max_dt,
 )
 
-courts_all = sorted(
-    pd.read_sql("SELECT DISTINCT court_slug FROM cases ORDER BY 1", da.ENG)
-      .court_slug.tolist()
-)
+courts_all = da.court_slugs()
 court_options = ["All", "Top 5 (by count)"] + courts_all
 
 court_raw = st.sidebar.multiselect("District Court", court_options, default=[])
@@ -91,196 +82,113 @@ sort_dir  = st.sidebar.selectbox(
 )
 asc_flag = (sort_dir == "Ascending")
 
-# ── KPI row ──────────────────────────────────────────────────────────
-# 1. build param dict & WHERE pieces
-kpi_params = {"start": start_dt, "end": end_dt}
-extra_clauses = []
-
-if courts_sel:                                   # list[str]
-    kpi_params["courts"] = courts_sel
-    extra_clauses.append("AND court_slug = ANY(:courts)")
-
-if nos_codes:                                    # list[int]
-    kpi_params["codes"] = nos_codes
-    extra_clauses.append("AND nature_of_suit_numeric = ANY(:codes)")
-
-kpi_extra = "\n           ".join(extra_clauses)   # joined into one string
-
-# 2. queries that share the same params / extra WHERE
-total_cases = pd.read_sql(
-    text(f"""
-        SELECT COUNT(*) AS n
-          FROM cases
-         WHERE filing_date BETWEEN :start AND :end
-           {kpi_extra}
-    """),
-    da.ENG, params=kpi_params,
-).iat[0, 0]
-
-closed = pd.read_sql(
-    text(f"""
-        SELECT COUNT(*) AS n
-          FROM cases
-         WHERE closing_date IS NOT NULL
-           AND filing_date BETWEEN :start AND :end
-           {kpi_extra}
-    """),
-    da.ENG, params=kpi_params,
-).iat[0, 0]
-
-avg_time = pd.read_sql(
-    text(f"""
-        SELECT AVG(ABS(closing_date - filing_date)) AS days
-          FROM cases
-         WHERE closing_date IS NOT NULL
-           AND filing_date BETWEEN :start AND :end
-           {kpi_extra}
-    """),
-    da.ENG, params=kpi_params,
-).iat[0, 0]
-
-open_rate = 1 - closed / total_cases if total_cases else 0
-
-c1, c2, c3, c4 = st.columns(4)
-c1.metric("Total Dockets",       f"{total_cases:,}")
-c2.metric("Closed",              f"{closed:,}")
-c3.metric("Open Rate",           f"{open_rate:.1%}")
-c4.metric("Avg Days to Close",   f"{avg_time:.0f}")
-
-st.markdown("---")
+# ── Query plan: every widget's data, fetched concurrently ─────────────
+plan = QueryPlan()
 
-# ── Layout: three rows ──────────────────────────────────
-row1 = st.columns((2,2))
-row2 = st.columns((2,2))
-row3 = st.columns(1)
+# one pass over the slice feeds the KPIs and the completeness footer
+q_kpi = plan.add(da.slice_summary, start_dt, end_dt, courts_sel, nos_codes)
 
-# 1-A Geography map
+# "Top 5" = busiest 5 courts for the current date & NOS slice (asked once,
+# shared by the map, the treemap and the violins)
 if top5_flag:
-    # derive the busiest 5 courts for the current date & NOS slice
-    map_courts = da.top_courts_by_filings(start_dt, end_dt, nos_codes, limit=5)
+    top_courts = plan.add(da.top_courts_by_filings, start_dt, end_dt, nos_codes, limit=5)
 else:
-    map_courts = courts_sel
-df_geo  = da.geography_counts(start_dt, end_dt, map_courts, nos_codes)
-row1[0].plotly_chart(ch.map_density(df_geo), use_container_width=True)
+    top_courts = courts_sel   # None or explicit list
+
+q_geo = plan.add(da.geography_counts, start_dt, end_dt, top_courts, nos_codes)
 
-# 1-B Filing volume line
 if courts_sel is None and not top5_flag:
     # ― Case: "All" courts → composite line
-    df_line = da.filings_agg(
-        period=agg,
-        courts=None,          # include every court
-        start=start_dt,
-        end=end_dt,
-        codes=nos_codes
-    )
-    fig_line = ch.line_filings(          # single-series helper
-        df_line,
-        title=f"{agg} Filings by District Courts",
-        x_col="bucket"
-    )
+    q_line = plan.add(da.filings_agg, period=agg, courts=None,   # include every court
+                      start=start_dt, end=end_dt, codes=nos_codes)
 else:
     # ― Case: explicit courts or "Top 5" → one line per court
-    df_line = da.filings_by_court(
-        period=agg,
-        courts=courts_sel,
-        start=start_dt,
-        end=end_dt,
-        top_n=5 if top5_flag else None,
-        codes=nos_codes
-    )
-    fig_line = ch.line_filings_by_court(df_line, period=agg)
+    q_line = plan.add(da.filings_by_court, period=agg, courts=top_courts,
+                      start=start_dt, end=end_dt, codes=nos_codes)
 
-row1[1].plotly_chart(fig_line, use_container_width=True)
+q_tree = plan.add(da.nature_of_suit, courts=top_courts)
 
-# 2-A Nature of Suit treemap
-if top5_flag:
-    treemap_courts = da.top_courts_by_filings(
-        start_dt, end_dt, nos_codes, limit=5
-    )
-else:
-    treemap_courts = courts_sel   # None or explicit list
-row2[0].plotly_chart(
-    ch.treemap_nos(
-        count_min=100,
-        courts=treemap_courts,
-        codes=nos_codes
-    ),
-    use_container_width=True
-)
+q_nos = None
+if show_nos_chart and nos_codes:
+    q_nos = plan.add(da.filings_by_nos, nos_codes=nos_codes, period=agg,
+                     courts=courts_sel, start=start_dt, end=end_dt)
 
-# 2-B Nature of Suit line chart
-show_nos_chart = True          # default
+q_latency = plan.add(da.days_to_close_summary, group_by=group_flag, courts=top_courts,
+                     codes=nos_codes, start=start_dt, end=end_dt)
 
-if "All" in nos_raw:
-    nos_codes = []             # empty => chart suppressed
-    show_nos_chart = False
-elif "Top 5 (by count)" in nos_raw:
-    nos_codes = top5
-else:
-    nos_codes = [int(x) for x in nos_raw]
+# ── Placeholders, filled as each query lands ──────────────────────────
+c1, c2, c3, c4 = (c.empty() for c in st.columns(4))
+st.markdown("---")
+row1 = [c.empty() for c in st.columns((2,2))]
+row2 = [c.empty() for c in st.columns((2,2))]
+row3 = [c.empty() for c in st.columns(1)]
+footer = st.empty()
 
-if show_nos_chart and nos_codes:
-    df_nos_freq = da.filings_by_nos(
-        nos_codes=nos_codes,
-        period=agg,
-        courts=courts_sel,
-        start=start_dt,
-        end=end_dt,
-    )
-    fig_nos_line = ch.line_nos(
-        df_nos_freq, 
-        period=agg
+if q_nos is None:
+    row2[1].info("Select one or more NOS codes\nfrom the sidebar to see trends.")
+
+def draw_kpis(kpi: da.SliceSummary) -> None:
+    c1.metric("Total Dockets",       f"{kpi.total:,}")
+    c2.metric("Closed",              f"{kpi.closed:,}")
+    c3.metric("Open Rate",           f"{kpi.open_rate:.1%}")
+    c4.metric("Avg Days to Close",   f"{kpi.avg_days:.0f}" if kpi.avg_days is not None else "–")
+
+    # ── Completeness disclaimer ───────────────────────────────────────
+    footer.caption(
+        f"ℹ️ **Data Completeness:** Of the **{kpi.total:,}** dockets in the "
+        f"current filters, **{kpi.missing_nos:,}** "
+        f"({kpi.missing_share:.1%}) have no Nature of Suit (NOS) code."
     )
-else:
-    fig_nos_line = None
 
-if fig_nos_line is not None:
-    row2[1].plotly_chart(fig_nos_line, use_container_width=True)
-else:
-    row2[1].info("Select one or more NOS codes\nfrom the sidebar to see trends.")
+# 1-A Geography map
+def draw_map(df_geo: pd.DataFrame) -> None:
+    row1[0].plotly_chart(ch.map_density(df_geo), use_container_width=True)
 
-# 3-A Days-to-Close violin plot
-df_latency = days_to_close_df(
-    group_by=group_flag,
-    courts=courts_sel if not top5_flag else da.top_courts_by_filings(
-        start_dt, end_dt, nos_codes, limit=5),
-    codes=nos_codes,
-    start=start_dt,
-    end=end_dt,
-)
+# 1-B Filing volume line
+def draw_line(df_line: pd.DataFrame) -> None:
+    if q_line.fn is da.filings_agg:
+        fig_line = ch.line_filings(          # single-series helper
+            df_line,
+            title=f"{agg} Filings by District Courts",
+            x_col="bucket"
+        )
+    else:
+        fig_line = ch.line_filings_by_court(df_line, period=agg)
+    row1[1].plotly_chart(fig_line, use_container_width=True)
 
-if df_latency["group"].nunique() <= 20 and not df_latency.empty:
-    row3[0].plotly_chart(
-        ch.violin_days_to_close(
-            df_latency,
-            group_label=("District Court(s)" if group_flag == "court" else "NOS Code(s)"),
-            sort_by=sort_stat,
-            ascending=asc_flag,
+# 2-A Nature of Suit treemap
+def draw_treemap(nos_tree: pd.DataFrame) -> None:
+    row2[0].plotly_chart(
+        ch.treemap_nos(
+            count_min=100,
+            codes=nos_codes,
+            nos_df=nos_tree,
         ),
         use_container_width=True
     )
-else:
-    row3[0].info("Too many groups selected; refine filters to ≤ 20 to view the violin plot.")
-
-# ── Completeness disclaimer ───────────────────────────────────────────
-nos_gap = pd.read_sql(
-    text(f"""
-        SELECT
-            COUNT(*) FILTER (WHERE nature_of_suit_numeric IS NULL) AS missing,
-            COUNT(*)                                            AS total
-          FROM cases
-         WHERE filing_date BETWEEN :start AND :end
-           {kpi_extra}                -- re-use the same court / NOS filters
-    """),
-    da.ENG,
-    params=kpi_params,
-).iloc[0]
-
-missing_nos = int(nos_gap.missing)
-total_slice = int(nos_gap.total)
-
-st.caption(
-    f"ℹ️ **Data Completeness:** Of the **{total_slice:,}** dockets in the "
-    f"current filters, **{missing_nos:,}** "
-    f"({missing_nos/total_slice:.1%}) have no Nature of Suit (NOS) code."
-)
+
+# 2-B Nature of Suit line chart
+def draw_nos_line(df_nos_freq: pd.DataFrame) -> None:
+    row2[1].plotly_chart(ch.line_nos(df_nos_freq, period=agg), use_container_width=True)
+
+# 3-A Days-to-Close violin plot
+def draw_violin(latency: da.DtcDistribution) -> None:
+    if len(latency.stats) <= 20 and not latency.stats.empty:
+        row3[0].plotly_chart(
+            ch.violin_days_to_close_summary(
+                latency,
+                group_label=("District Court(s)" if group_flag == "court" else "NOS Code(s)"),
+                sort_by=sort_stat,
+                ascending=asc_flag,
+            ),
+            use_container_width=True
+        )
+    else:
+        row3[0].info("Too many groups selected; refine filters to ≤ 20 to view the violin plot.")
+
+draw = {q_kpi: draw_kpis, q_geo: draw_map, q_line: draw_line, q_tree: draw_treemap,
+        q_nos: draw_nos_line, q_latency: draw_violin}
+
+for req, data in plan.as_completed():
+    if req in draw:
+        draw[req](data)
@@ -0,0 +1,107 @@
+"""
+Query backends behind dashboard.data_access.
+
+    postgres – the loaded database (DATABASE_URL), reading the
+               case_daily_rollup summary kept by ingest
+    duckdb   – embedded DuckDB over the processed parquet dataset
+               (data/processed), no database needed
+
+Pick one with DASHBOARD_BACKEND (default: postgres). Both answer the same
+calls with the same frames; `python -m dashboard.backends.parity` checks that
+on the current data.
+"""
+from __future__ import annotations
+
+import os
+from datetime import date
+from typing import NamedTuple, Protocol
+
+import pandas as pd
+
+BACKEND  = os.getenv("DASHBOARD_BACKEND", "postgres")
+DTC_BINS = 40
+
+# time-bucket label → (date_trunc unit, generate_series step)
+PERIODS = {
+    "Daily":   ("day",   "1 day"),
+    "Weekly":  ("week",  "1 week"),
+    "Monthly": ("month", "1 month"),
+    "Yearly":  ("year",  "1 year"),
+}
+
+
+class SliceSummary(NamedTuple):
+    """Header KPIs and footer completeness figures of one filter slice."""
+    total:       int                  # dockets filed in the slice
+    closed:      int
+    missing_nos: int                  # … of which without a NOS code
+    avg_days:    float | None         # mean |closing_date − filing_date| of the closed ones
+    std_days:    float | None
+
+    @classmethod
+    def from_sums(cls, total, closed, missing, dtc_sum, dtc_sumsq) -> "SliceSummary":
+        total, closed, missing = int(total), int(closed), int(missing)   # SUM(bigint) is numeric
+        avg = std = None
+        if closed:
+            avg = float(dtc_sum) / closed
+            std = max(float(dtc_sumsq) / closed - avg * avg, 0.0) ** 0.5
+        return cls(total, closed, missing, avg, std)
+
+    @property
+    def open_rate(self) -> float:
+        return 1 - self.closed / self.total if self.total else 0.0
+
+    @property
+    def missing_share(self) -> float:
+        return self.missing_nos / self.total if self.total else 0.0
+
+
+class DtcDistribution(NamedTuple):
+    """Days-to-close per group, summarised server-side (see days_to_close_summary)."""
+    stats: pd.DataFrame          # group | n | mean | min | q1 | median | q3 | max
+    hist:  pd.DataFrame          # group | lo | hi | count   (equal-width bins per group)
+
+    @classmethod
+    def from_rows(cls, df: pd.DataFrame, bins: int) -> "DtcDistribution":
+        """Split one row per (group, non-empty bin), stats repeated, into the two frames."""
+        stats = (df.drop_duplicates("group")
+                   .rename(columns={"lo": "min", "hi": "max"})
+                   [["group", "n", "mean", "min", "q1", "median", "q3", "max"]]
+                   .reset_index(drop=True))
+        width = (df["hi"] + 1 - df["lo"]) / bins
+        hist  = pd.DataFrame({
+            "group": df["group"],
+            "lo":    df["lo"] + (df["bin"] - 1) * width,
+            "hi":    df["lo"] + df["bin"] * width,
+            "count": df["cnt"],
+        }).reset_index(drop=True)
+        return cls(stats, hist)
+
+
+class Backend(Protocol):
+    """What dashboard.data_access needs from a backend (arguments as documented there)."""
+
+    def data_version(self) -> str: ...
+    def date_bounds(self) -> tuple[date, date]: ...
+    def court_slugs(self) -> list[str]: ...
+    def slice_summary(self, start, end, courts=None, codes=None) -> SliceSummary: ...
+    def filings_agg(self, period="Daily", courts=None, start=None, end=None, codes=None) -> pd.DataFrame: ...
+    def nature_of_suit(self, courts=None, start=None, end=None) -> pd.DataFrame: ...
+    def geography_counts(self, start=None, end=None, courts=None, codes=None, top_n=None) -> pd.DataFrame: ...
+    def filings_by_nos(self, nos_codes, period="Monthly", courts=None, start=None, end=None) -> pd.DataFrame: ...
+    def filings_by_court(self, period, courts, start, end, top_n=None, codes=None) -> pd.DataFrame: ...
+    def top_courts_by_filings(self, start, end, codes, limit=5) -> list[str]: ...
+    def days_to_close_df(self, *, group_by="court", courts=None, codes=None,
+                         start=None, end=None) -> pd.DataFrame: ...
+    def days_to_close_summary(self, *, group_by="court", courts=None, codes=None,
+                              start=None, end=None, bins=DTC_BINS) -> DtcDistribution: ...
+
+
+def get_backend(name: str = BACKEND) -> Backend:
+    if name == "postgres":
+        from dashboard.backends.postgres import PostgresBackend
+        return PostgresBackend()
+    if name == "duckdb":
+        from dashboard.backends.duckdb import DuckDBBackend
+        return DuckDBBackend()
+    raise ValueError(f"unknown DASHBOARD_BACKEND {name!r} (postgres or duckdb)")
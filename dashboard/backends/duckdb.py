@@ -0,0 +1,282 @@
+"""
+DuckDB backend: the dashboard's queries, run in-process over the processed
+parquet dataset (data/processed) – no database needed.
+
+Nothing is copied: `cases` and `case_daily_rollup` are views over
+read_parquet(…, hive_partitioning = true), so a query only opens the files
+of the courts it asks for (transform partitions each row by its own court,
+which the view reads back from the path) and skips the row groups outside
+its dates by their filing_date statistics.
+
+Files are replayed the way ingest loads them (dockets, then cases_updates
+and deltas in fetch order – src/data/case_files.py) and the last version of
+each case_id wins. The one thing held in memory is `_latest`, the newest
+change file of each case_id that has one; a row is current when its case
+has no change, or this file is that newest one. case_daily_rollup is the
+aggregate ingest maintains (src/data/summaries.py) over the `cases` view, so
+both backends answer from identical rows. Whenever the transform step has
+rewritten the dataset (its _manifest.json changed) the views are built again
+on a fresh in-memory database, which then replaces the current one. Every
+call runs on its own cursor, so a QueryPlan's threads can share the backend,
+and a query already running finishes on the database it started on.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from datetime import date
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+
+from dashboard.backends import DTC_BINS, PERIODS, DtcDistribution, SliceSummary
+from src.data import case_files
+from src.data.summaries import SUMMARIES
+
+PROC_DIR = Path(os.getenv("DASHBOARD_PARQUET_DIR", "data/processed"))
+
+# the columns of `cases` the dashboard reads, typed as in sql/schema.sql
+CASES_COLS = {
+    "case_id":                "BIGINT",
+    "court_slug":             "TEXT",
+    "filing_date":            "DATE",
+    "closing_date":           "DATE",
+    "nature_of_suit_numeric": "INT",
+}
+ROLLUP     = next(s for s in SUMMARIES if s.table == "case_daily_rollup")
+
+
+def _list(paths: list[str]) -> str:
+    """A SQL list literal of `paths` (a view can't take parameters)."""
+    return "[" + ", ".join("'" + p.replace("'", "''") + "'" for p in paths) + "]"
+
+
+class DuckDBBackend:
+    def __init__(self, root: str | Path = PROC_DIR) -> None:
+        self.root    = Path(root)
+        self.con     = None
+        self._loaded = None
+        self._lock   = threading.Lock()
+
+    # ── dataset → views ────────────────────────────────────────────────
+    def data_version(self) -> str:
+        """mtime of the transform manifest, which every transform run rewrites."""
+        try:
+            return str((self.root / "_manifest.json").stat().st_mtime_ns)
+        except FileNotFoundError:
+            return "0"
+
+    def _load(self) -> duckdb.DuckDBPyConnection:
+        """A new in-memory database with `_latest` and the views over the dataset as it is now."""
+        files   = [str(p) for p in case_files.ordered(self.root)]    # ingest's order
+        changes = [f for f in files if not Path(f).name.startswith("dockets_")]
+        con     = duckdb.connect()
+        cols    = ", ".join(f"{col}::{typ} AS {col}" for col, typ in CASES_COLS.items() if col != "court_slug")
+        con.execute("SET parquet_metadata_cache = true")         # footers read once per file
+        con.execute("CREATE TABLE _latest (case_id BIGINT, filename TEXT)")
+        if changes:
+            con.execute("""
+                INSERT INTO _latest
+                SELECT case_id, arg_max(filename, ord)
+                  FROM read_parquet($f, filename = true, hive_partitioning = false)
+                  JOIN unnest($f) WITH ORDINALITY AS t(filename, ord) USING (filename)
+              GROUP BY case_id
+            """, {"f": changes})
+        if files:
+            con.execute(f"""
+                CREATE VIEW cases AS
+                SELECT p.court::TEXT AS court_slug, {cols}
+                  FROM read_parquet({_list(files)}, filename = true, union_by_name = true,
+                                    hive_partitioning = true, hive_types = {{'court': VARCHAR}}) p
+                  LEFT JOIN _latest l USING (case_id)
+                 WHERE l.case_id IS NULL OR l.filename = p.filename
+            """)
+        else:
+            con.execute("CREATE VIEW cases AS SELECT "
+                        + ", ".join(f"NULL::{typ} AS {col}" for col, typ in CASES_COLS.items()) + " WHERE FALSE")
+        cols = ", ".join(ROLLUP.key + ROLLUP.measures)
+        con.execute(f"CREATE VIEW {ROLLUP.table} AS SELECT {cols} FROM ("
+                    + ROLLUP.stats.format(source="cases c") + ")")
+        return con
+
+    def _cursor(self) -> duckdb.DuckDBPyConnection:
+        version = self.data_version()
+        if version != self._loaded:
+            with self._lock:
+                if version != self._loaded:
+                    self.con     = self._load()           # the old one lives on in open cursors
+                    self._loaded = version
+        return self.con.cursor()
+
+    def _df(self, sql: str, params: dict | None = None) -> pd.DataFrame:
+        df = self._cursor().execute(sql, {k: v for k, v in (params or {}).items() if f"${k}" in sql}).df()
+        for col in df.columns:                # DATE comes back as datetime64; Postgres gives dates
+            if pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = df[col].dt.date
+        return df
+
+    # ── queries ────────────────────────────────────────────────────────
+    def date_bounds(self) -> tuple[date, date]:
+        lo, hi = self._df("SELECT MIN(day) AS lo, MAX(day) AS hi FROM case_daily_rollup").iloc[0]
+        return lo, hi
+
+    def court_slugs(self) -> list[str]:
+        return self._df("SELECT DISTINCT court_slug FROM case_daily_rollup ORDER BY 1").court_slug.tolist()
+
+    def slice_summary(self, start, end, courts=None, codes=None) -> SliceSummary:
+        row = self._cursor().execute(f"""
+            SELECT COALESCE(SUM(n), 0),
+                   COALESCE(SUM(n) FILTER (WHERE closed), 0),
+                   COALESCE(SUM(n) FILTER (WHERE nos IS NULL), 0),
+                   SUM(dtc_sum)   FILTER (WHERE closed),
+                   SUM(dtc_sumsq) FILTER (WHERE closed)
+              FROM case_daily_rollup
+             WHERE day BETWEEN $start AND $end
+               {'AND list_contains($courts, court_slug)' if courts else ''}
+               {'AND list_contains($codes, nos)'         if codes  else ''}
+        """, {k: v for k, v in dict(start=start, end=end, courts=courts, codes=codes).items() if v}).fetchone()
+        return SliceSummary.from_sums(*row)
+
+    def _where(self, courts=None, codes=None, start=None, end=None) -> str:
+        return " ".join(clause for clause, on in (
+            ("AND list_contains($courts, court_slug)", courts),
+            ("AND list_contains($codes, nos)",         codes),
+            ("AND day >= $start",                      start),
+            ("AND day <= $end",                        end),
+        ) if on)
+
+    def filings_agg(self, period="Daily", courts=None, start=None, end=None, codes=None) -> pd.DataFrame:
+        gran = PERIODS.get(period, PERIODS["Daily"])[0]
+        return self._df(f"""
+            SELECT date_trunc('{gran}', day)::DATE AS bucket,
+                   SUM(n)::BIGINT                   AS filings
+              FROM case_daily_rollup
+             WHERE day IS NOT NULL {self._where(courts, codes, start, end)}
+          GROUP BY 1
+          ORDER BY 1
+        """, dict(courts=courts, codes=codes, start=start, end=end))
+
+    def nature_of_suit(self, courts=None, start=None, end=None) -> pd.DataFrame:
+        return self._df(f"""
+            SELECT nos, SUM(n)::BIGINT AS cnt
+              FROM case_daily_rollup
+             WHERE nos IS NOT NULL {self._where(courts, None, start, end)}
+          GROUP BY nos
+        """, dict(courts=courts, start=start, end=end))
+
+    def geography_counts(self, start=None, end=None, courts=None, codes=None, top_n=None) -> pd.DataFrame:
+        return self._df(f"""
+            SELECT court_slug, SUM(n)::BIGINT AS filings
+              FROM case_daily_rollup
+             WHERE day IS NOT NULL {self._where(courts, codes, start, end)}
+          GROUP BY court_slug
+        """, dict(courts=courts, codes=codes, start=start, end=end))
+
+    def _buckets(self, gran: str, step: str, lo: str, hi: str) -> str:
+        """Every bucket from lo to hi (SQL expressions), as a one-column SELECT."""
+        return (f"SELECT unnest(generate_series(date_trunc('{gran}', {lo})::TIMESTAMP, "
+                f"date_trunc('{gran}', {hi})::TIMESTAMP, INTERVAL '{step}'))::DATE AS bucket")
+
+    def filings_by_nos(self, nos_codes, period="Monthly", courts=None, start=None, end=None) -> pd.DataFrame:
+        gran, step = PERIODS[period]
+        return self._df(f"""
+            WITH bounds AS (
+                SELECT MIN(day) AS lo, MAX(day) AS hi
+                  FROM case_daily_rollup
+                 WHERE TRUE {self._where(None, None, start, end)}
+            ), buckets AS ({self._buckets(gran, step, "lo", "hi")} FROM bounds),
+            base AS (
+                SELECT date_trunc('{gran}', day)::DATE AS bucket, nos, SUM(n)::BIGINT AS filings
+                  FROM case_daily_rollup
+                 WHERE list_contains($codes, nos) {self._where(courts, None, start, end)}
+              GROUP BY 1, 2
+            )
+            SELECT b.bucket, n.nos, COALESCE(a.filings, 0) AS filings
+              FROM buckets b
+             CROSS JOIN (SELECT unnest($codes) AS nos) n
+              LEFT JOIN base a ON b.bucket = a.bucket AND n.nos = a.nos
+          ORDER BY b.bucket, n.nos
+        """, dict(codes=nos_codes, courts=courts, start=start, end=end))
+
+    def filings_by_court(self, period, courts, start, end, top_n=None, codes=None) -> pd.DataFrame:
+        gran, step = PERIODS[period]
+        if courts:
+            court_list = courts
+        elif top_n:
+            court_list = self.top_courts_by_filings(start, end, codes, top_n)
+        else:
+            court_list = self._df("""
+                SELECT DISTINCT court_slug FROM case_daily_rollup WHERE day BETWEEN $start AND $end
+            """, dict(start=start, end=end)).court_slug.tolist()
+        if not court_list:
+            return pd.DataFrame(columns=["bucket", "court_slug", "filings"])
+
+        return self._df(f"""
+            WITH buckets AS ({self._buckets(gran, step, "$start::DATE", "$end::DATE")}),
+            base AS (
+                SELECT date_trunc('{gran}', day)::DATE AS bucket, court_slug, SUM(n)::BIGINT AS filings
+                  FROM case_daily_rollup
+                 WHERE day BETWEEN $start AND $end {self._where(court_list, codes)}
+              GROUP BY 1, 2
+            )
+            SELECT b.bucket, c.court_slug, COALESCE(a.filings, 0) AS filings
+              FROM buckets b
+             CROSS JOIN (SELECT unnest($courts) AS court_slug) c
+              LEFT JOIN base a ON b.bucket = a.bucket AND c.court_slug = a.court_slug
+          ORDER BY b.bucket, c.court_slug
+        """, dict(courts=court_list, codes=codes, start=start, end=end))
+
+    def top_courts_by_filings(self, start, end, codes, limit=5) -> list[str]:
+        return self._df(f"""
+            SELECT court_slug
+              FROM case_daily_rollup
+             WHERE day BETWEEN $start AND $end {self._where(None, codes)}
+          GROUP BY court_slug
+          ORDER BY SUM(n) DESC, court_slug
+             LIMIT {int(limit)}
+        """, dict(start=start, end=end, codes=codes)).court_slug.tolist()
+
+    def _closed(self, group_by, courts, codes, start, end) -> tuple[str, dict]:
+        """SELECT grp, signed days of the closed cases in the slice."""
+        if group_by not in ("court", "nos"):
+            raise ValueError("group_by must be 'court' or 'nos'")
+        group_col = "court_slug" if group_by == "court" else "nature_of_suit_numeric"
+        where = " ".join(clause for clause, on in (
+            ("AND list_contains($courts, court_slug)",          courts),
+            ("AND list_contains($codes, nature_of_suit_numeric)", codes),
+            ("AND filing_date >= $start",                       start),
+            ("AND filing_date <= $end",                         end),
+        ) if on)
+        sql = f"""
+            SELECT {group_col} AS grp, (closing_date - filing_date)::INT AS days
+              FROM cases
+             WHERE closing_date IS NOT NULL {where}"""
+        return sql, dict(courts=courts, codes=codes, start=start, end=end)
+
+    def days_to_close_df(self, *, group_by="court", courts=None, codes=None, start=None, end=None) -> pd.DataFrame:
+        sql, params = self._closed(group_by, courts, codes, start, end)
+        df = self._df(f"SELECT grp AS \"group\", abs(days) AS days_to_close FROM ({sql})", params)
+        return df
+
+    def days_to_close_summary(self, *, group_by="court", courts=None, codes=None,
+                              start=None, end=None, bins=DTC_BINS) -> DtcDistribution:
+        sql, params = self._closed(group_by, courts, codes, start, end)
+        df = self._df(f"""
+            WITH d AS (SELECT grp, abs(days) AS days FROM ({sql}) WHERE grp IS NOT NULL),
+            s AS (
+                SELECT grp, COUNT(*) AS n, AVG(days)::DOUBLE AS mean, MIN(days) AS lo, MAX(days) AS hi,
+                       quantile_cont(days, [0.25, 0.5, 0.75]) AS q
+                  FROM d
+              GROUP BY grp
+            ), h AS (
+                SELECT d.grp, (d.days - s.lo) * {int(bins)} // (s.hi + 1 - s.lo) + 1 AS bin, COUNT(*) AS cnt
+                  FROM d JOIN s USING (grp)
+              GROUP BY 1, 2
+            )
+            SELECT s.grp AS "group", s.n, s.mean, s.lo, s.q[1] AS q1, s.q[2] AS median, s.q[3] AS q3, s.hi,
+                   h.bin, h.cnt
+              FROM s JOIN h USING (grp)
+          ORDER BY s.grp, h.bin
+        """, params)
+        return DtcDistribution.from_rows(df, bins)
@@ -0,0 +1,107 @@
+"""
+Check that the DuckDB backend answers like the Postgres one.
+
+Runs every data-access call over a handful of slices of the current data
+(whole range, recent months, busiest courts, top NOS codes) on both backends
+and compares the results: frames after sorting, with dates normalised and
+floats to a relative tolerance. Point it at a database loaded from the same
+data/processed as the parquet side:
+
+    DATABASE_URL=… python -m dashboard.backends.parity [--parquet-dir DIR]
+
+Exits 1 if any call differs.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from datetime import timedelta
+
+import pandas as pd
+
+from dashboard.backends import PERIODS, DtcDistribution, SliceSummary
+from dashboard.backends.duckdb import PROC_DIR, DuckDBBackend
+from dashboard.backends.postgres import PostgresBackend
+
+logger = logging.getLogger(__name__)
+RTOL = 1e-9
+
+
+def _frame(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    for col in df.columns:
+        if pd.api.types.infer_dtype(df[col]) == "date":
+            df[col] = pd.to_datetime(df[col])
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+
+def _same(a, b) -> bool:
+    if isinstance(a, (DtcDistribution, SliceSummary)):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    if isinstance(a, pd.DataFrame):
+        try:
+            pd.testing.assert_frame_equal(_frame(a), _frame(b), check_dtype=False, rtol=RTOL)
+        except AssertionError:
+            return False
+        return True
+    if isinstance(a, float) and isinstance(b, float):
+        return abs(a - b) <= RTOL * max(abs(a), abs(b), 1.0)
+    return a == b
+
+
+def _calls(ref: PostgresBackend) -> list[tuple[str, tuple, dict]]:
+    """(method, args, kwargs) covering every call over several slices."""
+    lo, hi  = ref.date_bounds()
+    recent  = max(lo, hi - timedelta(days=90))
+    courts  = ref.top_courts_by_filings(lo, hi, None, 3)
+    codes   = ref.nature_of_suit().sort_values(["cnt", "nos"], ascending=False).nos.head(3).astype(int).tolist()
+    slices  = [
+        dict(start=lo,     end=hi),
+        dict(start=recent, end=hi),
+        dict(start=lo,     end=hi, courts=courts),
+        dict(start=lo,     end=hi, codes=codes),
+        dict(start=recent, end=hi, courts=courts[:1], codes=codes[:1]),
+    ]
+    calls = [("date_bounds", (), {}), ("court_slugs", (), {})]
+    for s in slices:
+        start, end, c, k = s["start"], s["end"], s.get("courts"), s.get("codes")
+        calls += [
+            ("slice_summary",         (start, end, c, k), {}),
+            ("nature_of_suit",        (c, start, end), {}),
+            ("geography_counts",      (start, end, c, k), {}),
+            ("top_courts_by_filings", (start, end, k, 5), {}),
+            ("days_to_close_df",      (), dict(group_by="court", courts=c, codes=k, start=start, end=end)),
+        ]
+        for period in PERIODS:
+            calls += [
+                ("filings_agg",      (period, c, start, end, k), {}),
+                ("filings_by_court", (period, c, start, end, 5, k), {}),
+            ]
+            if codes:
+                calls.append(("filings_by_nos", (k or codes, period, c, start, end), {}))
+        for group_by in ("court", "nos"):
+            calls.append(("days_to_close_summary", (),
+                          dict(group_by=group_by, courts=c, codes=k, start=start, end=end)))
+    return calls
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--parquet-dir", default=str(PROC_DIR), help="processed dataset for DuckDB")
+    args = ap.parse_args()
+
+    ref, alt = PostgresBackend(), DuckDBBackend(args.parquet_dir)
+    calls    = _calls(ref)
+    failed   = 0
+    for name, a, kw in calls:
+        if not _same(getattr(ref, name)(*a, **kw), getattr(alt, name)(*a, **kw)):
+            failed += 1
+            logger.error("%s%s %s differs", name, a, kw)
+    logger.info("%d/%d calls match", len(calls) - failed, len(calls))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,444 @@
+"""
+Postgres backend: the dashboard queries against the database ingest loads,
+answering filing counts from case_daily_rollup.
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import List
+
+import pandas as pd
+from sqlalchemy import text
+
+from dashboard.backends import DTC_BINS, PERIODS, DtcDistribution, SliceSummary
+from src.data.summaries import DATA_VERSION
+from src.utils.db import get_engine
+
+
+class PostgresBackend:
+    def __init__(self, engine=None) -> None:
+        # room for a QueryPlan's workers (dashboard/query_plan.py)
+        self.engine = engine or get_engine(pool_size=8)
+
+    def data_version(self) -> str:
+        """The `data_version` watermark ingest bumps – one primary-key lookup; '0' before the first load."""
+        with self.engine.connect() as conn:
+            if conn.execute(text("SELECT to_regclass('watermarks')")).scalar() is None:
+                return "0"
+            mark = conn.execute(text("SELECT mark FROM watermarks WHERE name = :n"),
+                                {"n": DATA_VERSION}).scalar()
+        return mark.strftime("%Y%m%dT%H%M%S%f") if mark else "0"
+
+    def date_bounds(self) -> tuple[date, date]:
+        """First and last filing day in the rollup."""
+        lo, hi = pd.read_sql("SELECT MIN(day), MAX(day) FROM case_daily_rollup", self.engine).iloc[0]
+        return pd.to_datetime(lo).date(), pd.to_datetime(hi).date()
+
+    def court_slugs(self) -> list[str]:
+        return pd.read_sql("SELECT DISTINCT court_slug FROM case_daily_rollup ORDER BY 1", self.engine).court_slug.tolist()
+
+    def _has_rollup(self) -> bool:
+        with self.engine.connect() as conn:
+            return conn.execute(text("SELECT to_regclass('case_daily_rollup') IS NOT NULL")).scalar()
+
+    def slice_summary(
+        self,
+        start:  date,
+        end:    date,
+        courts: list[str] | None = None,
+        codes:  list[int] | None = None,
+    ) -> SliceSummary:
+        """
+        Every header / footer statistic of the slice in one pass of conditional
+        aggregates: over case_daily_rollup, or over cases in a database that
+        hasn't been migrated to the rollup yet.
+        """
+        if self._has_rollup():
+            sql = """
+            SELECT COALESCE(SUM(n), 0)                        AS total,
+                   COALESCE(SUM(n) FILTER (WHERE closed), 0)  AS closed,
+                   COALESCE(SUM(n) FILTER (WHERE nos IS NULL), 0) AS missing_nos,
+                   SUM(dtc_sum)   FILTER (WHERE closed)       AS dtc_sum,
+                   SUM(dtc_sumsq) FILTER (WHERE closed)       AS dtc_sumsq
+              FROM case_daily_rollup
+             WHERE day BETWEEN :start AND :end
+               {court_clause}
+               {code_clause}
+            """.format(
+                court_clause = "AND court_slug = ANY(:courts)" if courts else "",
+                code_clause  = "AND nos = ANY(:codes)"         if codes  else "",
+            )
+        else:
+            sql = """
+            SELECT COUNT(*)                                              AS total,
+                   COUNT(closing_date)                                   AS closed,
+                   COUNT(*) FILTER (WHERE nature_of_suit_numeric IS NULL) AS missing_nos,
+                   SUM(ABS(closing_date - filing_date))                  AS dtc_sum,
+                   SUM((closing_date - filing_date)::bigint
+                       * (closing_date - filing_date))                   AS dtc_sumsq
+              FROM cases
+             WHERE filing_date BETWEEN :start AND :end
+               {court_clause}
+               {code_clause}
+            """.format(
+                court_clause = "AND court_slug = ANY(:courts)"             if courts else "",
+                code_clause  = "AND nature_of_suit_numeric = ANY(:codes)"  if codes  else "",
+            )
+        params = {k: v for k, v in
+                  dict(start=start, end=end, courts=courts, codes=codes).items()
+                  if v}
+        with self.engine.connect() as conn:
+            return SliceSummary.from_sums(*conn.execute(text(sql), params).one())
+
+    def filings_agg(
+        self,
+        period: str = "Daily",
+        courts: list[str] | None = None,
+        start: date | None = None,
+        end:   date | None = None,
+        codes: list[int] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Aggregate filings per time bucket. Optional filters:
+        - courts : list of court slugs
+        - codes  : list of NOS codes
+        """
+        gran = {"Daily": "day", "Weekly": "week",
+                "Monthly": "month", "Yearly": "year"}.get(period, "day")
+
+        q = f"""
+            SELECT date_trunc('{gran}', day)::date AS bucket,
+                   SUM(n)::bigint                   AS filings
+              FROM case_daily_rollup
+             WHERE day IS NOT NULL
+               {'AND court_slug = ANY(:courts)' if courts else ''}
+               {'AND nos = ANY(:codes)'         if codes  else ''}
+               {'AND day >= :start'             if start  else ''}
+               {'AND day <= :end'               if end    else ''}
+          GROUP BY 1
+          ORDER BY 1;
+        """
+        params = {k: v for k, v in
+                  dict(courts=courts, codes=codes, start=start, end=end).items()
+                  if v}
+        return pd.read_sql(text(q), self.engine, params=params)
+
+    def nature_of_suit(self, courts: list[str] | None = None, start: date | None = None, end: date | None = None) -> pd.DataFrame:
+        sql = f"""
+            SELECT nos,
+                   SUM(n)::bigint AS cnt
+              FROM case_daily_rollup
+             WHERE nos IS NOT NULL
+               { 'AND court_slug = ANY(:courts)' if courts else '' }
+               { 'AND day >= :start' if start else '' }
+               { 'AND day <= :end'   if end   else '' }
+          GROUP BY nos
+        """
+        params = {k: v for k, v in dict(courts=courts, start=start, end=end).items() if v}
+        return pd.read_sql(text(sql), self.engine, params=params)
+
+    def geography_counts(
+        self,
+        start:  date | None = None,
+        end:    date | None = None,
+        courts: List[str] | None = None,
+        codes:  List[int] | None = None,
+        top_n:  int | None  = None,
+    ) -> pd.DataFrame:
+        q = """
+            SELECT court_slug,
+                   SUM(n)::bigint AS filings
+              FROM case_daily_rollup
+             WHERE day IS NOT NULL
+               {start_clause}
+               {end_clause}
+               {court_clause}
+               {code_clause}
+          GROUP BY court_slug;
+        """.format(
+            start_clause = "AND day >= :start"             if start  else "",
+            end_clause   = "AND day <= :end"               if end    else "",
+            court_clause = "AND court_slug = ANY(:courts)" if courts else "",
+            code_clause  = "AND nos = ANY(:codes)"         if codes  else "",
+        )
+
+        params = {k: v for k, v in
+                  dict(start=start, end=end, courts=courts, codes=codes).items()
+                  if v is not None}
+
+        return pd.read_sql(text(q), self.engine, params=params)
+
+    def filings_by_nos(
+        self,
+        nos_codes: list[int],
+        period: str = "Monthly",
+        courts:  list[str]  | None = None,
+        start:  date | None = None,
+        end:    date | None = None,
+    ) -> pd.DataFrame:
+        assert nos_codes, "nos_codes cannot be empty"
+        gran, step = PERIODS[period]
+        sql = f"""
+        WITH bounds AS (
+            SELECT
+                date_trunc('{gran}', MIN(day)) AS min_bucket,
+                date_trunc('{gran}', MAX(day)) AS max_bucket
+            FROM case_daily_rollup
+             WHERE TRUE
+               {'' if not start else 'AND day >= :start'}
+               {'' if not end   else 'AND day <= :end'}
+        ),
+        buckets AS (
+            SELECT generate_series(min_bucket, max_bucket, '{step}')::date AS bucket
+            FROM   bounds
+        ),
+        base AS (
+            SELECT date_trunc('{gran}', r.day)::date AS bucket,
+                   r.nos,
+                   SUM(r.n)::bigint                   AS filings
+              FROM case_daily_rollup r
+             WHERE r.nos = ANY(:codes)
+               {'' if not courts else 'AND r.court_slug = ANY(:courts)'}
+               {'' if not start else 'AND r.day >= :start'}
+               {'' if not end   else 'AND r.day <= :end'}
+          GROUP BY bucket, nos
+        )
+        SELECT b.bucket,
+               n.nos,
+               COALESCE(a.filings, 0) AS filings
+          FROM buckets b
+         CROSS JOIN UNNEST(:codes) AS n(nos)
+          LEFT JOIN base a
+            ON b.bucket = a.bucket
+           AND n.nos   = a.nos
+         ORDER BY b.bucket, n.nos;
+        """
+
+        params = {k: v for k, v in
+                  dict(codes=nos_codes, courts=courts, start=start, end=end).items()
+                  if v is not None}
+
+        return pd.read_sql(text(sql), self.engine, params=params)
+
+    def filings_by_court(
+        self,
+        period: str,
+        courts: list[str] | None,
+        start: date,
+        end: date,
+        top_n: int | None = None,
+        codes: list[int] | None = None,      # NOS filter
+    ) -> pd.DataFrame:
+        """
+        Return a dataframe with every (time-bucket × selected court) combination.
+        Missing combinations are filled with zero filings so the line chart drops
+        to the x-axis rather than disappearing.
+        """
+        # ── granularity helpers ────────────────────────────────────────────
+        gran, step = PERIODS[period]
+
+        # ── pick the set of courts to include ──────────────────────────────
+        eng   = self.engine
+        params = {"start": start, "end": end}
+
+        if courts:                                    # explicit list from UI
+            court_list = courts
+        elif top_n:                                   # derive busiest N courts
+            sql_top = f"""
+                SELECT court_slug
+                  FROM case_daily_rollup
+                 WHERE day BETWEEN :start AND :end
+                   {'AND nos = ANY(:codes)' if codes else ''}
+              GROUP BY court_slug
+              ORDER BY SUM(n) DESC, court_slug
+                 LIMIT {top_n};
+            """
+            if codes:
+                params["codes"] = codes
+            court_list = pd.read_sql(text(sql_top), eng, params=params)["court_slug"].tolist()
+        else:                                         # fall-back: whatever appears in the data
+            sql_all = """
+                SELECT DISTINCT court_slug
+                  FROM case_daily_rollup
+                 WHERE day BETWEEN :start AND :end;
+            """
+            court_list = pd.read_sql(text(sql_all), eng, params=params)["court_slug"].tolist()
+
+        if not court_list:
+            return pd.DataFrame(columns=["bucket", "court_slug", "filings"])
+
+        params["courts"]     = court_list
+        if codes:
+            params["codes"] = codes
+
+        # ── build the main query ───────────────────────────────────────────
+        sql = f"""
+        WITH bounds AS (
+            SELECT
+                date_trunc('{gran}', CAST(:start AS date)) AS min_bucket,
+                date_trunc('{gran}', CAST(:end   AS date)) AS max_bucket
+        ),
+        buckets AS (
+            SELECT generate_series(min_bucket, max_bucket, '{step}')::date AS bucket
+            FROM   bounds
+        ),
+        base AS (
+            SELECT date_trunc('{gran}', day)::date AS bucket,
+                   court_slug,
+                   SUM(n)::bigint AS filings
+              FROM case_daily_rollup
+             WHERE day BETWEEN :start AND :end
+               AND court_slug = ANY(:courts)
+               {'' if not codes else 'AND nos = ANY(:codes)'}
+          GROUP BY bucket, court_slug
+        )
+        SELECT b.bucket,
+               c.court_slug,
+               COALESCE(a.filings, 0) AS filings
+          FROM buckets       b
+     CROSS JOIN UNNEST(:courts) AS c(court_slug)          -- every bucket × court
+     LEFT JOIN base           a
+            ON b.bucket     = a.bucket
+           AND c.court_slug = a.court_slug
+      ORDER BY b.bucket, c.court_slug;
+        """
+
+        return pd.read_sql(text(sql), eng, params=params)
+
+    def top_courts_by_filings(self, start: date,
+                              end: date,
+                              codes: list[int] | None,
+                              limit: int = 5) -> list[str]:
+        where = ["day BETWEEN :start AND :end"]
+        params = {"start": start, "end": end}
+
+        if codes:                                     # NOS filter in sync
+            where.append("nos = ANY(:codes)")
+            params["codes"] = codes
+
+        where_sql = " AND ".join(where)
+
+        sql = f"""
+            SELECT court_slug
+              FROM case_daily_rollup
+             WHERE {where_sql}
+          GROUP BY court_slug
+          ORDER BY SUM(n) DESC, court_slug
+             LIMIT {limit};
+        """
+        return pd.read_sql(text(sql), self.engine, params=params)["court_slug"].tolist()
+
+    def days_to_close_df(
+        self,
+        *,
+        group_by: str = "court",          # "court"  or "nos"
+        courts:   list[str] | None = None,
+        codes:    list[int] | None = None,
+        start:    date | None = None,
+        end:      date | None = None,
+    ) -> pd.DataFrame:
+        """
+        Return rows:  <group> | days_to_close
+        group = court_slug  when group_by="court"
+              = nos code    when group_by="nos"
+        """
+        if group_by not in ("court", "nos"):
+            raise ValueError("group_by must be 'court' or 'nos'")
+
+        group_col = "court_slug" if group_by == "court" else "nature_of_suit_numeric::int"
+
+        sql = f"""
+            SELECT {group_col}              AS grp,
+                   (closing_date - filing_date)::int AS days_to_close
+              FROM cases
+             WHERE closing_date IS NOT NULL
+               {{c_and}}
+               {{n_and}}
+               {{s_and}}
+               {{e_and}}
+        """.format(
+            c_and = "AND court_slug = ANY(:courts)"            if courts else "",
+            n_and = "AND nature_of_suit_numeric = ANY(:codes)" if codes  else "",
+            s_and = "AND filing_date >= :start"                if start  else "",
+            e_and = "AND filing_date <= :end"                  if end    else "",
+        )
+
+        params = {k: v for k, v in
+                  dict(courts=courts, codes=codes,
+                       start=start, end=end).items()
+                  if v is not None}
+
+        df = pd.read_sql(text(sql), self.engine, params=params)
+        df = df.assign(days_to_close=df["days_to_close"].abs())  # flip negatives
+        return df.rename(columns={"grp": "group"})
+
+    def days_to_close_summary(
+        self,
+        *,
+        group_by: str = "court",          # "court"  or "nos"
+        courts:   list[str] | None = None,
+        codes:    list[int] | None = None,
+        start:    date | None = None,
+        end:      date | None = None,
+        bins:     int = DTC_BINS,
+    ) -> DtcDistribution:
+        """
+        What days_to_close_df's rows are used for – quartiles, extremes, mean and
+        a density per group – computed in Postgres: exact quartiles with
+        percentile_cont, and a `bins`-bucket histogram over each group's own
+        [min, max] (width_bucket's arithmetic, kept in integers so every
+        backend bins alike). Returns groups × bins rows however many cases
+        are closed.
+        """
+        if group_by not in ("court", "nos"):
+            raise ValueError("group_by must be 'court' or 'nos'")
+
+        group_col = "court_slug" if group_by == "court" else "nature_of_suit_numeric::int"
+
+        sql = f"""
+            WITH d AS (
+                SELECT {group_col}                          AS grp,
+                       ABS(closing_date - filing_date)      AS days
+                  FROM cases
+                 WHERE closing_date IS NOT NULL
+                   AND {group_col} IS NOT NULL
+                   {{c_and}}
+                   {{n_and}}
+                   {{s_and}}
+                   {{e_and}}
+            ), s AS (
+                SELECT grp,
+                       COUNT(*)                              AS n,
+                       AVG(days)::float                      AS mean,
+                       MIN(days)                             AS lo,
+                       MAX(days)                             AS hi,
+                       percentile_cont(ARRAY[0.25, 0.5, 0.75])
+                           WITHIN GROUP (ORDER BY days)      AS q
+                  FROM d
+              GROUP BY grp
+            ), h AS (
+                SELECT d.grp,
+                       (d.days - s.lo) * :bins / (s.hi + 1 - s.lo) + 1 AS bin,   -- width_bucket, exactly
+                       COUNT(*)                              AS cnt
+                  FROM d JOIN s USING (grp)
+              GROUP BY 1, 2
+            )
+            SELECT s.grp, s.n, s.mean, s.lo, s.q[1] AS q1, s.q[2] AS median, s.q[3] AS q3, s.hi,
+                   h.bin, h.cnt
+              FROM s JOIN h USING (grp)
+          ORDER BY s.grp, h.bin
+        """.format(
+            c_and = "AND court_slug = ANY(:courts)"            if courts else "",
+            n_and = "AND nature_of_suit_numeric = ANY(:codes)" if codes  else "",
+            s_and = "AND filing_date >= :start"                if start  else "",
+            e_and = "AND filing_date <= :end"                  if end    else "",
+        )
+
+        params = {k: v for k, v in
+                  dict(courts=courts, codes=codes,
+                       start=start, end=end).items()
+                  if v is not None}
+        params["bins"] = bins
+
+        df = pd.read_sql(text(sql), self.engine, params=params).rename(columns={"grp": "group"})
+        return DtcDistribution.from_rows(df, bins)
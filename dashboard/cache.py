@@ -0,0 +1,168 @@
+"""
+Result cache for the dashboard's data-access functions.
+
+Every Streamlit rerun (any sidebar click) calls the same handful of queries
+again with mostly the same filters. `QueryCache.cached` puts two tiers in
+front of a function:
+
+    memory – per process, LRU, bounded by the DataFrames' in-memory size
+    disk   – optional, a directory shared by every dashboard replica
+             (DASHBOARD_CACHE_DIR), one pickle per result
+
+Keys are the function's qualified name plus its normalised arguments (court /
+code lists sorted and de-duplicated, empty lists ≡ None, dates as ISO
+strings), under the current data version, as reported by the backend: for
+Postgres the `data_version` watermark that ingest bumps after every load
+that changed rows (src/data/summaries.py), for DuckDB the mtime of the
+processed dataset's manifest. A result is therefore reused until the next
+load, and never after it.
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+import shutil
+import sys
+import threading
+from collections import OrderedDict
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MEMORY_MB  = float(os.getenv("DASHBOARD_CACHE_MB", "256"))
+DISK_DIR   = os.getenv("DASHBOARD_CACHE_DIR")        # unset ⇒ memory tier only
+
+
+def _norm(value: Any) -> Any:
+    """Canonical, hashable form of one argument."""
+    if isinstance(value, (list, tuple, set)):
+        return tuple(sorted({_norm(v) for v in value}, key=str)) or None
+    if isinstance(value, pd.Timestamp):
+        value = value.date()
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def call_key(fn: Callable, args: tuple, kwargs: dict) -> tuple:
+    """(qualified name, (param, normalised value)…) – equal for equivalent calls."""
+    bound = inspect.signature(fn).bind(*args, **kwargs)
+    bound.apply_defaults()
+    return (f"{fn.__module__}.{fn.__qualname__}",
+            *((k, _norm(v)) for k, v in bound.arguments.items()))
+
+
+def _size(value: Any) -> int:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, tuple):                     # e.g. a NamedTuple of frames
+        return sys.getsizeof(value) + sum(map(_size, value))
+    return sys.getsizeof(value)
+
+
+def _copy(value: Any) -> Any:
+    # callers add columns to what they get back; keep the cached copy pristine
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        return value._make(map(_copy, value))
+    return value.copy() if isinstance(value, (pd.DataFrame, pd.Series, list)) else value
+
+
+class QueryCache:
+    def __init__(self, version: Callable[[], str], memory_mb: float = MEMORY_MB,
+                 disk_dir: str | Path | None = DISK_DIR) -> None:
+        self.version   = version                     # current data-version stamp, checked per call
+        self.max_bytes = int(memory_mb * 2**20)
+        self.disk_dir  = Path(disk_dir) if disk_dir else None
+        self._lru: OrderedDict[tuple, tuple[Any, int]] = OrderedDict()
+        self._bytes    = 0
+        self._version  = None
+        self._lock     = threading.Lock()
+        self.hits = self.misses = 0
+
+    # ── data version ───────────────────────────────────────────────────
+    def _sync(self, version: str) -> None:
+        """Drop everything cached under an older version (caller holds the lock)."""
+        if version == self._version:
+            return
+        if self._version is not None:
+            logger.info("data version %s → %s, cache cleared", self._version, version)
+        self._lru.clear()
+        self._bytes, self._version = 0, version
+        if self.disk_dir and self.disk_dir.is_dir():
+            for old in self.disk_dir.iterdir():
+                if old.is_dir() and old.name != version:
+                    shutil.rmtree(old, ignore_errors=True)     # another replica may beat us to it
+
+    # ── tiers ──────────────────────────────────────────────────────────
+    def _disk_path(self, version: str, key: tuple) -> Path:
+        digest = hashlib.sha256(repr(key).encode()).hexdigest()
+        return self.disk_dir / version / f"{digest}.pkl"
+
+    def _remember(self, key: tuple, value: Any) -> None:
+        size = _size(value)
+        if size > self.max_bytes:
+            return
+        if key in self._lru:
+            self._bytes -= self._lru.pop(key)[1]
+        self._lru[key] = (value, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, evicted) = self._lru.popitem(last=False)
+            self._bytes -= evicted
+
+    def get(self, key: tuple, compute: Callable[[], Any]) -> Any:
+        version = self.version()
+        with self._lock:
+            self._sync(version)
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return _copy(self._lru[key][0])
+
+        path = self._disk_path(version, key) if self.disk_dir else None
+        try:
+            value = pickle.loads(path.read_bytes()) if path is not None else None
+        except (OSError, pickle.UnpicklingError, EOFError):   # absent, or pruned by another replica
+            value = None
+        if value is not None:
+            with self._lock:
+                self._remember(key, value)
+                self.hits += 1
+            return _copy(value)
+
+        value = compute()
+        with self._lock:
+            self.misses += 1
+            if version == self._version:          # a load may have landed meanwhile
+                self._remember(key, value)
+        if path is not None:
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp.write_bytes(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+                os.replace(tmp, path)              # atomic: readers never see a partial file
+            except OSError as err:                 # full disk, or the version dir just got pruned
+                logger.warning("cache write skipped (%s)", err)
+        return _copy(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+            self._bytes, self._version = 0, None
+
+    # ── decorator ──────────────────────────────────────────────────────
+    def cached(self, fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return self.get(call_key(fn, args, kwargs), lambda: fn(*args, **kwargs))
+
+        wrapper.uncached = fn
+        return wrapper
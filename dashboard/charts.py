@@ -1,10 +1,11 @@
 import plotly.express as px
+import plotly.graph_objects as go
 import geopandas as gpd
 import pandas as pd
 from pathlib import Path
 import matplotlib.colors as mcolors
 from dashboard import data_access as da
-from src.data.nos_map import NOS_MAP
+from src.data import nos_map
 import numpy as np
 
 DISTRICTS_GJ = Path(__file__).parent / "shapefiles" / "district_courts" / "districts_simplified.geojson"
@@ -18,63 +19,6 @@ _GRAD = mcolors.LinearSegmentedColormap.from_list(
     ["#ffffff", "#ff8a25", "#7a1d00"],    # 0 %  50 %  100 %
 )
 
-# ── Nature-of-Suit → chapter lookup ────────────────────────────────
-_CHAPTER: dict[int, str] = {
-
-    # Contract (110-199)
-    **{k: "Contract" for k in (
-        110, 120, 130, 140, 150, 151, 152, 153,
-        160, 190, 195, 196)},
-
-    # Real Property (210-299)
-    **{k: "Real Property" for k in (210, 220, 230, 240, 245, 290)},
-
-    # Torts – Personal Injury (310-368, 375)
-    **{k: "Torts · Pers Injury" for k in (
-        310, 315, 320, 330, 340, 345,
-        350, 355, 360, 362, 365, 367, 368, 375)},
-
-    # Torts – Personal Property (370-385)
-    **{k: "Torts · Pers Property" for k in (370, 371, 380, 385)},
-
-    # Bankruptcy (422-423)
-    **{k: "Bankruptcy" for k in (422, 423)},
-
-    # Civil Rights (440-448)
-    **{k: "Civil Rights" for k in (
-        440, 441, 442, 443, 444, 445, 446, 448)},
-
-    # Immigration (462-465)
-    **{k: "Immigration" for k in (462, 463, 465)},
-
-    # Prisoner / Habeas (510-560)
-    **{k: "Prisoner / Habeas" for k in (
-        510, 530, 535, 540, 550, 555, 560)},
-
-    # Forfeiture / Penalty (610-690)
-    **{k: "Forfeiture / Penalty" for k in (
-        610, 620, 625, 630, 640, 650, 660, 690)},
-
-    # Labor (710-799)
-    **{k: "Labor" for k in (
-        710, 720, 730, 740, 751, 790, 791)},
-
-    # Intellectual Property & related (820-840)
-    **{k: "Property Rights" for k in (820, 830, 840)},
-
-    # Social Security (861-865)
-    **{k: "Social Security" for k in (861, 862, 863, 864, 865)},
-
-    # Federal Tax Suits (870-871)
-    **{k: "Federal Tax" for k in (870, 871)},
-
-    # Other Statutes / Misc. Federal Civil
-    **{k: "Other Statutes" for k in (
-        400, 410, 430, 450, 460, 470, 480, 490,
-        810, 850, 875,
-        890, 891, 892, 893, 894, 895, 896, 899, 900, 950)},
-}
-
 def bar_filings(
     df: pd.DataFrame,
     title: str = "",
@@ -205,53 +149,27 @@ def treemap_nos(
     count_min: int = 50,
     courts: list[str] | None = None,
     codes:  list[int] | None = None,
+    nos_df: pd.DataFrame | None = None,
 ) -> px.treemap:
     # ── fetch + basic cleaning ──────────────────────────────────────────
-    raw = (
-        da.nature_of_suit(courts=courts)         # scoped to courts
-          .rename(columns={"nos": "nos_raw"})
-    )
+    if nos_df is None:                         # not prefetched by the caller
+        nos_df = da.nature_of_suit(courts=courts)         # scoped to courts
+    raw = nos_df.rename(columns={"nos": "nos_raw"})
 
-    # pull leading 3‑digit code (keep float → drop NaNs)
-    if pd.api.types.is_numeric_dtype(raw["nos_raw"]):
-        raw["nos"] = raw["nos_raw"].astype(int)
-    else:
-        raw["nos"] = (
-            raw["nos_raw"]
-                .str.extract(r"^(\d{3})", expand=False)
-                .astype("float")
-        )
-        raw = raw.dropna(subset=["nos"]).copy()
-        raw["nos"] = raw["nos"].astype(int)
+    # leading 3‑digit code → dense chapter / title lookups (-1 ⇒ unknown)
+    raw["nos"] = nos_map.parse_codes(raw["nos_raw"])
+    raw["chapter"] = nos_map.chapter_categorical(raw["nos"].to_numpy())
+    raw = raw.dropna(subset=["chapter"])
 
     # ── apply NOS code filter, if any ───────────────────────────────────
     if codes:                                  # (None or [] ⇒ no filter)
-        raw = raw[raw["nos"].isin(codes)].copy()
+        raw = raw[raw["nos"].isin(codes)]
     if raw.empty:
         return px.treemap(title="No data for selected NOS")
 
-    raw["nos_raw"] = raw["nos_raw"].astype("string")
-    raw["chapter"] = raw["nos"].map(_CHAPTER)
-    raw = raw.dropna(subset=["chapter"])
-
-    # ── map the official NOS title ──────────────────────────────────────
-    raw["short"] = (
-        raw["nos"]
-            .map(NOS_MAP)
-            .fillna(
-                raw["nos_raw"]
-                    .str.replace(r"^\d{3}\s*[-·]?\s*", "", regex=True)
-                    .str.replace(r"\s*[-–]\s*",      " ", regex=True)
-                    .str.strip()
-                    .str.title()
-            )
-    )
-
     # ── aggregate once per (chapter, nos) ──────────────────────────────
-    df = (
-        raw.groupby(["chapter", "nos"], as_index=False)
-           .agg(cnt=("cnt", "sum"), short=("short", "first"))
-    )
+    df = raw.groupby(["chapter", "nos"], as_index=False, observed=True)["cnt"].sum()
+    df["short"] = nos_map.titles(df["nos"].to_numpy())
     total = df["cnt"].sum()
     cutoff = max(1, total * 0.0001)        # never drop the only case in tiny sets
     df = df[df["cnt"] >= cutoff]
@@ -373,3 +291,74 @@ def _order_by_stat(df: pd.DataFrame,
                                  categories=order,
                                  ordered=True)
     return df, order
+
+def violin_days_to_close_summary(
+    dist: "da.DtcDistribution",
+    *,
+    group_label: str = "Group",
+    height: int = 380,
+    sort_by: str = "median",
+    ascending: bool = False,
+    half_width: float = 0.4,
+) -> go.Figure:
+    """
+    violin_days_to_close drawn from server-side summaries
+    (data_access.days_to_close_summary): each group's histogram, lightly
+    smoothed, mirrored into a violin outline, with a box from the exact
+    quartiles and the mean inside it.
+    """
+    stats, hist = dist
+    if stats.empty:
+        return px.violin(title="No closed cases in current filter")
+
+    stats = stats.assign(group=stats["group"].astype(str))
+    hist  = hist.assign(group=hist["group"].astype(str))
+    order = (stats.set_index("group")[sort_by]
+                  .sort_values(ascending=ascending)
+                  .index.tolist())
+    colour = px.colors.qualitative.Plotly
+
+    fig = go.Figure()
+    for pos, (grp, row) in enumerate(stats.set_index("group").loc[order].iterrows()):
+        c = colour[pos % len(colour)]
+        h = hist[hist["group"] == grp]
+        # every bin of the group, empty ones included, as bin-centre densities
+        width = (h["hi"] - h["lo"]).iat[0]               # a group has ≥ 1 non-empty bin
+        nbins = int(round((row["max"] + 1 - row["min"]) / width))
+        counts = np.zeros(nbins)
+        idx = np.clip(np.rint((h["lo"] - row["min"]) / width).astype(int), 0, nbins - 1)
+        np.add.at(counts, idx, h["count"].to_numpy())
+        dens = np.convolve(counts, [0.25, 0.5, 0.25], mode="same")
+        dens = dens / dens.max() * half_width if dens.max() else dens
+        y = row["min"] + (np.arange(nbins) + 0.5) * width
+        fig.add_trace(go.Scatter(
+            x=np.concatenate([pos - dens, (pos + dens)[::-1]]),
+            y=np.concatenate([y, y[::-1]]),
+            fill="toself", mode="lines", line=dict(color=c, width=1),
+            name=grp, legendgroup=grp, hoverinfo="skip",
+        ))
+        iqr = row["q3"] - row["q1"]
+        fig.add_trace(go.Box(
+            x=[pos], q1=[row["q1"]], median=[row["median"]], q3=[row["q3"]],
+            lowerfence=[max(row["min"], row["q1"] - 1.5 * iqr)],
+            upperfence=[min(row["max"], row["q3"] + 1.5 * iqr)],
+            mean=[row["mean"]], width=half_width / 4,
+            marker_color=c, fillcolor="white", line=dict(color=c, width=1),
+            name=grp, legendgroup=grp, showlegend=False,
+            hovertemplate=(f"<b>{grp}</b><br>n = {int(row['n']):,}<br>"
+                           f"min {row['min']:.0f} · q1 {row['q1']:.0f} · median {row['median']:.0f}"
+                           f" · q3 {row['q3']:.0f} · max {row['max']:.0f}<br>mean {row['mean']:.0f}"
+                           "<extra></extra>"),
+        ))
+
+    fig.update_layout(
+        template="plotly_white",
+        height=height,
+        title=f"Distribution of Days to Close by {group_label}",
+        xaxis=dict(title=group_label, tickmode="array",
+                   tickvals=list(range(len(order))), ticktext=order),
+        yaxis_title="Days to Close",
+        showlegend=False,
+        margin=dict(t=40, l=0, r=0, b=0),
+    )
+    return fig
@@ -0,0 +1,78 @@
+"""
+Run a page's data requests concurrently.
+
+The page first declares every widget's request, then draws each widget as its
+data arrives, so a rerun takes about as long as its slowest query rather than
+the sum of all of them:
+
+    plan  = QueryPlan()
+    top5  = plan.add(da.top_courts_by_filings, start, end, codes, limit=5)
+    geo   = plan.add(da.geography_counts, start, end, top5, codes)   # waits for top5
+    …
+    for req, value in plan.as_completed():
+        …draw the widget(s) fed by req…
+
+Equivalent requests (same function, same normalised arguments – see
+dashboard/cache.py) are collapsed into one, so asking for the busiest courts
+for three widgets costs one query. A `Request` passed as an argument is
+replaced by its result before the function runs; since requests start in the
+order they were added, a dependency is always running or done by then.
+Queries run on a thread pool – each on a pooled connection (Postgres) or its
+own cursor (DuckDB) of the data-access backend; drawing stays on the calling
+(Streamlit) thread.
+"""
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Iterator
+
+from dashboard.cache import call_key
+
+MAX_WORKERS = 6                  # ≤ the Postgres backend's pool size
+
+
+class Request:
+    """Handle on one (de-duplicated) call in a QueryPlan."""
+
+    def __init__(self, fn: Callable, args: tuple, kwargs: dict) -> None:
+        self.fn, self.args, self.kwargs = fn, args, kwargs
+        self.future: Future | None = None
+
+    def __repr__(self) -> str:
+        return f"Request({self.fn.__qualname__})"
+
+
+def _resolve(value: Any) -> Any:
+    return value.future.result() if isinstance(value, Request) else value
+
+
+class QueryPlan:
+    def __init__(self, max_workers: int = MAX_WORKERS) -> None:
+        self.max_workers = max_workers
+        self._requests: dict[tuple, Request] = {}
+
+    def add(self, fn: Callable, *args, **kwargs) -> Request:
+        """Declare a call; returns the existing request if an equivalent one was added."""
+        key = call_key(fn, tuple(map(_key_part, args)), {k: _key_part(v) for k, v in kwargs.items()})
+        return self._requests.setdefault(key, Request(fn, args, kwargs))
+
+    def _call(self, req: Request) -> Any:
+        return req.fn(*map(_resolve, req.args), **{k: _resolve(v) for k, v in req.kwargs.items()})
+
+    def as_completed(self) -> Iterator[tuple[Request, Any]]:
+        """Run every request; yield (request, result) as each one finishes."""
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="query") as pool:
+            owner = {}
+            for req in self._requests.values():
+                req.future = pool.submit(self._call, req)
+                owner[req.future] = req
+            for fut in as_completed(owner):
+                yield owner[fut], fut.result()
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+
+def _key_part(value: Any) -> Any:
+    # a dependency is identified by the request itself, not its (unknown) result
+    return ("request", id(value)) if isinstance(value, Request) else value
@@ -0,0 +1,31 @@
+-- ──────────────────────────────────────────────────────────────
+--  0001 • change tracking for outcomes
+-- ──────────────────────────────────────────────────────────────
+--  outcomes.updated_at is stamped on insert and on every update
+--  that changes a row (ingest's merge skips unchanged ones), so
+--  cases.win_bool can be refreshed from just the outcomes that
+--  moved since the last run – see src/data/summaries.py.
+--  watermarks holds each such consumer's high-water mark.
+-- ----------------------------------------------------------------
+
+ALTER TABLE outcomes
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp();
+
+CREATE INDEX IF NOT EXISTS idx_outcomes_updated ON outcomes (updated_at);
+
+CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.updated_at := clock_timestamp();
+    RETURN NEW;
+END $$;
+
+DROP TRIGGER IF EXISTS outcomes_touch ON outcomes;
+CREATE TRIGGER outcomes_touch
+    BEFORE UPDATE ON outcomes
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+
+CREATE TABLE IF NOT EXISTS watermarks (
+    name           TEXT PRIMARY KEY,                 -- e.g. 'cases.win_bool'
+    mark           TIMESTAMPTZ NOT NULL
+);
@@ -0,0 +1,24 @@
+-- ──────────────────────────────────────────────────────────────
+--  0002 • daily filing rollup for the dashboard
+-- ──────────────────────────────────────────────────────────────
+--  One row per (filing day, court, NOS code, closed?) with the
+--  docket count and the sum / sum of squares of days-to-close
+--  (|closing_date − filing_date|, 0 for open dockets), so counts,
+--  means and variances of any coarser bucket are re-aggregations.
+--  Undated dockets are left out. Kept current by ingest like
+--  judge_year_stats (src/data/summaries.py); ingest fills it on
+--  the first run after this migration.
+-- ----------------------------------------------------------------
+
+CREATE TABLE IF NOT EXISTS case_daily_rollup (
+    day            DATE    NOT NULL,                 -- cases.filing_date
+    court_slug     TEXT    NOT NULL,
+    nos            INT,                              -- nature_of_suit_numeric
+    closed         BOOLEAN NOT NULL,                 -- closing_date IS NOT NULL
+    n              BIGINT  NOT NULL,
+    dtc_sum        BIGINT  NOT NULL,
+    dtc_sumsq      BIGINT  NOT NULL,
+    UNIQUE NULLS NOT DISTINCT (day, court_slug, nos, closed)
+);
+
+CREATE INDEX IF NOT EXISTS idx_rollup_court_day ON case_daily_rollup (court_slug, day);
@@ -0,0 +1,17 @@
+-- ──────────────────────────────────────────────────────────────
+--  0003 • processed files already loaded
+-- ──────────────────────────────────────────────────────────────
+--  One row per data/processed parquet file ingest has merged,
+--  with the size and mtime it had then. A re-run skips files
+--  that are unchanged since, so it writes nothing at all – no
+--  replay of old updates and deltas over newer ones, no summary
+--  adjustments, no data_version bump. `ingest --reload` ignores
+--  it and merges every file again.
+-- ----------------------------------------------------------------
+
+CREATE TABLE IF NOT EXISTS ingested_files (
+    path           TEXT        PRIMARY KEY,          -- relative to data/processed
+    size           BIGINT      NOT NULL,
+    mtime_ns       BIGINT      NOT NULL,
+    loaded_at      TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+);
@@ -0,0 +1,18 @@
+-- ──────────────────────────────────────────────────────────────
+--  0004 • one parties row per (party, docket)
+-- ──────────────────────────────────────────────────────────────
+--  CourtListener party ids are global: the same party (a
+--  company, an agency, an attorney) shows up on many dockets,
+--  with a role on each. Keyed on party_id alone the table held
+--  one of them, and whichever docket loaded last moved it.
+--  Rows without a docket can't be keyed and are dropped; the
+--  transform (VERSION 4) re-emits every party's other dockets,
+--  and ingest merges them on (party_id, case_id).
+-- ----------------------------------------------------------------
+
+DELETE FROM parties WHERE case_id IS NULL;
+
+ALTER TABLE parties
+    DROP CONSTRAINT parties_pkey,
+    ALTER COLUMN case_id SET NOT NULL,
+    ADD PRIMARY KEY (party_id, case_id);
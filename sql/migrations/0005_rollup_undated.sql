@@ -0,0 +1,17 @@
+-- ──────────────────────────────────────────────────────────────
+--  0005 • undated dockets in case_daily_rollup
+-- ──────────────────────────────────────────────────────────────
+--  0002 left dockets without a filing_date out of the rollup,
+--  so the NOS breakdown (which has no date filter unless one is
+--  picked) stopped counting them. They are now kept under a
+--  NULL day; the date-bucketed queries skip that row.
+-- ----------------------------------------------------------------
+
+ALTER TABLE case_daily_rollup ALTER COLUMN day DROP NOT NULL;
+
+INSERT INTO case_daily_rollup (day, court_slug, nos, closed, n, dtc_sum, dtc_sumsq)
+SELECT NULL, court_slug, nature_of_suit_numeric, closing_date IS NOT NULL, count(*), 0, 0
+  FROM cases
+ WHERE filing_date IS NULL
+ GROUP BY 2, 3, 4
+    ON CONFLICT DO NOTHING;
@@ -1,13 +1,17 @@
 -- ──────────────────────────────────────────────────────────────
---  Court-Listener docket pipeline  •  Relational schema v0.3
+--  Court-Listener docket pipeline  •  Relational schema v0.4
 -- ──────────────────────────────────────────────────────────────
 --  Tables:
 --    cases       – one row per docket / lawsuit
 --    filings     – one row per docket entry (documents, orders…)
 --    parties     – one row per party / attorney
 --    outcomes    – one row per case outcome / disposition
---  Mat-views:
+--    judge_year_stats – yearly outcome counts per judge
+--  Views:
 --    judge_win_rates – yearly win rate for each judge
+--  Applied once, as the baseline of a new database; later DDL goes
+--  in numbered files under sql/migrations/ (src/data/migrations.py).
+--  cases.win_bool is filled from outcomes by ingest, not here.
 -- ----------------------------------------------------------------
 
 CREATE SCHEMA IF NOT EXISTS public;
@@ -66,35 +70,31 @@ CREATE TABLE IF NOT EXISTS outcomes (
     win_bool       BOOLEAN
 );
 
--- populate / refresh the label column from `outcomes`
-
-UPDATE cases AS c
-SET    win_bool = o.win_bool
-FROM   outcomes o
-WHERE  o.case_id = c.case_id
-  AND  c.win_bool IS DISTINCT FROM o.win_bool;
-
 -- ──────────────────────────────────────────────────────────────
---  Materialised view : judge_win_rates
---  (Yearly win-rate for each judge.  Uses judge_id once you add it.)
+--  Summary : judge_year_stats  (+ view judge_win_rates)
+--  Yearly outcome counts per judge, kept current by ingest from the
+--  case_ids each load changes (src/data/summaries.py); rebuild it with
+--  `python -m src.data.summaries rebuild`.
 -- ──────────────────────────────────────────────────────────────
-CREATE MATERIALIZED VIEW IF NOT EXISTS judge_win_rates AS
-WITH yearly AS (
-    SELECT
-        c.judge_id,                                    -- nullable for now
-        EXTRACT(year FROM o.outcome_date)::INT AS filing_year,
-        COUNT(*)                                    AS total_cases,
-        SUM(CASE WHEN o.win_bool THEN 1 ELSE 0 END) AS wins
-    FROM cases     c
-    JOIN outcomes  o ON o.case_id = c.case_id
-    WHERE o.outcome IS NOT NULL
-    GROUP BY 1, 2
-)
+CREATE TABLE IF NOT EXISTS judge_year_stats (
+    judge_id       BIGINT,                           -- NULL: no assigned judge
+    filing_year    INT,                              -- year of outcome_date
+    total_cases    BIGINT NOT NULL,
+    wins           BIGINT NOT NULL,
+    UNIQUE NULLS NOT DISTINCT (judge_id, filing_year)
+);
+
+-- v0.3 had judge_win_rates as a materialised view
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = 'judge_win_rates') THEN
+        DROP MATERIALIZED VIEW judge_win_rates;
+    END IF;
+END $$;
+
+CREATE OR REPLACE VIEW judge_win_rates AS
 SELECT
     judge_id,
     filing_year,
     wins::FLOAT / NULLIF(total_cases,0) AS win_rate
-FROM yearly;
-
-CREATE INDEX IF NOT EXISTS idx_jwr_judge_year
-    ON judge_win_rates (judge_id, filing_year);
+FROM judge_year_stats;
@@ -0,0 +1,112 @@
+-- ──────────────────────────────────────────────────────────────
+--  Court-Listener docket pipeline  •  Relational schema v0.4
+--  VARIANT: `cases` range-partitioned by filing year
+-- ──────────────────────────────────────────────────────────────
+--  Same tables as schema.sql, except:
+--    • cases is PARTITION BY RANGE (filing_date), one partition per
+--      year (cases_y2019 …) created on demand by src/data/partitions.py;
+--      undated dockets have no partition and are not loaded
+--    • the primary key is (case_id, filing_date) – Postgres requires
+--      the partition key in every unique constraint – so filings /
+--      parties / outcomes keep an indexed case_id without a FK
+--  Use it for a fresh database (`ingest --partitioned`), or convert
+--  an existing one with `python -m src.data.partitions migrate`.
+-- ──────────────────────────────────────────────────────────────
+--  Tables:
+--    cases       – one row per docket / lawsuit
+--    filings     – one row per docket entry (documents, orders…)
+--    parties     – one row per party / attorney
+--    outcomes    – one row per case outcome / disposition
+--    judge_year_stats – yearly outcome counts per judge
+--  Views:
+--    judge_win_rates – yearly win rate for each judge
+--  Applied once, as the baseline of a new database; later DDL goes
+--  in numbered files under sql/migrations/ (src/data/migrations.py).
+--  cases.win_bool is filled from outcomes by ingest, not here.
+-- ----------------------------------------------------------------
+
+CREATE SCHEMA IF NOT EXISTS public;
+SET search_path = public;
+
+-- ─── core docket information ──────────────────────────────────
+CREATE TABLE IF NOT EXISTS cases (
+    case_id                BIGINT          NOT NULL,         -- stable CL docket ID
+    url                    TEXT            NOT NULL,         -- v4 API URL for the docket
+    court_slug             TEXT            NOT NULL,         -- e.g. 'dcd'
+    docket_number          TEXT,                             -- court-assigned number
+    filing_date            DATE            NOT NULL,         -- date_filed (partition key)
+    closing_date           DATE,                             -- date_closed (if any)
+    nature_of_suit         TEXT,                             -- NOS code
+    nature_of_suit_numeric INTEGER, 
+    cause                  TEXT,                             -- 'cause_of_action'
+    case_name              TEXT,                             -- short caption
+    judge_id               BIGINT,
+    win_bool               BOOLEAN, 
+    disposition            TEXT,
+    PRIMARY KEY (case_id, filing_date)
+) PARTITION BY RANGE (filing_date);
+
+CREATE INDEX IF NOT EXISTS idx_cases_court_date
+    ON cases (court_slug, filing_date);
+
+-- ─── individual docket entries ────────────────────────────────
+CREATE TABLE IF NOT EXISTS filings (
+    filing_id      BIGINT PRIMARY KEY,               -- CL entry ID
+    case_id        BIGINT,                           -- → cases.case_id (no FK, see header)
+    seq_no         INT,                              -- docket entry number
+    entry_date     DATE,
+    category       TEXT,                             -- 'entry_type'
+    description    TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_filings_case ON filings (case_id);
+CREATE INDEX IF NOT EXISTS idx_filings_date ON filings (entry_date);
+
+-- ─── parties / attorneys ──────────────────────────────────────
+CREATE TABLE IF NOT EXISTS parties (
+    party_id       BIGINT PRIMARY KEY,               -- CL party ID
+    case_id        BIGINT,                           -- → cases.case_id (no FK, see header)
+    name           TEXT,
+    party_type     TEXT,                             -- 'person', 'company', etc.
+    role           TEXT                              -- 'plaintiff', 'defendant', …
+);
+
+CREATE INDEX IF NOT EXISTS idx_parties_case ON parties (case_id);
+
+-- ─── outcomes / dispositions ─────────────────────────────────
+CREATE TABLE IF NOT EXISTS outcomes (
+    case_id        BIGINT PRIMARY KEY,               -- → cases.case_id (no FK, see header)
+    outcome        TEXT,      -- 'winner', 'dismissed', 'settled', …
+    disposition    TEXT,      -- free-text from CourtListener
+    outcome_date   DATE,
+    win_bool       BOOLEAN
+);
+
+-- ──────────────────────────────────────────────────────────────
+--  Summary : judge_year_stats  (+ view judge_win_rates)
+--  Yearly outcome counts per judge, kept current by ingest from the
+--  case_ids each load changes (src/data/summaries.py); rebuild it with
+--  `python -m src.data.summaries rebuild`.
+-- ──────────────────────────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS judge_year_stats (
+    judge_id       BIGINT,                           -- NULL: no assigned judge
+    filing_year    INT,                              -- year of outcome_date
+    total_cases    BIGINT NOT NULL,
+    wins           BIGINT NOT NULL,
+    UNIQUE NULLS NOT DISTINCT (judge_id, filing_year)
+);
+
+-- v0.3 had judge_win_rates as a materialised view
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = 'judge_win_rates') THEN
+        DROP MATERIALIZED VIEW judge_win_rates;
+    END IF;
+END $$;
+
+CREATE OR REPLACE VIEW judge_win_rates AS
+SELECT
+    judge_id,
+    filing_year,
+    wins::FLOAT / NULLIF(total_cases,0) AS win_rate
+FROM judge_year_stats;
@@ -74,17 +74,37 @@ def build_parser() -> argparse.ArgumentParser:
 
     # ── fetch ────────────────────────────────────────────────────────────────
     fetch = subs.add_parser("fetch", help="Download raw docket JSONL from CourtListener")
-    fetch.add_argument("--start", required=True, help="YYYY-MM-DD (filed_after)")
-    fetch.add_argument("--end", required=True, help="YYYY-MM-DD (filed_before)")
-    fetch.add_argument("--court", required=True, help="Court slug, e.g. dcd")
+    fetch.add_argument("--start", help="YYYY-MM-DD (filed_after); bootstraps --incremental")
+    fetch.add_argument("--end", help="YYYY-MM-DD (filed_before)")
+    fetch.add_argument("--court", help="Court slug(s), e.g. dcd or dcd,nysd")
+    fetch.add_argument("--courts-file", help="File with one court slug per line")
+    fetch.add_argument("--workers", type=int, help="Concurrent (court, month) slices")
+    fetch.add_argument("--rate", type=float, help="Shared request quota, requests/second")
+    fetch.add_argument("--incremental", action="store_true",
+                       help="Only fetch records modified since the last sync")
+    fetch.add_argument("--resources", help="Comma-separated subset of dockets,entries,parties (default: all)")
+    fetch.add_argument("--cache", action="store_true", help="Serve repeat pages from the on-disk HTTP cache")
+    fetch.add_argument("--cache-ttl", type=float, help="HTTP cache entry lifetime in hours")
+    fetch.add_argument("--cache-min-age", type=float,
+                       help="Only cache slices whose month ended this many days ago (default 90)")
+    fetch.add_argument("--api-root", help="Alternate API root, e.g. a local replay server")
     fetch.set_defaults(_entry=COMMAND_TABLE["fetch"])
 
     # ── transform ────────────────────────────────────────────────────────────
     transform = subs.add_parser("transform", help="Raw JSONL ➜ processed parquet")
+    transform.add_argument("--jobs", type=int, help="Worker processes (default 1)")
+    transform.add_argument("--force", action="store_true", help="Rebuild every parquet, ignoring the manifest")
     transform.set_defaults(_entry=COMMAND_TABLE["transform"])
 
     # ── ingest ───────────────────────────────────────────────────────────────
     ingest = subs.add_parser("ingest", help="Load processed parquet into Postgres")
+    ingest.add_argument("--jobs", type=int, help="Concurrent loader connections (default 1)")
+    ingest.add_argument("--partitioned", action="store_true",
+                        help="Fresh schema only: partition cases by filing year")
+    ingest.add_argument("--rebuild-summaries", action="store_true",
+                        help="Recompute the summary tables from scratch after loading")
+    ingest.add_argument("--reload", action="store_true",
+                        help="Merge every processed file again, even ones already loaded")
     ingest.set_defaults(_entry=COMMAND_TABLE["ingest"])
 
     # ── features ─────────────────────────────────────────────────────────────
@@ -0,0 +1,48 @@
+"""
+The order in which processed cases and outcomes files are applied – by
+ingest, and by the dashboard's DuckDB backend when it replays the dataset.
+
+dockets_* files come first, in basename order: transform's case_id index lets
+only one of them hold any given case. Every later file changes cases that
+already exist, and two kinds carry such changes:
+
+    cases_updates/…/<raw mtime>_<stem>.parquet   re-fetches of a claimed case
+    cases/…/delta_<court>_<run start>.parquet     incremental pulls
+
+They are merged into one stream ordered by that fetch stamp, so the most
+recent fetch of a case is applied last, whichever kind of file carries it.
+Outcomes are split the same way, with the stamped re-fetches kept next to
+the rest (outcomes/…/<raw mtime>_<stem>.parquet), and replayed in the same
+order as their cases.
+"""
+from __future__ import annotations
+
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+
+STAMP_FMT = "%Y%m%dT%H%M%S%fZ"                    # re-fetch basename prefix
+_STAMP_RE = re.compile(r"(?<!\d)(\d{8}T\d{6})(\d{6})?Z")
+UPDATES   = {"cases": "cases_updates"}           # dataset → where its re-fetches go (default: itself)
+
+
+def fetch_stamp(path: Path) -> datetime:
+    """When the rows of a re-fetch (stamped) or delta_* file were fetched (UTC)."""
+    m = _STAMP_RE.search(path.name)
+    if not m:
+        raise ValueError(f"{path.name}: no fetch stamp in the file name")
+    stamp = datetime.strptime(m[1], "%Y%m%dT%H%M%S").replace(tzinfo=timezone.utc)
+    return stamp.replace(microsecond=int(m[2] or 0))
+
+
+def _files(root: Path, pattern: str) -> list[Path]:
+    return sorted(root.rglob(pattern), key=lambda p: (p.name, str(p)))
+
+
+def ordered(proc_dir: Path, dataset: str = "cases") -> list[Path]:
+    """Every `dataset` file under `proc_dir`: dockets, then re-fetches and deltas by fetch stamp."""
+    root    = proc_dir / dataset
+    changes = (_files(proc_dir / UPDATES.get(dataset, dataset), "[0-9]*.parquet")
+               + _files(root, "delta_*.parquet"))
+    return (_files(root, "dockets_*.parquet")
+            + sorted(changes, key=lambda p: (fetch_stamp(p), p.name, str(p))))
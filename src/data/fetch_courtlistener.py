@@ -1,35 +1,152 @@
 """
-Fetch CourtListener dockets JSONL and save to data/raw/.
+Fetch CourtListener dockets, docket entries and parties JSONL and save to data/raw/.
+
+Work is split into (court, month) slices that run on a bounded thread pool;
+every request, from every worker, draws from one shared token bucket sized to
+the API quota, so throughput is bounded by the quota rather than by latency.
+Requests ask only for the fields transform keeps (`transform.API_FIELDS`,
+`ENTRY_FIELDS`, `PARTY_FIELDS`), in the largest pages the API serves,
+gzip-encoded on the wire.
+
+`--resources` picks what each slice pulls (default: all of RESOURCES). Docket
+entries and parties are filtered through their docket – its court and filing
+date – so an entries_<court>_<month> slice holds the entries of exactly the
+dockets in the matching dockets_ slice, whenever they were entered.
+
+Progress is checkpointed in data/raw/_manifest.json: finished slices are
+skipped on a re-run and partial ones resume from their last `next` cursor.
+
+`--incremental` instead asks, per court and resource, only for records modified
+since the last successful sync (a high-water mark kept in
+data/raw/_sync_state.json) and writes them to delta_<court>_<stamp> (dockets)
+or <resource>-delta_<court>_<stamp> shards, which ingest applies as upserts.
+
+Rows go through `raw_sink.RawSink`: zstd/gzip-compressed JSONL shards that
+rotate by size or row count.
+
+`--cache` keeps pages in an on-disk `http_cache.ResponseCache`, so repeat
+pulls of closed history are served locally. Only slices whose month ended
+more than `--cache-min-age` days ago (default CACHE_MIN_AGE_DAYS) are read
+from or written to it: recent months still gain dockets and must always be
+fetched live; `--api-root` points the fetcher at
+a replay server (`python -m src.data.http_cache serve`) instead of the live API.
 
 Example
 -------
 python -m src.data.fetch_courtlistener \
        --start 2015-01-01 --end 2016-01-01 --court dcd
+
+python -m src.data.fetch_courtlistener \
+       --start 2015-01-01 --end 2016-01-01 --courts-file district_slugs.txt
+
+python -m src.data.fetch_courtlistener --incremental --courts-file district_slugs.txt
 """
 from __future__ import annotations
-import argparse, json, logging, random, time
-from datetime import date, timedelta
+import argparse, logging, random, threading, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, Iterator, Any
+from typing import Callable, Dict, Iterator, Any, List, Tuple
 
 import requests
 from tqdm import tqdm
 from src.settings import api_key
+from src.data.transform import API_FIELDS, ENTRY_FIELDS, PARTY_FIELDS
+from src.data.raw_sink import RawSink
+from src.data.http_cache import CACHE_PATH, TTL_HOURS, ResponseCache
+from src.utils.manifest import JsonManifest
 
 # ────────────────────────────── constants ─────────────────────────────
-RAW_DIR     = Path("data/raw")
-REQ_PAUSE   = 1.0
-MAX_RETRIES = 8
-LOG         = logging.getLogger(__name__)
+RAW_DIR      = Path("data/raw")
+MANIFEST     = RAW_DIR / "_manifest.json"
+INCOMING_DIR = RAW_DIR / "_incoming"
+SYNC_STATE   = RAW_DIR / "_sync_state.json"
+API_ROOT     = "https://www.courtlistener.com/api/rest/v4/"
+MAX_RETRIES  = 8
+PAGE_SIZE    = 100            # largest page the v4 API will serve
+RATE_LIMIT   = 5000 / 3600    # authenticated quota: 5 000 requests / hour
+BURST        = 5              # requests a worker may fire back-to-back
+WORKERS      = 8
+CACHE_MIN_AGE_DAYS = 90       # younger slices bypass the page cache
+LOG          = logging.getLogger(__name__)
+
+# raw stem prefix → (endpoint, filter prefix reaching the docket, fields)
+RESOURCES = {
+    "dockets": ("dockets/",        "",         API_FIELDS),
+    "entries": ("docket-entries/", "docket__", ENTRY_FIELDS),
+    "parties": ("parties/",        "docket__", PARTY_FIELDS),
+}
 
 # ─────────────────────────── helpers ────────────────────────────────
-def _safe_get(url: str, *, headers: Dict[str, str], params: Dict[str, Any]) -> requests.Response:
-    """GET with exponential back-off on timeouts and 5xx."""
+class TokenBucket:
+    """Thread-safe token bucket; `acquire()` blocks until a request may go out."""
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate    = rate
+        self.burst   = burst
+        self._tokens = float(burst)
+        self._stamp  = time.monotonic()
+        self._lock   = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+                self._stamp  = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class Client:
+    """One rate limiter (and optional page cache) shared by all workers, one keep-alive session per thread."""
+
+    def __init__(self, limiter: TokenBucket, cache: ResponseCache | None = None,
+                 api_root: str = API_ROOT, cache_min_age: float = CACHE_MIN_AGE_DAYS) -> None:
+        self.limiter  = limiter
+        self.cache    = cache
+        self.api_root = api_root
+        self.cache_before = date.today() - timedelta(days=cache_min_age)
+        self.headers = {"Authorization": f"Token {api_key()}",
+                        "Accept-Encoding": "gzip"}
+        self._local  = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+            self._local.session.headers.update(self.headers)
+        return self._local.session
+
+    def cacheable(self, slice_end: date) -> bool:
+        """Whether a slice ending on `slice_end` is old enough to be closed history."""
+        return slice_end < self.cache_before
+
+    def get(self, url: str, params: Dict[str, Any], *, use_cache: bool = True) -> requests.Response:
+        return _safe_get(url, session=self.session, params=params, limiter=self.limiter,
+                         cache=self.cache if use_cache else None)
+
+
+def _safe_get(url: str, *, session: requests.Session, params: Dict[str, Any],
+              limiter: TokenBucket | None = None,
+              cache: ResponseCache | None = None) -> requests.Response:
+    """GET with exponential back-off on timeouts, 429 and 5xx; cache hits skip the quota."""
+    if cache is not None:
+        hit = cache.get(url, params)
+        if hit is not None:
+            return hit
     for attempt in range(MAX_RETRIES):
+        if limiter is not None:
+            limiter.acquire()
         try:
-            r = requests.get(url, headers=headers, params=params, timeout=60)
-            if r.status_code >= 500:
+            r = session.get(url, params=params, timeout=60)
+            if r.status_code == 429 or r.status_code >= 500:
                 raise requests.HTTPError(response=r)
+            if cache is not None and r.status_code == 200:
+                cache.put(url, params, r.status_code, r.content)
             return r
         except (requests.ReadTimeout, requests.ConnectionError, requests.HTTPError) as err:
             wait = min(1.5 * 2 ** attempt + random.random(), 120)
@@ -40,59 +157,193 @@ def _safe_get(url: str, *, headers: Dict[str, str], params: Dict[str, Any]) -> r
             time.sleep(wait)
     raise RuntimeError(f"Gave up after {MAX_RETRIES} retries → {url!s}")
 
-def _request_stream(url: str, params: Dict[str, Any], session: requests.Session) -> Iterator[dict]:
-    """Yield every docket JSON object for one date slice."""
+def _request_pages(url: str, params: Dict[str, Any], client: Client,
+                   use_cache: bool = True) -> Iterator[Tuple[List[dict], str | None]]:
+    """Yield (results, next_url) for every page of one date slice."""
     while url:
-        resp = _safe_get(url, headers=session.headers, params=params)
+        resp = client.get(url, params, use_cache=use_cache)
         payload = resp.json()
         if "results" not in payload:
-            LOG.warning("⚠️  non-JSON page at %s (status %s) – skipped", resp.url, resp.status_code)
-            break
-        yield from payload["results"]
+            # leave the slice partial so a re-run retries from this cursor
+            raise RuntimeError(f"non-JSON page at {resp.url} (status {resp.status_code})")
         url    = payload.get("next")
         params = {}          # after first page
-        time.sleep(REQ_PAUSE)
+        yield payload["results"], url
 
 # ───────────────────────────── core logic ───────────────────────────
 def _next_month_first(d: date) -> date:
     return date(d.year + (d.month // 12), d.month % 12 + 1, 1)
 
-def main(start: str, end: str, court: str) -> None:
-    """Write data/raw/dockets_<court>_<start>_<end>.jsonl (inclusive start, exclusive end)."""
-    start_d, end_d = map(date.fromisoformat, (start, end))
+def _month_slices(start_d: date, end_d: date) -> Iterator[Tuple[date, date]]:
+    """Yield (first, last) day pairs, one per calendar month, clipped to [start_d, end_d)."""
+    slice_start = start_d
+    while slice_start < end_d:
+        slice_end = min(_next_month_first(slice_start) - timedelta(days=1),
+                        end_d - timedelta(days=1))
+        yield slice_start, slice_end
+        slice_start = slice_end + timedelta(days=1)
+
+def _resolve_courts(court: str | None, courts_file: str | None) -> List[str]:
+    courts: List[str] = []
+    if court:
+        courts += [c.strip() for c in court.split(",") if c.strip()]
+    if courts_file:
+        courts += [l.strip() for l in Path(courts_file).read_text().splitlines() if l.strip()]
+    if not courts:
+        raise ValueError("pass --court and/or --courts-file")
+    return list(dict.fromkeys(courts))       # de-dupe, keep order
+
+def _fetch_slice(client: Client, manifest: JsonManifest,
+                 court: str, slice_start: date, slice_end: date, resource: str = "dockets") -> int:
+    """
+    Write data/raw/<resource>_<court>_<first>_<last+1>.NNNN.jsonl.<codec>
+    shards for one month slice.
+
+    After every page the sink flushes a complete frame and the shard offset and
+    `next` cursor are checkpointed, so a crash costs at most the page in flight.
+    Returns rows fetched *this run*.
+    """
+    name   = f"{resource}_{court}_{slice_start}_{slice_end + timedelta(days=1)}"
+    state  = manifest.get(name, {})
+    shards = state.get("shards") or [f"{name}.jsonl"]       # pre-sink runs wrote one plain file
+
+    if state.get("status") == "done" and all((RAW_DIR / s).exists() for s in shards):
+        LOG.debug("⏭  %s already complete (%s rows)", name, state.get("rows"))
+        return 0
+
+    endpoint, via, fields = RESOURCES[resource]
+    url    = client.api_root + endpoint
+    params = {
+        f"{via}court": court,
+        f"{via}date_filed__gte": slice_start.isoformat(),
+        f"{via}date_filed__lte":  slice_end.isoformat(),
+        "fields": ",".join(fields),
+        "page_size": PAGE_SIZE,
+    }
+    resume = None
+    if state.get("status") == "partial" and "shard" in state:
+        url, params, resume = state["next"], {}, state
+        LOG.info("↻  resuming %s after %s rows", name, state["rows"])
+
+    fetched = 0
+    with RawSink(RAW_DIR, name, resume=resume) as sink:
+        for results, nxt in _request_pages(url, params, client, use_cache=client.cacheable(slice_end)):
+            sink.write_many(results)
+            fetched += len(results)
+            if nxt:
+                manifest.update(name, status="partial", next=nxt, **sink.checkpoint())
+    manifest.update(name, status="done", next=None, **sink.state())
+    return fetched
+
+def _sync_court(client: Client, state: JsonManifest, court: str, since: str | None,
+                resource: str = "dockets") -> int:
+    """
+    Write data/raw/delta_<court>_<stamp>.NNNN.jsonl.<codec> with every docket
+    (or <resource>-delta_… with every entry / party) modified since the
+    court's high-water mark for that resource, then advance the mark to this
+    run's start time.
+
+    Shards are written under data/raw/_incoming and only moved into place once
+    complete, so a failed sync leaves the old mark alone and is simply repeated.
+    """
+    key  = court if resource == "dockets" else f"{court}/{resource}"   # dockets keep their old key
+    mark = state.get(key, {}).get("high_water") or since
+    if not mark:
+        raise ValueError(f"{key}: no high-water mark yet – pass --start to bootstrap")
+
+    run_ts = datetime.now(timezone.utc).replace(microsecond=0)
+    prefix = "delta" if resource == "dockets" else f"{resource}-delta"
+    name   = f"{prefix}_{court}_{run_ts:%Y%m%dT%H%M%SZ}"
+    endpoint, via, fields = RESOURCES[resource]
+    params = {
+        f"{via}court": court,
+        "date_modified__gte": mark,
+        "fields": ",".join(fields),
+        "page_size": PAGE_SIZE,
+    }
+    sink = RawSink(INCOMING_DIR, name)
+    try:
+        with sink:
+            # "modified since" answers go stale immediately – never serve them from cache
+            for results, _ in _request_pages(client.api_root + endpoint, params, client,
+                                             use_cache=False):
+                sink.write_many(results)
+    except Exception:
+        for p in sink.shards:
+            p.unlink()
+        raise
+    for p in sink.shards:
+        p.rename(RAW_DIR / p.name)
+    state.update(key, high_water=run_ts.isoformat(), last_delta=name, rows=sink.rows)
+    LOG.info("Δ %s: %s %s modified since %s", court, sink.rows, resource, mark)
+    return sink.rows
+
+def _run_pool(tasks: List[Tuple[str, Callable[..., int], tuple]], workers: int) -> Tuple[int, List[str]]:
+    """Run (label, fn, args) tasks on a bounded pool; return (rows, failed labels)."""
+    total_rows, failed = 0, []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fn, *args): label for label, fn, args in tasks}
+        for fut in tqdm(as_completed(futures), total=len(futures), desc="slices"):
+            try:
+                total_rows += fut.result()
+            except Exception as err:            # one bad slice must not sink the pool
+                LOG.error("⚠️  %s failed: %s", futures[fut], err)
+                failed.append(futures[fut])
+    return total_rows, failed
+
+def main(start: str | None = None, end: str | None = None,
+         court: str | None = None, courts_file: str | None = None,
+         workers: int = WORKERS, rate: float = RATE_LIMIT, incremental: bool = False,
+         cache: bool = False, cache_ttl: float = TTL_HOURS, api_root: str = API_ROOT,
+         resources: str | None = None, cache_min_age: float = CACHE_MIN_AGE_DAYS) -> None:
+    """
+    Range mode: fetch every (court, month) slice in [start, end), per resource.
+    Incremental mode: fetch per-court deltas since the last sync (start bootstraps).
+    """
     RAW_DIR.mkdir(parents=True, exist_ok=True)
+    courts = _resolve_courts(court, courts_file)
+    kinds  = [r.strip() for r in resources.split(",")] if resources else list(RESOURCES)
+    if unknown := set(kinds) - set(RESOURCES):
+        raise ValueError(f"unknown resource(s) {', '.join(sorted(unknown))} – pick from {', '.join(RESOURCES)}")
+    client = Client(TokenBucket(rate, burst=BURST),
+                    cache=ResponseCache(CACHE_PATH, ttl_hours=cache_ttl) if cache else None,
+                    api_root=api_root, cache_min_age=cache_min_age)
+
+    if incremental:
+        state = JsonManifest(SYNC_STATE)
+        tasks = [(f"{c} {r}", _sync_court, (client, state, c, start, r)) for c in courts for r in kinds]
+    else:
+        if not (start and end):
+            raise ValueError("range mode needs --start and --end (or pass --incremental)")
+        start_d, end_d = map(date.fromisoformat, (start, end))
+        manifest = JsonManifest(MANIFEST)
+        tasks = [(f"{c} {lo:%Y-%m} {r}", _fetch_slice, (client, manifest, c, lo, hi, r))
+                 for c in courts for lo, hi in _month_slices(start_d, end_d) for r in kinds]
+
+    LOG.info("▶️  %d court(s) → %d tasks on %d workers @ %.2f req/s",
+             len(courts), len(tasks), workers, rate)
+    total_rows, failed = _run_pool(tasks, workers)
 
-    out_path  = RAW_DIR / f"dockets_{court}_{start}_{end}.jsonl"
-    url_base  = "https://www.courtlistener.com/api/rest/v4/dockets/"
-    total_rows = 0
-
-    session = requests.Session()
-    session.headers.update({"Authorization": f"Token {api_key()}"})
-
-    with out_path.open("w") as fh:
-        slice_start = start_d
-        while slice_start < end_d:
-            slice_end = min(_next_month_first(slice_start) - timedelta(days=1),
-                            end_d - timedelta(days=1))
-            params = {
-                "court": court,
-                "date_filed__gte": slice_start.isoformat(),
-                "date_filed__lte":  slice_end.isoformat(),
-                "page_size": 100,
-            }
-            for docket in tqdm(_request_stream(url_base, params, session),
-                               desc=f"{slice_start:%Y-%m}", leave=False):
-                fh.write(json.dumps(docket) + "\n")
-                total_rows += 1
-            slice_start = slice_end + timedelta(days=1)
-
-    LOG.info("✓ saved %s (%s rows)", out_path, total_rows)
+    LOG.info("✓ saved %s new rows across %d tasks to %s", total_rows, len(tasks) - len(failed), RAW_DIR)
+    if failed:
+        raise RuntimeError(f"{len(failed)} task(s) failed – re-run the same command to resume")
 
 # ─────────────────────────── CLI entry-point ────────────────────────
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("--start", required=True, help="YYYY-MM-DD (inclusive)")
-    parser.add_argument("--end",   required=True, help="YYYY-MM-DD (exclusive)")
-    parser.add_argument("--court", required=True, help="e.g. dcd")
+    parser.add_argument("--start", help="YYYY-MM-DD (inclusive); bootstrap mark with --incremental")
+    parser.add_argument("--end",   help="YYYY-MM-DD (exclusive)")
+    parser.add_argument("--court", help="e.g. dcd, or a comma-separated list")
+    parser.add_argument("--courts-file", help="one court slug per line, e.g. district_slugs.txt")
+    parser.add_argument("--workers", type=int,   default=WORKERS, help="concurrent slices")
+    parser.add_argument("--rate",    type=float, default=RATE_LIMIT, help="requests / second, all workers")
+    parser.add_argument("--incremental", action="store_true", help="only records modified since last sync")
+    parser.add_argument("--resources", help=f"comma-separated subset of {','.join(RESOURCES)} (default: all)")
+    parser.add_argument("--cache", action="store_true", help=f"serve repeat pages from {CACHE_PATH}")
+    parser.add_argument("--cache-ttl", type=float, default=TTL_HOURS, help="cache entry lifetime, hours")
+    parser.add_argument("--cache-min-age", type=float, default=CACHE_MIN_AGE_DAYS,
+                        help="only cache slices whose month ended this many days ago")
+    parser.add_argument("--api-root", default=API_ROOT, help="e.g. a replay server from http_cache")
     args = parser.parse_args()
-    main(args.start, args.end, args.court)
+    main(args.start, args.end, args.court, args.courts_file, args.workers, args.rate, args.incremental,
+         args.cache, args.cache_ttl, args.api_root, args.resources, args.cache_min_age)
@@ -0,0 +1,162 @@
+"""
+On-disk response cache for the CourtListener client, plus a replay server.
+
+Pages are keyed by URL path + sorted query parameters (host-agnostic, so a
+page recorded from the live API is found again when replayed locally) and
+kept in a small SQLite file with a TTL and a size cap (least-recently-used
+entries are evicted first).
+
+Replay a recorded cache as a stub API, e.g. to benchmark the fetcher offline:
+
+    python -m src.data.http_cache serve --port 8765
+    python -m src.data.fetch_courtlistener --api-root http://127.0.0.1:8765/api/rest/v4/ …
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Mapping
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from src.data.raw_sink import loads
+
+# ────────────────────────────── constants ─────────────────────────────
+CACHE_PATH  = Path("data/cache/http.sqlite")
+TTL_HOURS   = 24 * 30
+MAX_MB      = 2048
+UPSTREAM    = "https://www.courtlistener.com"
+LOG         = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key      TEXT PRIMARY KEY,
+    url      TEXT    NOT NULL,
+    status   INTEGER NOT NULL,
+    body     BLOB    NOT NULL,          -- zlib-compressed
+    size     INTEGER NOT NULL,
+    created  REAL    NOT NULL,
+    accessed REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed);
+"""
+
+
+def cache_key(url: str, params: Mapping[str, Any] | None = None) -> str:
+    """Path + sorted query (URL query merged with `params`); the host is ignored."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    query += [(k, str(v)) for k, v in (params or {}).items()]
+    norm  = parts.path + "?" + urlencode(sorted(query))
+    return hashlib.sha256(norm.encode()).hexdigest()
+
+
+class CachedResponse:
+    """The slice of `requests.Response` the fetcher relies on."""
+
+    def __init__(self, url: str, status_code: int, content: bytes) -> None:
+        self.url         = url
+        self.status_code = status_code
+        self.content     = content
+
+    def json(self) -> Any:
+        return loads(self.content)
+
+
+class ResponseCache:
+    """Thread-safe SQLite page cache with TTL and LRU size eviction."""
+
+    def __init__(self, path: Path = CACHE_PATH, *, ttl_hours: float | None = TTL_HOURS,
+                 max_mb: float = MAX_MB) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.ttl       = ttl_hours * 3600 if ttl_hours else None
+        self.max_bytes = int(max_mb * 2**20)
+        self._lock     = threading.Lock()
+        self._db       = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, url: str, params: Mapping[str, Any] | None = None, *,
+            ignore_ttl: bool = False) -> CachedResponse | None:
+        key, now = cache_key(url, params), time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, status, body, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self.ttl and not ignore_ttl and now - row[3] > self.ttl:
+                return None
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        return CachedResponse(row[0], row[1], zlib.decompress(row[2]))
+
+    def put(self, url: str, params: Mapping[str, Any] | None, status: int, content: bytes) -> None:
+        key, now = cache_key(url, params), time.time()
+        body = zlib.compress(content)
+        with self._lock:
+            old = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, url, status, body, len(body), now, now),
+            )
+            self._bytes += len(body) - (old[0] if old else 0)
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop least-recently-used rows until the cache is back under 90 % of its cap."""
+        target = int(self.max_bytes * 0.9)
+        for key, size in self._db.execute(
+            "SELECT key, size FROM responses ORDER BY accessed"
+        ).fetchall():
+            if self._bytes <= target:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._bytes -= size
+        LOG.info("🧹 http cache evicted down to %.0f MB", self._bytes / 2**20)
+
+
+# ──────────────────────────── replay server ───────────────────────────
+def serve(port: int, path: Path = CACHE_PATH, host: str = "127.0.0.1",
+          upstream: str = UPSTREAM) -> None:
+    """Serve recorded pages (TTL ignored) as a stub CourtListener API; 404 on a miss."""
+    cache = ResponseCache(path, ttl_hours=None)
+    base  = f"http://{host}:{port}"
+
+    class Replay(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            hit = cache.get(self.path, ignore_ttl=True)
+            if hit is None:
+                self.send_error(404, "not recorded")
+                return
+            # keep pagination on the stub: rewrite absolute `next` links
+            body = hit.content.replace(upstream.encode(), base.encode())
+            self.send_response(hit.status_code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt: str, *args: Any) -> None:
+            LOG.debug(fmt, *args)
+
+    LOG.info("▶️  replaying %s on %s", path, base)
+    ThreadingHTTPServer((host, port), Replay).serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    subs = parser.add_subparsers(dest="cmd", required=True)
+    srv = subs.add_parser("serve", help="replay recorded pages as a local stub API")
+    srv.add_argument("--port", type=int, default=8765)
+    srv.add_argument("--db", type=Path, default=CACHE_PATH)
+    srv.add_argument("--upstream", default=UPSTREAM, help="origin to rewrite in recorded `next` links")
+    args = parser.parse_args()
+    serve(args.port, args.db, upstream=args.upstream)
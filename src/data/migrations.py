@@ -0,0 +1,91 @@
+"""
+Versioned schema migrations.
+
+A database starts from a baseline – sql/schema.sql, or its partitioned
+variant – recorded as version 0 in `schema_migrations`; after that every
+sql/migrations/NNNN_<name>.sql file runs exactly once, in order, each in the
+same transaction as its bookkeeping row. Databases created before the runner
+existed are adopted the same way: the baseline is idempotent DDL, so it is
+simply applied (once more) and recorded.
+
+Runs take an advisory lock, so concurrent ingests don't race each other.
+
+    python -m src.data.migrations status
+    python -m src.data.migrations apply [--partitioned]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import re
+from pathlib import Path
+
+from sqlalchemy import text
+
+from src.data.partitions import SCHEMA_SQL as PARTITIONED_BASELINE
+from src.utils.db import get_engine
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path("sql/migrations")
+BASELINE       = Path("sql/schema.sql")
+_FILE_RE       = re.compile(r"^(\d{4})_(\w+)\.sql$")
+_LOCK_KEY      = 0x6D69_6772                     # advisory lock serialising migration runs
+
+
+def pending_files() -> list[tuple[int, Path]]:
+    """(version, path) of every migration file, in version order."""
+    found = [(int(m[1]), p) for p in MIGRATIONS_DIR.glob("*.sql") if (m := _FILE_RE.match(p.name))]
+    versions = [v for v, _ in found]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"duplicate migration numbers in {MIGRATIONS_DIR}")
+    return sorted(found)
+
+
+def applied(conn) -> dict[int, str]:
+    if conn.execute(text("SELECT to_regclass('schema_migrations')")).scalar() is None:
+        return {}
+    return dict(conn.execute(text("SELECT version, name FROM schema_migrations")).all())
+
+
+def apply(conn, baseline: Path = BASELINE) -> list[str]:
+    """
+    Bring the schema up to date inside the caller's transaction; returns the
+    names applied. `baseline` only matters for a database without version 0.
+    """
+    conn.execute(text("SELECT pg_advisory_xact_lock(:k)"), {"k": _LOCK_KEY})
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version    INT PRIMARY KEY,
+            name       TEXT NOT NULL,
+            applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )"""))
+    done, ran = applied(conn), []
+    todo = ([] if 0 in done else [(0, baseline)]) + [(v, p) for v, p in pending_files() if v not in done]
+    for version, path in todo:
+        conn.execute(text(path.read_text()))
+        conn.execute(text("INSERT INTO schema_migrations (version, name) VALUES (:v, :n)"),
+                     {"v": version, "n": path.name})
+        logger.info("➕ migration %04d applied (%s)", version, path.name)
+        ran.append(path.name)
+    return ran
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+    parser = argparse.ArgumentParser()
+    subs = parser.add_subparsers(dest="cmd", required=True)
+    subs.add_parser("status", help="list applied and pending migrations")
+    app = subs.add_parser("apply", help="apply pending migrations")
+    app.add_argument("--partitioned", action="store_true",
+                     help="new database only: start from the partitioned baseline")
+    args = parser.parse_args()
+
+    with get_engine().begin() as conn:
+        if args.cmd == "apply":
+            print("\n".join(apply(conn, PARTITIONED_BASELINE if args.partitioned else BASELINE))
+                  or "up to date")
+        else:
+            done = applied(conn)
+            for version, path in [(0, BASELINE)] + pending_files():
+                print(f"{version:04d}  {'applied' if version in done else 'pending':8}  {done.get(version, path.name)}")
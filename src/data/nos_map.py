@@ -3,7 +3,16 @@
 #  Official “Nature-of-Suit” lookup table  (last synchronised: 2025-07-14)
 #  ── Keys:   3-digit integer NOS codes
 #  ── Values: human-readable titles (title-case, no trailing dashes)
+#
+#  Below the dicts sit dense array lookups (code → title id / chapter id)
+#  and vectorised parse / lookup helpers shared by transform and the
+#  dashboard, so neither does per-row regex or dict work.
 # ------------------------------------------------------------------
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
 
 NOS_MAP: dict[int, str] = {
     # ───────────────────── Contract (110-199) ─────────────────────
@@ -136,3 +145,140 @@ NOS_MAP: dict[int, str] = {
     900: "EAJA Fee Appeal (eliminated)",
     950: "Constitutionality of State Statutes",
 }
+
+
+# ------------------------------------------------------------------
+#  NOS code → chapter (the treemap's parent boxes)
+# ------------------------------------------------------------------
+NOS_CHAPTER: dict[int, str] = {
+
+    # Contract (110-199)
+    **{k: "Contract" for k in (
+        110, 120, 130, 140, 150, 151, 152, 153,
+        160, 190, 195, 196)},
+
+    # Real Property (210-299)
+    **{k: "Real Property" for k in (210, 220, 230, 240, 245, 290)},
+
+    # Torts – Personal Injury (310-368, 375)
+    **{k: "Torts · Pers Injury" for k in (
+        310, 315, 320, 330, 340, 345,
+        350, 355, 360, 362, 365, 367, 368, 375)},
+
+    # Torts – Personal Property (370-385)
+    **{k: "Torts · Pers Property" for k in (370, 371, 380, 385)},
+
+    # Bankruptcy (422-423)
+    **{k: "Bankruptcy" for k in (422, 423)},
+
+    # Civil Rights (440-448)
+    **{k: "Civil Rights" for k in (
+        440, 441, 442, 443, 444, 445, 446, 448)},
+
+    # Immigration (462-465)
+    **{k: "Immigration" for k in (462, 463, 465)},
+
+    # Prisoner / Habeas (510-560)
+    **{k: "Prisoner / Habeas" for k in (
+        510, 530, 535, 540, 550, 555, 560)},
+
+    # Forfeiture / Penalty (610-690)
+    **{k: "Forfeiture / Penalty" for k in (
+        610, 620, 625, 630, 640, 650, 660, 690)},
+
+    # Labor (710-799)
+    **{k: "Labor" for k in (
+        710, 720, 730, 740, 751, 790, 791)},
+
+    # Intellectual Property & related (820-840)
+    **{k: "Property Rights" for k in (820, 830, 840)},
+
+    # Social Security (861-865)
+    **{k: "Social Security" for k in (861, 862, 863, 864, 865)},
+
+    # Federal Tax Suits (870-871)
+    **{k: "Federal Tax" for k in (870, 871)},
+
+    # Other Statutes / Misc. Federal Civil
+    **{k: "Other Statutes" for k in (
+        400, 410, 430, 450, 460, 470, 480, 490,
+        810, 850, 875,
+        890, 891, 892, 893, 894, 895, 896, 899, 900, 950)},
+}
+
+
+# ------------------------------------------------------------------
+#  Dense lookups: index any array of codes (0-999) directly
+#  ── title id   = position in NOS_CODES   (-1 → unknown code)
+#  ── chapter id = position in CHAPTERS    (-1 → no chapter)
+# ------------------------------------------------------------------
+NOS_CODES  = np.array(sorted(NOS_MAP), dtype=np.int16)
+TITLES     = np.array([NOS_MAP[c] for c in NOS_CODES], dtype=object)
+CHAPTERS   = tuple(dict.fromkeys(NOS_CHAPTER.values()))
+
+TITLE_ID   = np.full(1000, -1, dtype=np.int16)
+TITLE_ID[NOS_CODES] = np.arange(len(NOS_CODES))
+CHAPTER_ID = np.full(1000, -1, dtype=np.int8)
+CHAPTER_ID[list(NOS_CHAPTER)] = [CHAPTERS.index(ch) for ch in NOS_CHAPTER.values()]
+
+NOS_DTYPE     = pd.CategoricalDtype(NOS_CODES)        # categories = codes, order = code
+CHAPTER_DTYPE = pd.CategoricalDtype(CHAPTERS)
+
+def parse_codes(values) -> np.ndarray:
+    r"""
+    Leading 3-digit NOS code of each value as int16, -1 where there is none
+    (same result as `str.extract(r"^(\d{3})")`, without the regex).
+
+    Strings are read straight from the Arrow offsets/data buffers; numeric
+    input (already parsed codes, NaN for missing) is just cast.
+    """
+    if isinstance(values, (pd.Series, np.ndarray)) and values.dtype.kind in "iuf":
+        codes = pd.Series(values).fillna(-1).to_numpy()
+        return np.where((codes >= 0) & (codes < 1000), codes, -1).astype(np.int16)
+
+    arr = values if isinstance(values, (pa.Array, pa.ChunkedArray)) else pa.array(values, pa.string(), from_pandas=True)
+    if isinstance(arr, pa.ChunkedArray):
+        arr = arr.combine_chunks() if arr.num_chunks else pa.array([], pa.string())
+    if not pa.types.is_large_string(arr.type):
+        arr = arr.cast(pa.string())
+
+    _, offsets, data = arr.buffers()
+    if not len(arr) or data is None or data.size < 3:
+        return np.full(len(arr), -1, dtype=np.int16)
+    off   = np.frombuffer(offsets, dtype=np.int64 if pa.types.is_large_string(arr.type) else np.int32)
+    off   = off[arr.offset : arr.offset + len(arr) + 1]
+    start = off[:-1]
+    ok    = off[1:] - start >= 3
+    if arr.null_count:
+        ok &= arr.is_valid().to_numpy(zero_copy_only=False)
+    buf   = np.frombuffer(data, dtype=np.uint8)
+    start = np.minimum(start, len(buf) - 3)               # short rows are masked anyway
+    d0, d1, d2 = (buf[start + k] - np.uint8(ord("0")) for k in range(3))
+    ok   &= (d0 < 10) & (d1 < 10) & (d2 < 10)              # uint8 wrap-around catches < "0"
+    code  = d0.astype(np.int16) * 100 + d1.astype(np.int16) * 10 + d2
+    return np.where(ok, code, -1).astype(np.int16)
+
+
+def lookup(codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(title id, chapter id) for an array of codes; -1 where unknown."""
+    codes = np.asarray(codes)
+    valid = (codes >= 0) & (codes < 1000)
+    idx   = np.where(valid, codes, 0)
+    return (np.where(valid, TITLE_ID[idx], -1).astype(np.int16),
+            np.where(valid, CHAPTER_ID[idx], -1).astype(np.int8))
+
+
+def nos_categorical(codes: np.ndarray) -> pd.Categorical:
+    """Codes as a NOS_DTYPE categorical (unknown codes → NaN)."""
+    return pd.Categorical.from_codes(lookup(codes)[0], dtype=NOS_DTYPE)
+
+
+def chapter_categorical(codes: np.ndarray) -> pd.Categorical:
+    """Chapter of each code as a CHAPTER_DTYPE categorical (no chapter → NaN)."""
+    return pd.Categorical.from_codes(lookup(codes)[1], dtype=CHAPTER_DTYPE)
+
+
+def titles(codes: np.ndarray) -> np.ndarray:
+    """Official title of each code (None where unknown)."""
+    tid = lookup(codes)[0]
+    return np.where(tid >= 0, TITLES[np.maximum(tid, 0)], None)
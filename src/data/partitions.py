@@ -0,0 +1,172 @@
+"""
+Yearly partitions for the range-partitioned `cases` variant (sql/schema_partitioned.sql).
+
+Partitions are never created with `CREATE TABLE … PARTITION OF`, which takes
+an ACCESS EXCLUSIVE lock on `cases` and so waits for, and blocks, every
+loader. A partition is built as a stand-alone table instead, given a CHECK
+constraint that matches its bounds, and attached. ATTACH only needs SHARE
+UPDATE EXCLUSIVE on the parent and skips its validation scan when the CHECK
+already proves the bounds, so attaching is cheap even for a freshly
+bulk-loaded year.
+
+    python -m src.data.partitions list
+    python -m src.data.partitions create --years 1990 2026
+    python -m src.data.partitions migrate [--drop-old]    # plain heap → partitioned
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Iterable
+
+from sqlalchemy import text
+
+from src.data import summaries
+from src.utils.db import get_engine
+
+logger = logging.getLogger(__name__)
+
+PARENT      = "cases"
+SCHEMA_SQL  = Path("sql/schema_partitioned.sql")
+_NAME_RE    = re.compile(rf"^{PARENT}_y(\d{{4}})$")
+_CREATE_KEY = 0x636173_6573                      # advisory lock serialising partition DDL
+
+
+def partition_name(year: int) -> str:
+    return f"{PARENT}_y{year}"
+
+
+def _bounds(year: int) -> tuple[str, str]:
+    return f"{year}-01-01", f"{year + 1}-01-01"
+
+
+def is_partitioned(conn) -> bool:
+    return conn.execute(text(
+        "SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:t)"
+    ), {"t": PARENT}).scalar() is True
+
+
+def existing_years(conn) -> set[int]:
+    rows = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:t)"
+    ), {"t": PARENT})
+    return {int(m[1]) for (name,) in rows if (m := _NAME_RE.match(name))}
+
+
+def attach_loaded(conn, table: str, year: int) -> None:
+    """
+    Attach a stand-alone, already loaded table as the `year` partition.
+
+    The CHECK constraint is validated against the new table alone, then lets
+    ATTACH skip re-scanning it; it is dropped again once the partition
+    constraint has taken over.
+    """
+    lo, hi = _bounds(year)
+    check  = f"{table}_bounds"
+    conn.execute(text(
+        f"ALTER TABLE {table} ADD CONSTRAINT {check} "
+        f"CHECK (filing_date IS NOT NULL AND filing_date >= DATE '{lo}' AND filing_date < DATE '{hi}')"
+    ))
+    conn.execute(text(
+        f"ALTER TABLE {PARENT} ATTACH PARTITION {table} FOR VALUES FROM ('{lo}') TO ('{hi}')"
+    ))
+    conn.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT {check}"))
+
+
+def ensure_partitions(conn, years: Iterable[int]) -> list[int]:
+    """
+    Create (empty) partitions for any of `years` that are missing; returns
+    those created. Runs in the caller's transaction – commit it promptly, the
+    advisory lock that serialises concurrent loaders is held until then.
+    """
+    missing = set(years) - existing_years(conn)
+    if not missing:
+        return []
+    conn.execute(text("SELECT pg_advisory_xact_lock(:k)"), {"k": _CREATE_KEY})
+    missing -= existing_years(conn)                  # another loader may have won the race
+    for year in sorted(missing):
+        table = partition_name(year)
+        conn.execute(text(f"CREATE TABLE {table} (LIKE {PARENT} INCLUDING DEFAULTS)"))
+        attach_loaded(conn, table, year)
+        logger.info("➕ partition %s created", table)
+    return sorted(missing)
+
+
+# ─── heap → partitioned migration ─────────────────────────────
+def migrate(drop_old: bool = False) -> None:
+    """
+    Convert a plain `cases` table into the partitioned layout in one
+    transaction: the old table is renamed to cases_heap, every year is
+    bulk-copied into a stand-alone table (sorted by case_id) and attached.
+    Undated rows cannot be placed and stay behind in cases_heap.
+    """
+    engine = get_engine()
+    with engine.begin() as conn:
+        if is_partitioned(conn):
+            logger.info("%s is already partitioned – nothing to do", PARENT)
+            return
+        t0 = time.perf_counter()
+
+        # keep the old table, its index names and FKs out of the new layout's way
+        for tbl, con in conn.execute(text(
+            "SELECT conrelid::regclass::text, conname FROM pg_constraint "
+            "WHERE contype = 'f' AND confrelid = to_regclass(:t)"
+        ), {"t": PARENT}).all():
+            conn.execute(text(f"ALTER TABLE {tbl} DROP CONSTRAINT {con}"))
+        conn.execute(text(f"ALTER TABLE {PARENT} RENAME TO {PARENT}_heap"))
+        conn.execute(text(f"ALTER INDEX IF EXISTS {PARENT}_pkey RENAME TO {PARENT}_heap_pkey"))
+        conn.execute(text(f"ALTER INDEX IF EXISTS idx_{PARENT}_court_date RENAME TO idx_{PARENT}_heap_court_date"))
+        conn.execute(text(SCHEMA_SQL.read_text()))
+
+        cols  = ", ".join(r[0] for r in conn.execute(text(
+            "SELECT attname FROM pg_attribute WHERE attrelid = to_regclass(:t) "
+            "AND attnum > 0 AND NOT attisdropped ORDER BY attnum"
+        ), {"t": PARENT}))
+        years = [int(y) for (y,) in conn.execute(text(
+            f"SELECT DISTINCT EXTRACT(year FROM filing_date)::int FROM {PARENT}_heap "
+            "WHERE filing_date IS NOT NULL ORDER BY 1"
+        ))]
+        for year in years:
+            lo, hi = _bounds(year)
+            table  = partition_name(year)
+            conn.execute(text(f"CREATE TABLE {table} (LIKE {PARENT} INCLUDING DEFAULTS)"))
+            n = conn.execute(text(
+                f"INSERT INTO {table} ({cols}) SELECT {cols} FROM {PARENT}_heap "
+                f"WHERE filing_date >= DATE '{lo}' AND filing_date < DATE '{hi}' ORDER BY case_id"
+            )).rowcount
+            attach_loaded(conn, table, year)             # builds the partition's indexes
+            logger.info("  %s: %d rows", table, n)
+
+        undated = conn.execute(text(
+            f"SELECT count(*) FROM {PARENT}_heap WHERE filing_date IS NULL"
+        )).scalar()
+        summaries.rebuild(conn)                      # undated cases no longer count
+        if drop_old:
+            conn.execute(text(f"DROP TABLE {PARENT}_heap"))
+        logger.info("✓ %s partitioned into %d years in %.1fs (%d undated rows %s)", PARENT, len(years),
+                    time.perf_counter() - t0, undated, "dropped" if drop_old else f"left in {PARENT}_heap")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+    parser = argparse.ArgumentParser()
+    subs = parser.add_subparsers(dest="cmd", required=True)
+    subs.add_parser("list", help="show existing yearly partitions")
+    create = subs.add_parser("create", help="pre-create yearly partitions")
+    create.add_argument("--years", type=int, nargs=2, metavar=("FIRST", "LAST"), required=True)
+    mig = subs.add_parser("migrate", help="convert a plain cases table to the partitioned layout")
+    mig.add_argument("--drop-old", action="store_true", help="drop cases_heap once copied")
+    args = parser.parse_args()
+
+    if args.cmd == "migrate":
+        migrate(args.drop_old)
+    else:
+        with get_engine().connect() as conn:
+            if args.cmd == "create":
+                ensure_partitions(conn, range(args.years[0], args.years[1] + 1))
+                conn.commit()
+            print(", ".join(partition_name(y) for y in sorted(existing_years(conn))) or "no partitions")
@@ -0,0 +1,193 @@
+"""
+Compressed, rotating JSONL sink for raw CourtListener pages (and its reader).
+
+A stream named <stem> is written as numbered shards
+
+    data/raw/<stem>.0000.jsonl.zst, <stem>.0001.jsonl.zst, …
+
+zstd when `zstandard` is installed, gzip otherwise. Rows are buffered and
+flushed as *self-contained* zstd frames / gzip members, so a shard can be
+truncated at any `checkpoint()` offset and appended to again – that is what
+lets the fetcher resume a slice mid-way. Rotation only happens at checkpoints.
+"""
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import re
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List
+
+try:                                   # optional: ~3× faster than stdlib json
+    import orjson
+except ImportError:
+    orjson = None
+
+try:                                   # optional: better ratio & speed than gzip
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# ────────────────────────────── constants ─────────────────────────────
+CODEC           = "zst" if zstandard else "gz"
+MAX_SHARD_ROWS  = 250_000
+MAX_SHARD_BYTES = 128 * 2**20          # compressed bytes
+FRAME_BYTES     = 4 * 2**20            # uncompressed bytes buffered per frame
+ZSTD_LEVEL      = 3
+
+_SHARD_RE = re.compile(r"^(?P<stem>.+?)(?:\.(?P<idx>\d{4}))?\.jsonl(?:\.(?P<codec>zst|gz))?$")
+
+
+# ─────────────────────────── (de)serialisation ─────────────────────────
+def dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj) if orjson else json.dumps(obj).encode()
+
+def loads(line: bytes | str) -> Any:
+    return orjson.loads(line) if orjson else json.loads(line)
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "zst":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+# ───────────────────────────── reader side ─────────────────────────────
+def stem_of(path: Path) -> str:
+    """`<stem>.0003.jsonl.zst` → `<stem>.0003`; a plain legacy `<stem>.jsonl` → `<stem>`."""
+    m = _SHARD_RE.match(path.name)
+    if not m:
+        return path.stem
+    return m["stem"] + (f".{m['idx']}" if m["idx"] else "")
+
+def open_raw(path: Path) -> BinaryIO:
+    """Binary line-iterable handle over a plain, .gz or .zst JSONL shard."""
+    if path.suffix == ".zst":
+        if zstandard is None:
+            raise RuntimeError(f"{path.name}: install `zstandard` to read .zst shards")
+        raw = zstandard.ZstdDecompressor().stream_reader(path.open("rb"), read_across_frames=True,
+                                                          closefd=True)
+        return io.BufferedReader(raw)
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    return path.open("rb")
+
+def iter_records(path: Path) -> Iterator[dict]:
+    with open_raw(path) as fh:
+        for line in fh:
+            if line.strip():
+                yield loads(line)
+
+
+# ───────────────────────────── writer side ─────────────────────────────
+class RawSink:
+    """
+    Buffered, compressed, rotating JSONL writer for one raw stream.
+
+    `resume` takes a dict previously returned by `checkpoint()`: later shards
+    are deleted, the current one truncated to the saved offset, and writing
+    continues from there. Without it the stream starts over, and every file
+    it left before – in any codec, or the legacy plain `<stem>.jsonl` – is
+    deleted, so transform never reads two generations of the same stream.
+    """
+
+    def __init__(self, directory: Path, stem: str, *, codec: str = CODEC,
+                 max_rows: int = MAX_SHARD_ROWS, max_bytes: int = MAX_SHARD_BYTES,
+                 resume: Dict[str, Any] | None = None) -> None:
+        self.directory  = Path(directory)
+        self.stem       = stem
+        self.codec      = resume["codec"] if resume else codec
+        self.max_rows   = max_rows
+        self.max_bytes  = max_bytes
+        self.shard      = 0
+        self.rows       = 0            # across all shards
+        self.shard_rows = 0
+        self._buf: List[bytes] = []
+        self._buf_bytes = 0
+        self._fh: BinaryIO | None = None
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        if resume:
+            self.shard, self.rows, self.shard_rows = resume["shard"], resume["rows"], resume["shard_rows"]
+            keep = {p for p in self.shards if int(_SHARD_RE.match(p.name)["idx"]) <= self.shard}
+            for p in self._stream_files():
+                if p not in keep:                       # later shards, or another codec's
+                    p.unlink()
+            if self._path.exists():
+                with self._path.open("r+b") as fh:      # drop frames past the checkpoint
+                    fh.truncate(resume["bytes"])
+        else:
+            for p in self._stream_files():              # a fresh stream replaces old shards,
+                p.unlink()                              # whatever codec wrote them
+
+    # ── public API ─────────────────────────────────────────────────────
+    @property
+    def shards(self) -> List[Path]:
+        return sorted(self.directory.glob(f"{self.stem}.[0-9][0-9][0-9][0-9].jsonl.{self.codec}"))
+
+    def write(self, obj: Any) -> None:
+        line = dumps(obj) + b"\n"
+        self._buf.append(line)
+        self._buf_bytes += len(line)
+        self.rows       += 1
+        self.shard_rows += 1
+        if self._buf_bytes >= FRAME_BYTES:
+            self._flush_frame()
+
+    def write_many(self, objs: Iterable[Any]) -> None:
+        for obj in objs:
+            self.write(obj)
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """Flush a complete frame, rotate if the shard is full, return resumable state."""
+        self._flush_frame()
+        if self._fh is not None:
+            self._fh.flush()
+        if self._fh is not None and (self.shard_rows >= self.max_rows
+                                     or self._fh.tell() >= self.max_bytes):
+            self._fh.close()
+            self._fh = None
+            self.shard += 1
+            self.shard_rows = 0
+        return self.state()
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            "codec": self.codec,
+            "shard": self.shard,
+            "bytes": self._fh.tell() if self._fh else (self._path.stat().st_size if self._path.exists() else 0),
+            "rows": self.rows,
+            "shard_rows": self.shard_rows,
+            "shards": [p.name for p in self.shards],
+        }
+
+    def close(self) -> None:
+        self._flush_frame()
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def __enter__(self) -> "RawSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ── internals ──────────────────────────────────────────────────────
+    def _stream_files(self) -> List[Path]:
+        """Every file of this stream: shards of any codec, and a legacy plain `<stem>.jsonl`."""
+        return [p for p in self.directory.glob(f"{self.stem}.*")
+                if (m := _SHARD_RE.match(p.name)) and m["stem"] == self.stem]
+
+    @property
+    def _path(self) -> Path:
+        return self.directory / f"{self.stem}.{self.shard:04d}.jsonl.{self.codec}"
+
+    def _flush_frame(self) -> None:
+        if not self._buf:
+            return
+        if self._fh is None:                            # opened lazily: no empty shards
+            self._fh = self._path.open("ab", buffering=1 << 20)   # buffered writer
+        self._fh.write(_compress(b"".join(self._buf), self.codec))
+        self._buf.clear()
+        self._buf_bytes = 0
@@ -0,0 +1,269 @@
+"""
+Derived data kept current by ingest instead of being recomputed.
+
+Each summary in SUMMARIES is a GROUP BY over case rows:
+
+    judge_year_stats   per (judge_id, outcome year): outcome count and wins –
+                       what judge_win_rates reports
+    case_daily_rollup  per (filing day, court, NOS code, closed?): docket
+                       count and sum / sum of squares of days-to-close – what
+                       the dashboard re-aggregates into its buckets; undated
+                       dockets are kept under a NULL day
+
+A load only ever changes one through the case_ids it touches, so every merged
+batch is bracketed:
+
+    before(cur, table, track)  # which staged case_ids change an input of
+                               # each summary, and their current
+                               # contribution, subtracted
+    … merge …
+    after(cur, track)          # the same case_ids' new contribution, added
+    apply(cur, track)          # once per file: fold the deltas in
+
+all inside the loader's transaction, so the summaries commit (or roll back)
+with the rows they describe. Unchanged rows cost one indexed comparison and
+nothing else. `rebuild` recomputes them from scratch, for repair:
+
+    python -m src.data.summaries rebuild
+
+cases.win_bool mirrors outcomes.win_bool. `propagate_labels` copies it over
+for the outcomes stamped (outcomes.updated_at, see migration 0001) after the
+high-water mark kept in `watermarks`, then advances the mark – run it once the
+loaders have committed, as ingest does, so no stamp can land behind the mark.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from typing import NamedTuple
+
+from sqlalchemy import text
+
+from src.utils.db import get_engine
+
+logger = logging.getLogger(__name__)
+
+
+class Summary(NamedTuple):
+    table:    str                      # the summary table
+    key:      list[str]                # its unique key
+    measures: list[str]                # additive columns, the row count first
+    source:   str                      # aliased base relation, joined to touched case_ids
+    stats:    str                      # SELECT key + measures FROM {source} … GROUP BY key
+    touched:  dict[str, tuple[set[str], str]]  # loaded table → (input columns,
+                                               # staged case_ids whose merge changes them)
+
+
+SUMMARIES = [
+    Summary(
+        table="judge_year_stats",
+        key=["judge_id", "filing_year"],
+        measures=["total_cases", "wins"],
+        source="outcomes o",
+        stats="""
+            SELECT c.judge_id,
+                   EXTRACT(year FROM o.outcome_date)::INT AS filing_year,
+                   count(*)                               AS total_cases,
+                   count(*) FILTER (WHERE o.win_bool)     AS wins
+              FROM {source}
+              JOIN cases    c ON c.case_id = o.case_id
+             WHERE o.outcome IS NOT NULL
+             GROUP BY 1, 2""",
+        touched={
+            "cases": ({"judge_id"}, """
+                SELECT s.case_id FROM _stage s JOIN cases c USING (case_id)
+                 WHERE c.judge_id IS DISTINCT FROM s.judge_id"""),
+            "outcomes": ({"outcome", "outcome_date", "win_bool"}, """
+                SELECT s.case_id FROM _stage s LEFT JOIN outcomes o USING (case_id)
+                 WHERE (o.outcome, o.outcome_date, o.win_bool)
+                       IS DISTINCT FROM (s.outcome, s.outcome_date, s.win_bool)"""),
+        },
+    ),
+    Summary(
+        table="case_daily_rollup",
+        key=["day", "court_slug", "nos", "closed"],
+        measures=["n", "dtc_sum", "dtc_sumsq"],
+        source="cases c",
+        stats="""
+            SELECT c.filing_date                          AS day,
+                   c.court_slug,
+                   c.nature_of_suit_numeric               AS nos,
+                   c.closing_date IS NOT NULL             AS closed,
+                   count(*)                               AS n,
+                   coalesce(sum(abs(c.closing_date - c.filing_date)), 0)::BIGINT AS dtc_sum,
+                   coalesce(sum((c.closing_date - c.filing_date)::BIGINT
+                                * (c.closing_date - c.filing_date)), 0)::BIGINT AS dtc_sumsq
+              FROM {source}
+             GROUP BY 1, 2, 3, 4""",
+        touched={
+            "cases": ({"court_slug", "filing_date", "nature_of_suit_numeric", "closing_date"}, """
+                SELECT s.case_id FROM _stage s LEFT JOIN cases c USING (case_id)
+                 WHERE (c.court_slug, c.filing_date, c.nature_of_suit_numeric, c.closing_date)
+                       IS DISTINCT FROM (s.court_slug, s.filing_date, s.nature_of_suit_numeric,
+                                         s.closing_date)"""),
+        },
+    ),
+]
+
+
+def tracks(table: str, cols: list[str]) -> list[Summary]:
+    """The summaries that loading `cols` of `table` can move."""
+    return [s for s in SUMMARIES if table in s.touched and s.touched[table][0] & set(cols)]
+
+
+def missing(conn) -> list[str]:
+    """Summary tables that don't exist (yet)."""
+    return [s.table for s in SUMMARIES
+            if conn.execute(text("SELECT to_regclass(:t)"), {"t": s.table}).scalar() is None]
+
+
+def stage(cur, track: list[Summary]) -> None:
+    """Per-transaction scratch tables; call once before the first `before`."""
+    for s in track:
+        cur.execute(f"CREATE TEMP TABLE _touched_{s.table} (case_id BIGINT) ON COMMIT DROP")
+        cur.execute(f"CREATE TEMP TABLE _delta_{s.table} (LIKE {s.table}) ON COMMIT DROP")
+        cur.execute(f"CREATE TEMP TABLE _zeroed_{s.table} (row TID) ON COMMIT DROP")
+
+
+def _contribution(s: Summary, sign: str) -> str:
+    stats = s.stats.format(source=f"_touched_{s.table} t JOIN {s.source} USING (case_id)")
+    cols  = ", ".join(s.key + s.measures)
+    return (f"INSERT INTO _delta_{s.table} ({cols}) "
+            f"SELECT {', '.join(s.key)}, {', '.join(sign + m for m in s.measures)} FROM ({stats}) x")
+
+
+def before(cur, table: str, track: list[Summary]) -> int:
+    """Record which staged case_ids will change each summary, minus their current share."""
+    touched = 0
+    for s in track:
+        cur.execute(f"TRUNCATE _touched_{s.table}")
+        cur.execute(f"INSERT INTO _touched_{s.table} {s.touched[table][1]}")
+        touched += cur.rowcount
+        if cur.rowcount:
+            cur.execute(_contribution(s, "-"))
+    return touched
+
+
+def after(cur, track: list[Summary]) -> None:
+    """Add the touched case_ids' post-merge share."""
+    for s in track:
+        cur.execute(_contribution(s, ""))
+
+
+def apply(cur, track: list[Summary]) -> int:
+    """
+    Fold the collected deltas into the summary tables (in key order, so
+    concurrent loaders lock their rows in the same sequence); returns the
+    number of summary rows changed. Rows the deltas bring to zero are deleted
+    by the ctid the merge returned – the table itself is never scanned.
+    """
+    changed = 0
+    for s in track:
+        key  = ", ".join(s.key)
+        sums = ", ".join(f"sum({m})" for m in s.measures)
+        cur.execute(f"""
+            WITH merged AS (
+                INSERT INTO {s.table} AS t ({key}, {", ".join(s.measures)})
+                SELECT {key}, {sums}
+                  FROM _delta_{s.table}
+                 GROUP BY {key}
+                HAVING {" OR ".join(f"sum({m}) <> 0" for m in s.measures)}
+                 ORDER BY {key}
+                ON CONFLICT ({key}) DO UPDATE
+                   SET {", ".join(f"{m} = t.{m} + EXCLUDED.{m}" for m in s.measures)}
+                RETURNING t.ctid AS row, t.{s.measures[0]} AS n
+            ), zeroed AS (
+                INSERT INTO _zeroed_{s.table} SELECT row FROM merged WHERE n = 0
+            )
+            SELECT count(*) FROM merged
+        """)
+        n = cur.fetchone()[0]
+        if n:
+            changed += n
+            cur.execute(f"DELETE FROM {s.table} WHERE ctid = ANY(ARRAY(SELECT row FROM _zeroed_{s.table}))")
+            cur.execute(f"TRUNCATE _zeroed_{s.table}")
+        cur.execute(f"TRUNCATE _delta_{s.table}")
+    return changed
+
+
+# ─── cases.win_bool ───────────────────────────────────────────
+LABEL_MARK = "cases.win_bool"
+
+
+def propagate_labels(conn, full: bool = False) -> tuple[int, int]:
+    """
+    Copy win_bool from outcomes changed since the last run (all of them with
+    `full`) onto cases; returns (outcomes scanned, cases updated).
+    """
+    mark = None if full else conn.execute(text(
+        "SELECT mark FROM watermarks WHERE name = :n"), {"n": LABEL_MARK}).scalar()
+    scanned, updated, newest = conn.execute(text("""
+        WITH changed AS (
+            SELECT case_id, win_bool, updated_at FROM outcomes
+             WHERE updated_at > coalesce(CAST(:mark AS TIMESTAMPTZ), '-infinity')
+        ), labelled AS (
+            UPDATE cases c SET win_bool = ch.win_bool
+              FROM changed ch
+             WHERE c.case_id = ch.case_id AND c.win_bool IS DISTINCT FROM ch.win_bool
+            RETURNING 1
+        )
+        SELECT (SELECT count(*) FROM changed), (SELECT count(*) FROM labelled),
+               (SELECT max(updated_at) FROM changed)
+    """), {"mark": mark}).one()
+    if newest is not None:
+        conn.execute(text(
+            "INSERT INTO watermarks (name, mark) VALUES (:n, :m) "
+            "ON CONFLICT (name) DO UPDATE SET mark = greatest(watermarks.mark, EXCLUDED.mark)"
+        ), {"n": LABEL_MARK, "m": newest})
+    return scanned, updated
+
+
+# ─── data version ─────────────────────────────────────────────
+DATA_VERSION = "data_version"
+
+
+def bump_data_version(conn) -> None:
+    """
+    Stamp the data as changed; the dashboard's query cache keys on this
+    (dashboard/cache.py). Call in or after the transactions that changed it.
+    """
+    conn.execute(text(
+        "INSERT INTO watermarks (name, mark) VALUES (:n, clock_timestamp()) "
+        "ON CONFLICT (name) DO UPDATE SET mark = EXCLUDED.mark"
+    ), {"n": DATA_VERSION})
+
+
+def rebuild(conn) -> dict[str, int]:
+    """
+    Recompute every summary table from its base rows; returns their row
+    counts. Tables whose migration hasn't run yet are skipped – ingest fills
+    them when it creates them.
+    """
+    rows = {}
+    absent = missing(conn)
+    for s in SUMMARIES:
+        if s.table in absent:
+            continue
+        conn.execute(text(f"TRUNCATE {s.table}"))
+        rows[s.table] = conn.execute(text(
+            f"INSERT INTO {s.table} ({', '.join(s.key + s.measures)}) "
+            + s.stats.format(source=s.source)
+        )).rowcount
+    return rows
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+    parser = argparse.ArgumentParser()
+    subs = parser.add_subparsers(dest="cmd", required=True)
+    subs.add_parser("rebuild", help="recompute the summary tables and cases.win_bool from scratch")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    with get_engine().begin() as conn:
+        n = rebuild(conn)
+        _, labelled = propagate_labels(conn, full=True)
+        bump_data_version(conn)
+    logger.info("✓ %s rebuilt, %d win_bool labels fixed in %.1fs",
+                ", ".join(f"{t} ({r} rows)" for t, r in n.items()), labelled, time.perf_counter() - t0)
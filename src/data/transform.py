@@ -1,16 +1,97 @@
 """
-Convert raw JSONL into tidy parquet files under data/processed/.
+Convert raw JSONL into Hive-partitioned parquet datasets under data/processed/.
+
+    data/processed/cases/court=<slug>/year=<yyyy>/month=<mm>/<raw stem>.parquet
+
+Partitions follow court_slug and filing year/month, so readers can prune by
+path and by row-group statistics (files are sorted by case_id). Full-range
+pulls (dockets_*) and incremental deltas (delta_*) share one parser; each
+output keeps its raw stem so ingest can tell them apart. Compressed shards
+(.jsonl.zst / .jsonl.gz) are read transparently.
+
+The tables hanging off a case get datasets of their own, laid out the same way
+and keyed by their own id:
+
+    outcomes/  ← the IDB disposition fields of dockets_* / delta_* records
+    filings/   ← docket entries   (entries_* / entries-delta_*)
+    parties/   ← parties          (parties_* / parties-delta_*)
+
+An outcome sits in its case's partition. Entries and parties are fetched per
+(court, docket filing month) slice, so they take that slice's partition; ones
+from a `-delta` pull have no filing month and go to the NULL year/month.
+
+Each input is streamed in fixed-size record batches: only the COLS fields are
+kept, the regex extraction runs vectorised on each Arrow batch, and rows are
+buffered per partition only up to one row group – peak memory stays bounded
+whatever the file size.
+
+`--jobs N` fans the raw files (shards already cap their size) out to a process
+pool; a file that fails is logged and skipped, the rest of the run carries on.
+
+data/processed/_manifest.json records, per raw file, its size, mtime, content
+hash and outputs. Re-runs only transform new or changed inputs and delete the
+outputs of raw files that have disappeared (`--force` rebuilds everything).
+
+data/processed/_case_ids.npy is a bitmap of every case_id already written to
+the cases dataset by a dockets_* file. Overlapping fetch ranges therefore
+produce each case once: a row whose id is already claimed goes to the
+cases_updates dataset (same partitioning, basename prefixed with the raw
+file's mtime, so readers can interleave them with delta_* files in fetch
+order – see case_files.py) and is upserted rather than inserted; its outcome
+goes to a file with the same prefix in outcomes/, so outcomes replay in the
+same order as their cases. A file's ids are released when it is
+re-transformed or its raw file disappears; a released id no file claims
+again is handed to a file that still holds it as an update, which is
+re-transformed so the case keeps a row in cases/. delta_* files are an
+update stream already and bypass the index.
 """
 
 from __future__ import annotations
-import json, logging, re
+import argparse, hashlib, logging, re, time
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from typing import Callable, Iterator, List, NamedTuple, Tuple
+
+import numpy as np
+
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from src.data.case_files import STAMP_FMT
+from src.data.nos_map import parse_codes
+from src.data.raw_sink import iter_records, stem_of
+from src.utils.id_bitmap import IdBitmap
+from src.utils.manifest import JsonManifest
 
-log      = logging.getLogger(__name__)
-RAW_DIR  = Path("data/raw")
-PROC_DIR = Path("data/processed")
+log            = logging.getLogger(__name__)
+RAW_DIR        = Path("data/raw")
+PROC_DIR       = Path("data/processed")
 PROC_DIR.mkdir(parents=True, exist_ok=True)
+MANIFEST       = PROC_DIR / "_manifest.json"
+CASES_DIR      = PROC_DIR / "cases"
+UPDATES_DIR    = PROC_DIR / "cases_updates"
+OUTCOMES_DIR   = PROC_DIR / "outcomes"
+FILINGS_DIR    = PROC_DIR / "filings"
+PARTIES_DIR    = PROC_DIR / "parties"
+ID_INDEX       = PROC_DIR / "_case_ids.npy"
+RAW_GLOBS      = ("dockets_*.jsonl*", "delta_*.jsonl*", "entries_*.jsonl*", "entries-delta_*.jsonl*",
+                  "parties_*.jsonl*", "parties-delta_*.jsonl*")
+# bumped whenever an output schema changes: older manifest entries are re-transformed
+VERSION        = 4
+BATCH_ROWS     = 50_000
+ROW_GROUP_ROWS = 128 * 1024
+MAX_WRITERS    = 64                                # open files per PartitionedWriter
+NULL_PART      = "__HIVE_DEFAULT_PARTITION__"      # pyarrow / DuckDB spelling of NULL
+# dictionary-encode only the low-cardinality strings (of any dataset); url /
+# docket_number / description are near-unique, so a dictionary page would
+# just duplicate the data
+PARQUET_OPTS   = dict(compression="zstd", write_statistics=True,
+                      use_dictionary=["court_slug", "nature_of_suit", "outcome", "disposition",
+                                      "category", "role"])
 
 # ─────────────────────────── docket → case parquet ──────────────────────────
 COLS = {
@@ -22,55 +103,658 @@ COLS = {
     "date_terminated": "closing_date",
     "nature_of_suit" : "nature_of_suit",
     "nos_code"       : "nature_of_suit_numeric",
+    "assigned_to"    : "judge_id",
+}
+
+# derived here from `nature_of_suit`, not served by the API
+DERIVED_COLS = {"nos_code"}
+# what the fetcher asks for via `fields=` – kept in lock-step with COLS, plus
+# the FJC Integrated Database block the outcomes are read from
+API_FIELDS   = [c for c in COLS if c not in DERIVED_COLS] + ["idb_data"]
+
+SCHEMA = pa.schema([
+    ("case_id",                pa.int64()),
+    ("url",                    pa.string()),
+    ("court_slug",             pa.string()),
+    ("docket_number",          pa.string()),
+    ("filing_date",            pa.date32()),
+    ("closing_date",           pa.date32()),
+    ("nature_of_suit",         pa.string()),
+    ("nature_of_suit_numeric", pa.int16()),
+    ("judge_id",               pa.int64()),
+])
+
+OUTCOME_SCHEMA = pa.schema([
+    ("case_id",      pa.int64()),
+    ("outcome",      pa.string()),
+    ("disposition",  pa.string()),
+    ("outcome_date", pa.date32()),
+    ("win_bool",     pa.bool_()),
+])
+
+# FJC IDB civil DISP code → (disposition, outcome)
+IDB_DISPOSITIONS = {
+    0:  ("transfer to another district",          "transferred"),
+    1:  ("remanded to state court",               "transferred"),
+    10: ("multi-district litigation transfer",    "transferred"),
+    11: ("remanded to U.S. agency",               "transferred"),
+    2:  ("dismissed: want of prosecution",        "dismissed"),
+    3:  ("dismissed: lack of jurisdiction",       "dismissed"),
+    12: ("dismissed: voluntarily",                "dismissed"),
+    14: ("dismissed: other",                      "dismissed"),
+    13: ("settled",                               "settled"),
+    4:  ("judgment on default",                   "judgment"),
+    5:  ("judgment on consent",                   "judgment"),
+    6:  ("judgment on motion before trial",       "judgment"),
+    7:  ("judgment on jury verdict",              "judgment"),
+    8:  ("judgment on directed verdict",          "judgment"),
+    9:  ("judgment on court trial",               "judgment"),
+    15: ("award of arbitrator",                   "judgment"),
+    19: ("appeal affirmed (magistrate judge)",    "judgment"),
+    20: ("appeal denied (magistrate judge)",      "judgment"),
+    16: ("stayed pending bankruptcy",             "other"),
+    17: ("other",                                 "other"),
+    18: ("statistical closing",                   "other"),
 }
+# IDB JUDGMENT: 1 plaintiff, 2 defendant (3 both / 4 unknown → no winner)
+IDB_WINNER = {1: True, 2: False}
+
+SLUG_RE = r"/courts/(?P<slug>[^/]+)/?$"
+REF_RE  = r"(?P<id>\d+)/?$"                       # API references: an id, or a URL ending in one
+
+
+def _first_capture(arr: pa.Array, pattern: str) -> pa.Array:
+    """Vectorised `str.extract`: the first named group, null where no match."""
+    return pc.struct_field(pc.extract_regex(arr, pattern), [0])
+
+
+def _ref_ids(values: List) -> pa.Array:
+    """Ids out of API references, whether served as ints or as URLs."""
+    arr = pa.array([None if v is None else str(v) for v in values], pa.string())
+    return _first_capture(arr, REF_RE).cast(pa.int64())
+
+
+def _first_seen(ids: List, seen: set) -> pa.Array:
+    """Mask keeping the first row per id (and no null ids) across a file's batches."""
+    keep = []
+    for i in ids:
+        keep.append(i is not None and i not in seen)
+        seen.add(i)
+    return pa.array(keep)
+
+
+def _idb(records: List[dict]) -> Tuple[List, List, List]:
+    """(disposition code, judgment code, termination date) per record; None where IDB has none."""
+    disp, judg, term = [], [], []
+    for r in records:
+        idb = r.get("idb_data")
+        if not isinstance(idb, dict):
+            idb = {}
+        for out, field in ((disp, "disposition"), (judg, "judgment")):
+            v = idb.get(field)
+            out.append(int(v) if isinstance(v, (int, str)) and str(v).isdigit() else None)
+        term.append((idb.get("termination_date") or "")[:10] or None)
+    return disp, judg, term
+
+
+def _to_table(records: List[dict], seen: set[int]) -> pa.Table:
+    """
+    Project one batch of raw dockets onto SCHEMA + OUTCOME_SCHEMA (one wide
+    table, split by the writer), dropping ids already seen in this file.
+    """
+    ids  = [r.get("id") for r in records]
+    keep = _first_seen(ids, seen)
+
+    col = {raw: pa.array([r.get(raw) for r in records], pa.string())
+           for raw in API_FIELDS if raw not in ("id", "assigned_to", "idb_data")}
+    nos = pc.fill_null(col["nature_of_suit"], "Unknown")
+    nos_code = parse_codes(nos)
+    disp, judg, term = _idb(records)
+    closing = col["date_terminated"].cast(pa.date32())
+
+    tbl = pa.table({
+        "case_id":                pa.array(ids, pa.int64()),
+        "url":                    col["absolute_url"],
+        "court_slug":             _first_capture(col["court"], SLUG_RE),
+        "docket_number":          col["docket_number"],
+        "filing_date":            col["date_filed"].cast(pa.date32()),
+        "closing_date":           closing,
+        "nature_of_suit":         nos,
+        "nature_of_suit_numeric": pa.array(nos_code, pa.int16(), mask=nos_code < 0),
+        "judge_id":               _ref_ids([r.get("assigned_to") for r in records]),
+        "outcome":                pa.array([IDB_DISPOSITIONS.get(d, (None, None))[1] for d in disp], pa.string()),
+        "disposition":            pa.array([IDB_DISPOSITIONS.get(d, (None, None))[0] for d in disp], pa.string()),
+        "outcome_date":           pc.coalesce(pa.array(term, pa.string()).cast(pa.date32()), closing),
+        "win_bool":               pa.array([IDB_WINNER.get(j) for j in judg], pa.bool_()),
+    })
+    return tbl.filter(keep)
+
+
+def _record_batches(path: Path, batch_rows: int) -> Iterator[List[dict]]:
+    buf: List[dict] = []
+    for rec in iter_records(path):
+        buf.append(rec)
+        if len(buf) >= batch_rows:
+            yield buf
+            buf = []
+    if buf:
+        yield buf
+
+
+def iter_docket_batches(path: Path, batch_rows: int = BATCH_ROWS) -> Iterator[pa.Table]:
+    """Yield tidy Arrow tables (cases + outcome columns) of at most `batch_rows` rows from one raw file."""
+    seen: set[int] = set()
+    for buf in _record_batches(path, batch_rows):
+        yield _to_table(buf, seen)
 
-slug_re = re.compile(r"/courts/([^/]+)/?$")
 
 def parse_docket_file(path: Path) -> pd.DataFrame:
-    if path.stat().st_size == 0:
+    """Whole-file convenience wrapper; prefer `transform_file` for big inputs."""
+    tables = [t.select(SCHEMA.names) for t in iter_docket_batches(path)]
+    if not tables:
         return pd.DataFrame()
+    return pa.concat_tables(tables).to_pandas()
+
+
+def _outcomes(tbl: pa.Table) -> pa.Table:
+    """The rows of a docket batch that carry an IDB disposition."""
+    return tbl.filter(pc.is_valid(tbl["outcome"]))
+
+
+# ───────────────────── docket entries / parties → parquet ────────────────────
+FILING_SCHEMA = pa.schema([
+    ("filing_id",   pa.int64()),
+    ("case_id",     pa.int64()),
+    ("seq_no",      pa.int32()),
+    ("entry_date",  pa.date32()),
+    ("category",    pa.string()),
+    ("description", pa.string()),
+])
+
+PARTY_SCHEMA = pa.schema([
+    ("party_id", pa.int64()),
+    ("case_id",  pa.int64()),
+    ("name",     pa.string()),
+    ("role",     pa.string()),
+])
+
+# what the fetcher asks for on docket-entries/ and parties/
+ENTRY_FIELDS = ["id", "docket", "entry_number", "date_filed", "short_description", "description"]
+PARTY_FIELDS = ["id", "name", "party_types"]
+
+ORIGIN_RE = re.compile(r"^[a-z-]+_(?P<court>[^_]+)_(?:(?P<year>\d{4})-(?P<month>\d{2})-\d{2}_)?")
+
+
+def _filings_table(records: List[dict], seen: set) -> pa.Table:
+    ids = [r.get("id") for r in records]
+    tbl = pa.table({
+        "filing_id":   pa.array(ids, pa.int64()),
+        "case_id":     _ref_ids([r.get("docket") for r in records]),
+        "seq_no":      pa.array([r.get("entry_number") for r in records], pa.int32()),
+        "entry_date":  pa.array([r.get("date_filed") for r in records], pa.string()).cast(pa.date32()),
+        "category":    pa.array([r.get("short_description") or None for r in records], pa.string()),
+        "description": pa.array([r.get("description") for r in records], pa.string()),
+    }, schema=FILING_SCHEMA)
+    return tbl.filter(_first_seen(ids, seen))
+
+
+def _parties_table(records: List[dict], seen: set) -> pa.Table:
+    """
+    One row per (party, docket). A party on several dockets gets a row for
+    each, with its role there – the first one listed if it has several.
+    """
+    ids, dockets, names, roles = [], [], [], []
+    for r in records:
+        for role in r.get("party_types") or []:
+            if isinstance(role, dict) and role.get("docket"):
+                ids.append(r.get("id"))
+                dockets.append(role["docket"])
+                names.append(r.get("name"))
+                roles.append((role.get("name") or "").strip().lower() or None)
+    tbl = pa.table({
+        "party_id": pa.array(ids, pa.int64()),
+        "case_id":  _ref_ids(dockets),
+        "name":     pa.array(names, pa.string()),
+        "role":     pa.array(roles, pa.string()),
+    }, schema=PARTY_SCHEMA)
+    keys = [None if None in k else k for k in zip(tbl["party_id"].to_pylist(), tbl["case_id"].to_pylist())]
+    return tbl.filter(_first_seen(keys, seen))
+
+
+class Related(NamedTuple):
+    root:   Path                                   # processed dataset (= Postgres table name)
+    schema: pa.Schema
+    key:    str                                    # per-file sort order
+    build:  Callable[[List[dict], set], pa.Table]
+
+
+# raw stem prefix (without `-delta`) → dataset
+RELATED = {
+    "entries": Related(FILINGS_DIR, FILING_SCHEMA, "filing_id", _filings_table),
+    "parties": Related(PARTIES_DIR, PARTY_SCHEMA, "party_id", _parties_table),
+}
+
+
+def _related_spec(src_name: str) -> Related | None:
+    return RELATED.get(src_name.split("_", 1)[0].removesuffix("-delta"))
+
+
+def _origin_keys(src: Path, rows: int) -> pa.Table:
+    """Partition keys for an entries / parties shard: its slice's court and filing month."""
+    m = ORIGIN_RE.match(stem_of(src))
+    court = m["court"] if m else None
+    year, month = (int(m["year"]), int(m["month"])) if m and m["year"] else (None, None)
+    return pa.table({"court": pa.nulls(rows, pa.string()) if court is None else pa.repeat(court, rows),
+                     "year":  pa.repeat(pa.scalar(year, pa.int64()), rows),
+                     "month": pa.repeat(pa.scalar(month, pa.int64()), rows)})
+
+
+def _eq(arr: pa.Array, value) -> pa.Array:
+    """Null-safe equality mask."""
+    return pc.is_null(arr) if value is None else pc.fill_null(pc.equal(arr, value), False)
+
+
+def _case_keys(tbl: pa.Table) -> pa.Table:
+    """court / year / month partition keys of docket rows."""
+    return pa.table({"court": tbl["court_slug"], "year": pc.year(tbl["filing_date"]),
+                     "month": pc.month(tbl["filing_date"])})
+
+
+class PartitionedWriter:
+    """
+    Stream tables into court/year/month partitions, as `<basename>.parquet`
+    in each partition touched.
+
+    Rows are buffered per partition up to ROW_GROUP_ROWS and sorted by
+    `sort_key` before each row group is written; a file whose row groups
+    arrive out of order is re-sorted once at close (it holds one raw shard's
+    rows at most).
+
+    At most `max_open` files are open at once (a delta across every court
+    touches thousands of partitions): the least recently written one is
+    closed, and if its partition gets more rows later they go to a new part
+    file, `<basename>-<n>.parquet`, next to it.
+    """
+
+    def __init__(self, root: Path, basename: str, schema: pa.Schema = SCHEMA,
+                 sort_key: str = "case_id", max_open: int = MAX_WRITERS) -> None:
+        self.root     = root
+        self.basename = basename
+        self.schema   = schema
+        self.sort_key = sort_key
+        self.max_open = max_open
+        self._bufs:    dict[tuple, List[pa.Table]] = {}
+        self._writers: OrderedDict[tuple, pq.ParquetWriter] = OrderedDict()   # open, LRU first
+        self._parts:   dict[tuple, int] = {}                # files started per partition
+        self._max_id:  dict[tuple, int] = {}
+        self._unsorted: set[Path] = set()
+        self.outputs:  List[Path] = []
+        self.rows = 0
+
+    def path(self, key: tuple, part: int = 0) -> Path:
+        court, year, month = key
+        return (self.root / f"court={court or NULL_PART}"
+                          / f"year={NULL_PART if year is None else year}"
+                          / f"month={NULL_PART if month is None else f'{month:02d}'}"
+                          / f"{self.basename}{f'-{part}' if part else ''}.parquet")
+
+    def write(self, tbl: pa.Table, keys: pa.Table | None = None) -> None:
+        """Buffer `tbl`; `keys` holds each row's court / year / month (default: its own docket's)."""
+        if tbl.num_rows == 0:
+            return
+        court, year, month = (_case_keys(tbl) if keys is None else keys).columns
+        keys = pa.table({"c": court, "y": year, "m": month}).group_by(["c", "y", "m"]).aggregate([])
+        tbl  = tbl.select(self.schema.names)
+        for key in zip(*(keys[c].to_pylist() for c in ("c", "y", "m"))):
+            part = tbl.filter(pc.and_(pc.and_(_eq(court, key[0]), _eq(year, key[1])), _eq(month, key[2])))
+            self._bufs.setdefault(key, []).append(part)
+            if sum(t.num_rows for t in self._bufs[key]) >= ROW_GROUP_ROWS:
+                self._flush(key)
+        self.rows += tbl.num_rows
+
+    def close(self) -> None:
+        for key in list(self._bufs):
+            self._flush(key)
+        while self._writers:
+            self._writers.popitem(last=False)[1].close()
+        for path in self._unsorted:
+            _write_parquet(pq.read_table(path, schema=self.schema).sort_by(self.sort_key), path)
+
+    def abort(self) -> None:
+        for writer in self._writers.values():
+            writer.close()
+        for path in self.outputs:
+            path.unlink(missing_ok=True)
+
+    def _open(self, key: tuple) -> pq.ParquetWriter:
+        if key in self._writers:
+            self._writers.move_to_end(key)
+            return self._writers[key]
+        if len(self._writers) >= self.max_open:
+            self._writers.popitem(last=False)[1].close()
+        path = self.path(key, self._parts.get(key, 0))
+        self._parts[key] = self._parts.get(key, 0) + 1
+        self._max_id.pop(key, None)                         # a new file starts sorted
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.outputs.append(path)
+        self._writers[key] = pq.ParquetWriter(path, self.schema, **PARQUET_OPTS)
+        return self._writers[key]
+
+    def _flush(self, key: tuple) -> None:
+        tables = self._bufs.pop(key, [])
+        if not tables:
+            return
+        tbl    = pa.concat_tables(tables).sort_by(self.sort_key)
+        writer = self._open(key)
+        if key in self._max_id and pc.min(tbl[self.sort_key]).as_py() < self._max_id[key]:
+            self._unsorted.add(Path(writer.where))
+        self._max_id[key] = pc.max(tbl[self.sort_key]).as_py()
+        writer.write_table(tbl, row_group_size=ROW_GROUP_ROWS)
+
+
+def _write_parquet(tbl: pa.Table, path: Path) -> None:
+    pq.write_table(tbl, path, row_group_size=ROW_GROUP_ROWS, **PARQUET_OPTS)
+
+
+def transform_file(src: Path, root: Path = CASES_DIR, batch_rows: int = BATCH_ROWS, *,
+                   seen: IdBitmap | None = None,
+                   updates_root: Path = UPDATES_DIR,
+                   outcomes_root: Path = OUTCOMES_DIR) -> Tuple[List[Path], int, np.ndarray]:
+    """
+    Stream one raw dockets file into its partitions under `root` (and its
+    outcomes under `outcomes_root`); rows whose case_id is in `seen` go to
+    `updates_root` instead, and their outcomes to `<raw mtime>_<stem>` files
+    next to the others. Returns (outputs, rows, new ids).
+    """
+    writer   = PartitionedWriter(root, stem_of(src))
+    updates  = PartitionedWriter(updates_root, _update_basename(src))
+    outcomes = PartitionedWriter(outcomes_root, stem_of(src), OUTCOME_SCHEMA)
+    refetch  = PartitionedWriter(outcomes_root, _update_basename(src), OUTCOME_SCHEMA)
+    new_ids: List[np.ndarray] = []
+    try:
+        for tbl in iter_docket_batches(src, batch_rows):
+            out = _outcomes(tbl)
+            if seen is None:
+                writer.write(tbl)
+                outcomes.write(out)
+                continue
+            dup = seen.contains(tbl["case_id"].to_numpy())
+            writer.write(tbl.filter(pa.array(~dup)))
+            updates.write(tbl.filter(pa.array(dup)))
+            new_ids.append(tbl["case_id"].to_numpy()[~dup])
+            dup = seen.contains(out["case_id"].to_numpy())
+            outcomes.write(out.filter(pa.array(~dup)))
+            refetch.write(out.filter(pa.array(dup)))
+        for w in (writer, updates, outcomes, refetch):
+            w.close()
+    except Exception:
+        for w in (writer, updates, outcomes, refetch):
+            w.abort()
+        raise
+    return (writer.outputs + updates.outputs + outcomes.outputs + refetch.outputs,
+            writer.rows + updates.rows,
+            np.concatenate(new_ids) if new_ids else np.empty(0, np.int64))
+
+
+def transform_related(src: Path, batch_rows: int = BATCH_ROWS) -> Tuple[List[Path], int]:
+    """Stream one raw entries / parties file into its dataset. Returns (outputs, rows)."""
+    spec   = _related_spec(src.name)
+    writer = PartitionedWriter(spec.root, stem_of(src), spec.schema, spec.key)
+    seen: set[int] = set()
+    try:
+        for buf in _record_batches(src, batch_rows):
+            tbl = spec.build(buf, seen)
+            writer.write(tbl, _origin_keys(src, tbl.num_rows))
+        writer.close()
+    except Exception:
+        writer.abort()
+        raise
+    return writer.outputs, writer.rows
+
+
+def _update_basename(src: Path) -> str:
+    """`<raw mtime>_<stem>`: sorts cases_updates files in the order they were fetched."""
+    mtime = datetime.fromtimestamp(src.stat().st_mtime, timezone.utc)
+    return f"{mtime:{STAMP_FMT}}_{stem_of(src)}"
+
+
+# ───────────────────────────── case_id index ────────────────────────────────
+def _claims_ids(src_name: str) -> bool:
+    return src_name.startswith("dockets_")
+
+
+def _case_outputs(entry: dict) -> List[Path]:
+    return [PROC_DIR / o for o in entry.get("outputs", []) if Path(o).parts[0] == CASES_DIR.name]
+
+
+def _read_ids(paths: List[Path]) -> np.ndarray:
+    ids = [pq.read_table(p, columns=["case_id"])["case_id"].to_numpy() for p in paths if p.exists()]
+    return np.concatenate(ids) if ids else np.empty(0, np.int64)
+
+
+def _load_index(manifest: JsonManifest, rebuild: bool = False) -> IdBitmap:
+    """The case_id bitmap, rebuilt from the cases outputs when it is missing or out of step."""
+    index   = IdBitmap(ID_INDEX)
+    claimed = sum(e.get("claimed", 0) for n, e in manifest.data.items() if _claims_ids(n))
+    if rebuild or len(index) != claimed:
+        log.info("↻ rebuilding case_id index from %d processed files", len(manifest.data))
+        index.clear()
+        for name, entry in list(manifest.data.items()):
+            if _claims_ids(name) and "claimed" in entry:
+                ids = np.unique(_read_ids(_case_outputs(entry)))
+                manifest.update(name, claimed=int((~index.contains(ids)).sum()))
+                index.add(ids)
+    return index
+
+
+def _reroute(outputs: List[str], conflicts: np.ndarray, src: Path) -> List[str]:
+    """
+    Move rows whose id another file claimed first (in this same run) from the
+    file's cases and outcomes outputs into its re-fetch outputs (cases_updates/
+    and the stamped outcomes files).
+    """
+    stamped = _update_basename(src)
+    routes  = {CASES_DIR.name: (UPDATES_DIR, SCHEMA), UPDATES_DIR.name: (UPDATES_DIR, SCHEMA),
+               OUTCOMES_DIR.name: (OUTCOMES_DIR, OUTCOME_SCHEMA)}
+    keep, moved = [], defaultdict(list)
+    for o in outputs:
+        path = PROC_DIR / o
+        root, schema = routes[Path(o).parts[0]]
+        tbl  = pq.read_table(path, schema=schema)
+        if path.name.startswith(stamped):              # rewritten below, with the moved rows
+            moved[root].append((tbl, _path_keys(path, tbl.num_rows)))
+            path.unlink()
+            continue
+        hit = pc.is_in(tbl["case_id"], pa.array(conflicts))
+        if pc.any(hit).as_py():
+            moved[root].append((tbl.filter(hit), _path_keys(path, pc.sum(hit).as_py())))
+            tbl = tbl.filter(pc.invert(hit))
+            if tbl.num_rows:
+                _write_parquet(tbl, path)
+            else:
+                _drop_outputs({"outputs": [o]})
+                continue
+        keep.append(o)
+    for root, tables in moved.items():
+        updates = PartitionedWriter(root, stamped, routes[root.name][1])
+        for tbl, keys in tables:
+            updates.write(tbl, keys)
+        updates.close()
+        keep += [str(p.relative_to(PROC_DIR)) for p in updates.outputs]
+    return keep
+
+
+def _path_keys(path: Path, rows: int) -> pa.Table:
+    """Partition keys putting `rows` rows back in the partition `path` sits in."""
+    part = {k: None if v == NULL_PART else v for k, _, v in
+            (p.partition("=") for p in path.parts if p.startswith(("court=", "year=", "month=")))}
+    return pa.table({"court": pa.repeat(pa.scalar(part["court"], pa.string()), rows),
+                     "year":  pa.repeat(pa.scalar(part["year"] and int(part["year"]), pa.int64()), rows),
+                     "month": pa.repeat(pa.scalar(part["month"] and int(part["month"]), pa.int64()), rows)})
+
+
+# ───────────────────────────── change detection ─────────────────────────────
+def _sha1(path: Path) -> str:
+    h = hashlib.sha1()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _is_current(src: Path, manifest: JsonManifest) -> bool:
+    """True when `src` matches its manifest entry and every recorded output still exists."""
+    entry = manifest.get(src.name)
+    if not entry or not all((PROC_DIR / o).exists() for o in entry["outputs"]):
+        return False
+    if entry.get("version", 1) != VERSION:
+        return False                                        # written with an older schema / layout
+    if _claims_ids(src.name) and "claimed" not in entry:
+        return False                                        # written before the case_id index
+    st = src.stat()
+    if st.st_size != entry["size"]:
+        return False
+    if st.st_mtime_ns == entry["mtime_ns"]:
+        return True
+    if _sha1(src) != entry["sha1"]:
+        return False
+    manifest.update(src.name, mtime_ns=st.st_mtime_ns)      # touched but identical
+    return True
+
+
+def _drop_outputs(entry: dict) -> None:
+    for o in entry.get("outputs", []):
+        path = PROC_DIR / o
+        path.unlink(missing_ok=True)
+        for parent in path.parents:                 # prune emptied partition dirs
+            if parent == PROC_DIR or any(parent.iterdir()):
+                break
+            parent.rmdir()
+
+
+# ───────────────────────────────── driver ───────────────────────────────────
+_SEEN: IdBitmap | None = None
+
+
+def _init_worker(index_path: Path) -> None:
+    """Each worker routes against the index snapshot taken when the run started."""
+    global _SEEN
+    _SEEN = IdBitmap(index_path)
+
+
+def _transform_one(src: Path) -> Tuple[List[str], int, float, str, np.ndarray]:
+    """Process-pool worker: (outputs, rows, seconds, sha1, new ids). Never leaves a half-written parquet."""
+    t0 = time.perf_counter()
+    if _related_spec(src.name):
+        (outputs, rows), new_ids = transform_related(src), np.empty(0, np.int64)
+    else:
+        outputs, rows, new_ids = transform_file(src, seen=_SEEN if _claims_ids(src.name) else None)
+    return ([str(p.relative_to(PROC_DIR)) for p in outputs], rows,
+            time.perf_counter() - t0, _sha1(src), new_ids)
+
+
+def _run(todo: List[Path], jobs: int, manifest: JsonManifest, index: IdBitmap) -> Tuple[int, List[str]]:
+    """Transform `todo` on `jobs` processes, claiming new ids in `index`; returns (rows, failed names)."""
+    index.save()
+    total_rows, failed = 0, []
+    try:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(ID_INDEX,)) as pool:
+            futures = {pool.submit(_transform_one, f): f for f in todo}
+            for fut in as_completed(futures):
+                src = futures[fut]
+                try:
+                    outputs, rows, secs, sha1, new_ids = fut.result()
+                    # ids another file of this run claimed after the snapshot
+                    conflicts = new_ids[index.contains(new_ids)]
+                    if len(conflicts):
+                        log.info("↻ %s: %d case_ids claimed by another file – rerouting to updates",
+                                 src.name, len(conflicts))
+                        outputs  = _reroute(outputs, conflicts, src)
+                        new_ids  = new_ids[~index.contains(new_ids)]
+                except Exception as err:            # one bad file must not sink the run
+                    log.error("✗ %s failed: %s", src.name, err)
+                    failed.append(src.name)
+                    if manifest.get(src.name):      # stale entry → retried next run
+                        _drop_outputs(manifest.pop(src.name))
+                    continue
+                index.add(new_ids)
+                st = src.stat()
+                stale = set(manifest.get(src.name, {}).get("outputs", [])) - set(outputs)
+                _drop_outputs({"outputs": sorted(stale)})
+                manifest.update(src.name, size=st.st_size, mtime_ns=st.st_mtime_ns, sha1=sha1,
+                                outputs=outputs, rows=rows, claimed=len(new_ids), version=VERSION)
+                total_rows += rows
+                log.info(" → %s: %d rows%s in %.1fs", src.name, rows,
+                         f" ({len(new_ids)} new case_ids)" if _claims_ids(src.name) else "", secs)
+    finally:
+        index.save()
+    return total_rows, failed
 
-    records = [json.loads(l) for l in path.read_text().splitlines() if l.strip()]
-    if not records:
-        return pd.DataFrame()
 
-    df = pd.json_normalize(records)
+def _release(src: Path, manifest: JsonManifest, index: IdBitmap) -> np.ndarray:
+    """Un-claim the ids a dockets file's current outputs hold (it is about to be rewritten)."""
+    entry = manifest.get(src.name)
+    if not (entry and _claims_ids(src.name)):
+        return np.empty(0, np.int64)
+    ids = _read_ids(_case_outputs(entry))
+    index.discard(ids)
+    manifest.update(src.name, claimed=0)
+    return ids
 
-    df["nature_of_suit"] = (
-        df["nature_of_suit"]
-          .fillna("Unknown")
-          .astype("string")
-    )
 
-    df["nos_code"] = (
-        df["nature_of_suit"]
-          .str.extract(r"^(\d{3})", expand=False)
-          .astype("Int16")
-    )
+def _holders(ids: np.ndarray, manifest: JsonManifest, files: List[Path]) -> List[Path]:
+    """Raw dockets files whose cases_updates outputs hold any of `ids`."""
+    updates = lambda e: [PROC_DIR / o for o in e.get("outputs", []) if Path(o).parts[0] == UPDATES_DIR.name]
+    return [f for f in files if _claims_ids(f.name) and (entry := manifest.get(f.name))
+            and np.isin(_read_ids(updates(entry)), ids).any()]
 
-    for raw in COLS.keys():
-        if raw not in df.columns:
-            df[raw] = pd.NA
 
-    df["court"] = (
-        df["court"]
-          .astype("string")
-          .str.extract(slug_re, expand=False)
-    )
+def main(jobs: int = 1, force: bool = False) -> None:
+    manifest = JsonManifest(MANIFEST)
+    files    = sorted(p for g in RAW_GLOBS for p in RAW_DIR.glob(g))
+    index    = _load_index(manifest)
+    released = [np.empty(0, np.int64)]
 
-    tidy = df[list(COLS.keys())].rename(columns=COLS).drop_duplicates()
-    return tidy
+    # raw files that vanished → their outputs (and claimed ids) go too
+    live = {f.name for f in files}
+    for name in [n for n in manifest.data if n not in live]:
+        log.info("🗑  %s no longer in %s – dropping its outputs", name, RAW_DIR)
+        entry = manifest.pop(name)
+        if _claims_ids(name):
+            released.append(_read_ids(_case_outputs(entry)))
+            index.discard(released[-1])
+        _drop_outputs(entry)
 
+    todo = [f for f in files if force or not _is_current(f, manifest)]
+    released += [_release(f, manifest, index) for f in todo]     # about to be rewritten
+    log.info("Transforming %d of %d raw files on %d jobs (%d case_ids indexed)",
+             len(todo), len(files), jobs, len(index))
 
-def main() -> None:
+    t0, total_rows, failed, done = time.perf_counter(), 0, [], 0
+    while True:
+        rows, bad = _run(todo, jobs, manifest, index) if todo else (0, [])
+        total_rows, failed, done = total_rows + rows, failed + bad, done + len(todo) - len(bad)
+        # a released id no file claimed again survives only as other files' updates:
+        # re-transform those so one of them claims it and the case keeps its cases/ row
+        ids     = np.unique(np.concatenate(released))
+        orphans = ids[~index.contains(ids)]
+        todo    = [f for f in _holders(orphans, manifest, files) if f.name not in failed] if len(orphans) else []
+        if not todo:
+            break
+        log.info("↻ %d released case_ids left only in cases_updates – re-transforming %d file(s)",
+                 len(orphans), len(todo))
+        released = [orphans] + [_release(f, manifest, index) for f in todo]
+    index.save()
 
-    for f in RAW_DIR.glob("dockets_*.jsonl"):
-        log.info("Transforming %s", f.name)
-        tidy = parse_docket_file(f)
-        out  = PROC_DIR / f"{f.stem}.parquet"
-        tidy.to_parquet(out, index=False)
-        log.info(" → %d rows → %s", len(tidy), out)
+    log.info("✓ %d files, %d rows in %.1fs", done, total_rows, time.perf_counter() - t0)
+    if failed:
+        raise RuntimeError(f"{len(failed)} file(s) failed: {', '.join(failed)}")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes")
+    parser.add_argument("--force", action="store_true", help="ignore the manifest, rebuild everything")
+    args = parser.parse_args()
+    main(args.jobs, args.force)
@@ -0,0 +1,45 @@
+"""Tiny JSON-on-disk manifest: thread-safe updates, atomic rewrites."""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict
+
+
+class JsonManifest:
+    """
+    A dict of ``key -> {field: value}`` persisted to one JSON file.
+
+    Every mutation rewrites the file via ``tmp + os.replace`` so a crash can
+    never leave a half-written manifest behind.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path  = Path(path)
+        self._lock = threading.RLock()
+        self.data: Dict[str, Dict[str, Any]] = (
+            json.loads(self.path.read_text()) if self.path.exists() else {}
+        )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return self.data.get(key, default)
+
+    def update(self, key: str, **fields: Any) -> None:
+        with self._lock:
+            self.data.setdefault(key, {}).update(fields)
+            self._save()
+
+    def pop(self, key: str) -> Dict[str, Any] | None:
+        with self._lock:
+            entry = self.data.pop(key, None)
+            self._save()
+            return entry
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self.data, indent=1, sort_keys=True))
+        os.replace(tmp, self.path)
@@ -0,0 +1,60 @@
+import os
+import uuid
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+REPO = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def processed(tmp_path, monkeypatch):
+    """An empty working directory laid out like the repo's (data/processed, sql/)."""
+    monkeypatch.chdir(tmp_path)                     # the pipeline's paths are relative
+    (tmp_path / "sql").symlink_to(REPO / "sql")
+    (tmp_path / "data" / "processed").mkdir(parents=True)
+    return tmp_path / "data" / "processed"
+
+
+def write_rows(path: Path, rows: list[dict], schema: pa.Schema) -> Path:
+    """A processed parquet of `schema` holding `rows`."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    cols = {f.name: [r.get(f.name) for r in rows] for f in schema}
+    pq.write_table(pa.table(cols, schema=schema), path)
+    return path
+
+
+def write_cases(path: Path, rows: list[dict]) -> Path:
+    """A processed cases parquet (transform's schema) holding `rows`."""
+    from src.data.transform import SCHEMA
+    return write_rows(path, rows, SCHEMA)
+
+
+def write_outcomes(path: Path, rows: list[dict]) -> Path:
+    from src.data.transform import OUTCOME_SCHEMA
+    return write_rows(path, rows, OUTCOME_SCHEMA)
+
+
+@pytest.fixture
+def scratch_db(monkeypatch):
+    """A fresh database next to DATABASE_URL's, dropped afterwards; skipped when it is unset."""
+    url = os.getenv("DATABASE_URL")
+    if not url:
+        pytest.skip("DATABASE_URL not set")
+    base   = make_url(url)
+    name   = f"{base.database}_pytest_{uuid.uuid4().hex[:8]}"
+    admin  = create_engine(base, isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        conn.execute(text(f'CREATE DATABASE "{name}"'))
+    scratch = base.set(database=name).render_as_string(hide_password=False)
+    monkeypatch.setattr("src.utils.db.DATABASE_URL", scratch)
+    try:
+        yield scratch
+    finally:
+        with admin.connect() as conn:
+            conn.execute(text(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
+        admin.dispose()
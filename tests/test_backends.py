@@ -0,0 +1,130 @@
+import os
+import threading
+import time
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from dashboard.backends.duckdb import DuckDBBackend
+from tests.conftest import write_cases
+
+DCD, NYSD = "court=dcd/year=2015/month=01", "court=nysd/year=2015/month=02"
+UNDATED   = "court=dcd/year=__HIVE_DEFAULT_PARTITION__/month=__HIVE_DEFAULT_PARTITION__"
+JAN, FEB  = date(2015, 1, 1), date(2015, 2, 1)
+
+
+def _case(case_id: int, court: str, nos: int | None, closing: date | None = None) -> dict:
+    filed = date(2015, 1, 15) if court == "dcd" else FEB
+    return dict(case_id=case_id, url=f"/docket/{case_id}/x/", court_slug=court, docket_number=f"1:{case_id}",
+                filing_date=filed, closing_date=closing, nature_of_suit=None if nos is None else f"{nos} X",
+                nature_of_suit_numeric=nos, judge_id=None)
+
+
+@pytest.fixture
+def dataset(processed):
+    """
+    Six dated dockets over two courts and an undated one; after replaying the changes:
+
+        dcd   1 (442) 45 days, 2 (442) 30 days, 3 (890) 10 days, 4 (no NOS) open, 7 (890) undated
+        nysd  5 (442) 10 days, 6 (442) open
+    """
+    write_cases(processed / "cases" / DCD / "dockets_dcd_2015-01-01_2015-02-01.parquet",
+                [_case(1, "dcd", 442, date(2015, 3, 1)), _case(2, "dcd", 442), _case(3, "dcd", 890),
+                 _case(4, "dcd", None)])
+    write_cases(processed / "cases" / NYSD / "dockets_nysd_2015-02-01_2015-03-01.parquet",
+                [_case(5, "nysd", 442, date(2015, 2, 11)), _case(6, "nysd", 442)])
+    write_cases(processed / "cases" / UNDATED / "dockets_dcd_2015-01-01_2015-02-01.parquet",
+                [dict(_case(7, "dcd", 890), filing_date=None)])
+    # case 2's delta is older than its re-fetch, so the re-fetch's 30 days win
+    write_cases(processed / "cases" / DCD / "delta_dcd_20260101T000000Z.parquet",
+                [_case(2, "dcd", 442, date(2015, 6, 1)), _case(3, "dcd", 890, date(2015, 1, 25))])
+    write_cases(processed / "cases_updates" / DCD / "20260201T000000000000Z_dockets_dcd_2015-01-01_2015-02-01.parquet",
+                [_case(2, "dcd", 442, date(2015, 2, 14))])
+    return processed
+
+
+def _rows(df: pd.DataFrame) -> list[tuple]:
+    return sorted(df.itertuples(index=False, name=None))
+
+
+def test_duckdb_answers_from_the_replayed_dataset(dataset):
+    db = DuckDBBackend(dataset)
+    lo, hi = date(2015, 1, 15), FEB
+    assert db.date_bounds() == (lo, hi)
+    assert db.court_slugs() == ["dcd", "nysd"]
+
+    total, closed, missing, avg, std = db.slice_summary(lo, hi)
+    assert (total, closed, missing, avg) == (6, 4, 1, 23.75)
+    assert std == pytest.approx((3125 / 4 - 23.75 ** 2) ** 0.5)
+    assert db.slice_summary(lo, hi, courts=["nysd"]) == (2, 1, 0, 10.0, 0.0)
+    assert db.slice_summary(lo, hi, codes=[890]) == (1, 1, 0, 10.0, 0.0)
+
+    assert _rows(db.filings_agg("Monthly", None, lo, hi)) == [(JAN, 4), (FEB, 2)]
+    assert _rows(db.filings_agg("Daily", ["dcd"], lo, hi, [442])) == [(lo, 2)]
+    assert _rows(db.nature_of_suit(None, lo, hi)) == [(442, 4), (890, 1)]
+    assert _rows(db.nature_of_suit()) == [(442, 4), (890, 2)]                     # undated counts too
+    assert _rows(db.filings_agg("Yearly")) == [(date(2015, 1, 1), 6)]
+    assert _rows(db.geography_counts()) == [("dcd", 4), ("nysd", 2)]
+    assert _rows(db.geography_counts(lo, hi)) == [("dcd", 4), ("nysd", 2)]
+    assert _rows(db.filings_by_nos([442, 890], "Monthly", None, lo, hi)) == [
+        (JAN, 442, 2), (JAN, 890, 1), (FEB, 442, 2), (FEB, 890, 0)]
+    assert _rows(db.filings_by_court("Monthly", None, lo, hi, top_n=1)) == [(JAN, "dcd", 4), (FEB, "dcd", 0)]
+    assert db.top_courts_by_filings(lo, hi, [442]) == ["dcd", "nysd"]             # tie: by name
+    assert db.top_courts_by_filings(lo, hi, [890]) == ["dcd"]
+
+    assert _rows(db.days_to_close_df(group_by="court", start=lo, end=hi)) == [
+        ("dcd", 10), ("dcd", 30), ("dcd", 45), ("nysd", 10)]
+    stats, hist = db.days_to_close_summary(group_by="nos", start=lo, end=hi, bins=4)
+    assert list(stats.columns) == ["group", "n", "mean", "min", "q1", "median", "q3", "max"]
+    assert _rows(stats.astype({"mean": float, "q1": float, "median": float, "q3": float})) == [
+        (442, 3, 85 / 3, 10, 20.0, 30.0, 37.5, 45), (890, 1, 10.0, 10, 10.0, 10.0, 10.0, 10)]
+    assert _rows(hist) == [(442, 10.0, 19.0, 1), (442, 28.0, 37.0, 1), (442, 37.0, 46.0, 1),
+                           (890, 10.0, 10.25, 1)]
+
+
+def test_duckdb_views_follow_a_rewritten_dataset(dataset):
+    db = DuckDBBackend(dataset)
+    assert db.slice_summary(date(2015, 1, 1), date(2015, 12, 31)).total == 6
+    write_cases(dataset / "cases" / NYSD / "delta_nysd_20260301T000000Z.parquet",
+                [_case(6, "nysd", 442, date(2015, 2, 2))])
+    (dataset / "_manifest.json").write_text("{}")           # what a transform run does
+    assert db.slice_summary(date(2015, 1, 1), date(2015, 12, 31), courts=["nysd"]).closed == 2
+
+
+def test_duckdb_matches_postgres(dataset, scratch_db):
+    from dashboard.backends.parity import _calls, _same
+    from dashboard.backends.postgres import PostgresBackend
+    from src.data import ingest_sql
+
+    ingest_sql.main()
+    ref, alt = PostgresBackend(), DuckDBBackend(dataset)
+    undated = [("nature_of_suit", (), {}), ("filings_agg", ("Yearly",), {}), ("geography_counts", (), {})]
+    differ = [(name, a, kw) for name, a, kw in _calls(ref) + undated
+              if not _same(getattr(ref, name)(*a, **kw), getattr(alt, name)(*a, **kw))]
+    assert differ == []
+
+
+def test_duckdb_queries_survive_a_reload(dataset):
+    db     = DuckDBBackend(dataset)
+    errors, totals = [], set()
+    done   = threading.Event()
+
+    def query():
+        while not done.is_set():
+            try:
+                totals.add(db.slice_summary(date(2015, 1, 1), date(2015, 12, 31)).total)
+            except Exception as err:                        # a view dropped under a running query
+                errors.append(err)
+
+    threads = [threading.Thread(target=query) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for i in range(20):                                     # transform runs, one after another
+        (dataset / "_manifest.json").write_text("{}")
+        os.utime(dataset / "_manifest.json", ns=(i, i))
+        time.sleep(0.01)
+    done.set()
+    for t in threads:
+        t.join()
+    assert errors == [] and totals == {6}
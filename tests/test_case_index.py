@@ -0,0 +1,104 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pyarrow.parquet as pq
+import pytest
+
+from src.data import case_files, transform
+from src.data.raw_sink import RawSink
+from src.utils.id_bitmap import IdBitmap
+
+
+# ── IdBitmap ──────────────────────────────────────────────────────────────
+def test_id_bitmap_membership(tmp_path):
+    ids = IdBitmap(tmp_path / "ids.npy")
+    assert len(ids) == 0 and not ids.contains(np.array([0, 5])).any()
+    ids.add(np.array([0, 7, 8, 1_000_003, 7]))
+    assert len(ids) == 4
+    np.testing.assert_array_equal(ids.contains(np.array([0, 1, 7, 8, 9, 1_000_003, 5_000_000])),
+                                  [True, False, True, True, False, True, False])
+    ids.discard(np.array([7, 9, 10**9]))                 # absent and out-of-range ids are ignored
+    assert len(ids) == 3 and not ids.contains(np.array([7]))[0]
+
+
+def test_id_bitmap_save_and_reload(tmp_path):
+    ids = IdBitmap(tmp_path / "sub" / "ids.npy")
+    ids.add(np.arange(0, 1000, 3))
+    ids.save()
+    again = IdBitmap(tmp_path / "sub" / "ids.npy")
+    assert len(again) == len(ids) == 334
+    assert again.contains(np.array([999]))[0]
+    again.clear()
+    assert len(again) == 0
+
+
+# ── processed cases order ─────────────────────────────────────────────────
+def _touch(path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+    return path
+
+
+def test_updates_and_deltas_interleave_by_fetch_stamp(tmp_path):
+    part  = "court=dcd/year=2015/month=01"
+    base  = _touch(tmp_path / "cases" / part / "dockets_dcd_2015-01-01_2015-02-01.parquet")
+    d_old = _touch(tmp_path / "cases" / part / "delta_dcd_20260101T000000Z.0000.parquet")
+    d_new = _touch(tmp_path / "cases" / part / "delta_dcd_20260301T000000Z.0000.parquet")
+    u_mid = _touch(tmp_path / "cases_updates" / part / "20260201T120000123456Z_dockets_dcd_2015-01-01_2015-02-01.parquet")
+    u_old = _touch(tmp_path / "cases_updates" / part / "20251201T000000000000Z_dockets_dcd_2015-01-01_2015-02-01.parquet")
+    assert case_files.ordered(tmp_path) == [base, u_old, d_old, u_mid, d_new]
+
+
+# ── transform's case_id claims ────────────────────────────────────────────
+def _raw(name: str, ids, closing=None, age: int = 0, disposition: int | None = None) -> None:
+    with RawSink(transform.RAW_DIR, name) as sink:
+        sink.write_many({"id": i, "absolute_url": f"/docket/{i}/x/", "docket_number": f"1:{i}",
+                         "court": "https://x/api/rest/v4/courts/dcd/", "date_filed": "2015-01-15",
+                         "date_terminated": closing, "nature_of_suit": "442 Civil Rights: Jobs",
+                         "idb_data": {"disposition": disposition}}
+                        for i in ids)
+    for p in sink.shards:
+        os.utime(p, (p.stat().st_mtime - age,) * 2)
+
+
+def _ids(dataset: str) -> list[int]:
+    files = sorted((transform.PROC_DIR / dataset).rglob("*.parquet"))
+    return sorted(i for f in files for i in pq.read_table(f, columns=["case_id"])["case_id"].to_pylist())
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)                          # transform's paths are relative
+    transform.PROC_DIR.mkdir(parents=True)
+    transform.RAW_DIR.mkdir(parents=True)
+    return tmp_path
+
+
+def test_repeats_go_to_updates_and_are_promoted_when_the_claim_goes(workdir):
+    _raw("dockets_dcd_a", range(1, 6), age=100)
+    _raw("dockets_dcd_b", range(4, 9), closing="2016-01-01")
+    transform.main()
+    assert _ids("cases") == list(range(1, 9))
+    assert _ids("cases_updates") == [4, 5]
+
+    for p in transform.RAW_DIR.glob("dockets_dcd_a.*"):  # the claiming file goes away
+        p.unlink()
+    transform.main()
+    assert _ids("cases") == list(range(4, 9))            # 4 and 5 now claimed by b
+    assert _ids("cases_updates") == []
+    assert len(IdBitmap(transform.ID_INDEX)) == 5
+
+    transform.main()                                     # and nothing left to do
+    assert _ids("cases") == list(range(4, 9))
+
+
+def test_outcomes_of_repeats_replay_with_their_cases(workdir):
+    _raw("dockets_dcd_a", range(1, 4), age=100, disposition=12)
+    _raw("dockets_dcd_b", range(3, 5), disposition=13)
+    transform.main()
+    files = case_files.ordered(transform.PROC_DIR, "outcomes")
+    ids   = [pq.read_table(f)["case_id"].to_pylist() for f in files]
+    assert [f.name.startswith("dockets_") for f in files] == [True, True, False]
+    assert sorted(ids[0] + ids[1]) == [1, 2, 3, 4] and ids[2] == [3]   # 3's second fetch comes last
+    assert files[2].name.endswith("_dockets_dcd_b.0000.parquet")
@@ -0,0 +1,43 @@
+import pandas as pd
+
+from dashboard.backends import DtcDistribution
+
+
+def _rows(group, days: list[int], bins: int) -> pd.DataFrame:
+    """What days_to_close_summary's SQL returns for one group: stats repeated per non-empty bin."""
+    lo, hi = min(days), max(days)
+    s      = pd.Series(days)
+    binned = ((s - lo) * bins // (hi + 1 - lo) + 1).value_counts().sort_index()
+    return pd.DataFrame({"group": group, "n": len(days), "mean": s.mean(), "lo": lo,
+                         "q1": s.quantile(.25), "median": s.median(), "q3": s.quantile(.75), "hi": hi,
+                         "bin": binned.index, "cnt": binned.values})
+
+
+def test_stats_are_one_row_per_group():
+    df = pd.concat([_rows("dcd", [3, 5, 40, 41, 90], 4), _rows("nysd", [7], 4)])
+    stats, hist = DtcDistribution.from_rows(df, 4)
+    assert list(stats.columns) == ["group", "n", "mean", "min", "q1", "median", "q3", "max"]
+    assert stats.values.tolist() == [["dcd", 5, 35.8, 3, 5.0, 40.0, 41.0, 90],
+                                     ["nysd", 1, 7.0, 7, 7.0, 7.0, 7.0, 7]]
+    assert list(hist.columns) == ["group", "lo", "hi", "count"]
+    assert hist.groupby("group")["count"].sum().to_dict() == {"dcd": 5, "nysd": 1}
+
+
+def test_bins_cover_each_day_they_count():
+    days = [0, 1, 2, 10, 11, 12, 13, 29, 99, 100]
+    for bins in (1, 3, 7, 40):
+        df = _rows("g", days, bins)
+        _, hist = DtcDistribution.from_rows(df, bins)
+        width = (max(days) + 1 - min(days)) / bins
+        assert (hist["hi"] - hist["lo"]).round(9).eq(round(width, 9)).all()
+        assert hist["lo"].min() == min(days) and hist["hi"].max() <= max(days) + 1
+        for day in days:                     # the SQL's bin for `day` is the one whose edges hold it
+            b   = (day - min(days)) * bins // (max(days) + 1 - min(days)) + 1
+            row = hist[(hist["lo"] <= day) & (day < hist["hi"])]
+            assert row.index.tolist() == df.index[df["bin"] == b].tolist()
+        assert hist["count"].sum() == len(days)
+
+
+def test_empty_bins_are_left_out():
+    _, hist = DtcDistribution.from_rows(_rows("g", [0, 99], 10), 10)
+    assert hist[["lo", "hi", "count"]].values.tolist() == [[0.0, 10.0, 1], [90.0, 100.0, 1]]
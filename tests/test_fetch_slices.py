@@ -0,0 +1,38 @@
+import threading
+import time
+from datetime import date
+
+from src.data.fetch_courtlistener import TokenBucket, _month_slices
+
+
+def test_token_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=50.0, burst=5)
+    t0 = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - t0 < 0.05                 # the burst goes straight out
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - t0 >= 5 / 50 * 0.9        # the rest at `rate`
+
+
+def test_token_bucket_is_shared_across_threads():
+    bucket, done = TokenBucket(rate=100.0, burst=1), []
+    t0 = time.monotonic()
+    threads = [threading.Thread(target=lambda: [bucket.acquire() or done.append(1) for _ in range(5)])
+               for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(done) == 20
+    assert time.monotonic() - t0 >= 19 / 100 * 0.9       # 20 requests, one bucket
+
+
+def test_month_slices_clip_to_range():
+    assert list(_month_slices(date(2024, 1, 15), date(2024, 3, 10))) == [
+        (date(2024, 1, 15), date(2024, 1, 31)),
+        (date(2024, 2, 1),  date(2024, 2, 29)),
+        (date(2024, 3, 1),  date(2024, 3, 9)),
+    ]
+    assert list(_month_slices(date(2023, 12, 1), date(2024, 1, 1))) == [(date(2023, 12, 1), date(2023, 12, 31))]
@@ -0,0 +1,41 @@
+import time
+from datetime import date, timedelta
+
+from src.data import fetch_courtlistener as fetch
+from src.data.http_cache import ResponseCache, cache_key
+
+
+def test_cache_key_ignores_host_and_param_order():
+    a = cache_key("https://www.courtlistener.com/api/rest/v4/dockets/?court=dcd", {"page_size": 100})
+    b = cache_key("http://127.0.0.1:8765/api/rest/v4/dockets/", {"page_size": "100", "court": "dcd"})
+    assert a == b
+    assert a != cache_key("https://www.courtlistener.com/api/rest/v4/dockets/", {"court": "nysd"})
+    assert a != cache_key("https://www.courtlistener.com/api/rest/v4/parties/?court=dcd", {"page_size": 100})
+
+
+def test_response_cache_ttl(tmp_path):
+    cache = ResponseCache(tmp_path / "http.sqlite", ttl_hours=1)
+    cache.put("https://x/api/dockets/", {"court": "dcd"}, 200, b'{"results": []}')
+    hit = cache.get("https://y/api/dockets/", {"court": "dcd"})
+    assert hit.status_code == 200 and hit.json() == {"results": []}
+
+    cache.ttl = 0.001
+    time.sleep(0.01)
+    assert cache.get("https://x/api/dockets/", {"court": "dcd"}) is None
+    assert cache.get("https://x/api/dockets/", {"court": "dcd"}, ignore_ttl=True) is not None
+
+
+def test_response_cache_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(tmp_path / "http.sqlite", max_mb=1e-3)       # ~1 KB
+    for i in range(4):
+        cache.put(f"https://x/p/{i}", None, 200, bytes(range(256)) * 2)   # incompressible-ish 512 B
+        cache.get("https://x/p/0")                                      # keep p/0 hot
+    assert cache.get("https://x/p/0") is not None
+    assert cache.get("https://x/p/1") is None
+
+
+def test_only_closed_months_are_cacheable():
+    client = fetch.Client(fetch.TokenBucket(1.0), cache_min_age=90)
+    assert client.cacheable(date.today() - timedelta(days=400))
+    assert not client.cacheable(date.today() - timedelta(days=30))
+    assert not client.cacheable(date.today())
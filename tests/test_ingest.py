@@ -0,0 +1,154 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+
+from tests.conftest import write_cases, write_outcomes, write_rows
+
+PART = "court=dcd/year=2015/month=01"
+
+
+def _case(case_id: int, closing: date | None = None) -> dict:
+    return dict(case_id=case_id, url=f"/docket/{case_id}/x/", court_slug="dcd", docket_number=f"1:{case_id}",
+                filing_date=date(2015, 1, 15), closing_date=closing, nature_of_suit="442 Civil Rights: Jobs",
+                nature_of_suit_numeric=442, judge_id=7)
+
+
+def test_rerun_writes_nothing_and_latest_fetch_wins(processed, scratch_db):
+    from src.data import ingest_sql
+    from src.utils.db import get_engine
+
+    write_cases(processed / "cases" / PART / "dockets_dcd_2015-01-01_2015-02-01.parquet",
+                [_case(i) for i in range(1, 6)])
+    # case 3: re-fetched on Feb 1st, but also in an older and a newer incremental delta
+    write_cases(processed / "cases_updates" / PART / "20260201T000000000000Z_dockets_dcd_2015-01-01_2015-02-01.parquet",
+                [_case(3, date(2016, 2, 1))])
+    write_cases(processed / "cases" / PART / "delta_dcd_20260101T000000Z.parquet",
+                [_case(3, date(2016, 1, 1)), _case(4, date(2016, 1, 1))])
+    write_cases(processed / "cases" / PART / "delta_dcd_20260301T000000Z.parquet",
+                [_case(4, date(2016, 3, 1))])
+
+    ingest_sql.main()
+    engine = get_engine()
+    with engine.connect() as conn:
+        closing = dict(conn.execute(text("SELECT case_id, closing_date FROM cases")).all())
+    assert closing == {1: None, 2: None, 3: date(2016, 2, 1), 4: date(2016, 3, 1), 5: None}
+
+    again = ingest_sql.load_processed(engine)
+    assert (again["inserted"], again["updated"]) == (0, 0)
+
+    # a re-transformed base file (new mtime) is merged again but can't undo the updates
+    base = processed / "cases" / PART / "dockets_dcd_2015-01-01_2015-02-01.parquet"
+    write_cases(base, [_case(i) for i in range(1, 7)])
+    again = ingest_sql.load_processed(engine)
+    assert (again["rows"], again["inserted"], again["updated"]) == (6, 1, 0)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT closing_date FROM cases WHERE case_id = 4")).scalar() == date(2016, 3, 1)
+
+
+
+def test_outcomes_replay_in_fetch_order(processed, scratch_db):
+    from src.data import ingest_sql
+    from src.utils.db import get_engine
+
+    write_cases(processed / "cases" / PART / "dockets_dcd_2015-01-01_2015-02-01.parquet",
+                [_case(i) for i in range(1, 4)])
+    outcomes = processed / "outcomes" / PART
+    write_outcomes(outcomes / "dockets_dcd_2015-01-01_2015-02-01.parquet",
+                   [dict(case_id=3, outcome="dismissed")])
+    # case 3's re-fetch (Feb 1st) settled it; an older delta still says judgment
+    write_outcomes(outcomes / "20260201T000000000000Z_dockets_dcd_2015-02-01_2015-03-01.parquet",
+                   [dict(case_id=3, outcome="settled")])
+    delta = write_outcomes(outcomes / "delta_dcd_20260101T000000Z.parquet",
+                           [dict(case_id=3, outcome="judgment"), dict(case_id=2, outcome="judgment")])
+
+    ingest_sql.main()
+    engine = get_engine()
+    query  = text("SELECT case_id, outcome FROM outcomes ORDER BY case_id")
+    with engine.connect() as conn:
+        assert conn.execute(query).all() == [(2, "judgment"), (3, "settled")]
+
+    # a rewritten delta is merged again – and so is every later file of the stream
+    write_outcomes(delta, [dict(case_id=3, outcome="judgment"), dict(case_id=2, outcome="judgment")])
+    write_outcomes(outcomes / "dockets_dcd_2015-01-01_2015-02-01.parquet",
+                   [dict(case_id=3, outcome="dismissed"), dict(case_id=1, outcome="dismissed")])
+    again = ingest_sql.load_processed(engine)
+    assert again["rows"] == 5
+    with engine.connect() as conn:
+        assert conn.execute(query).all() == [(1, "dismissed"), (2, "judgment"), (3, "settled")]
+
+def test_summary_rows_emptied_by_a_load_are_deleted(processed, scratch_db):
+    from src.data import ingest_sql, summaries
+    from src.utils.db import get_engine
+
+    untyped = dict(_case(2), nature_of_suit=None, nature_of_suit_numeric=None)
+    write_cases(processed / "cases" / PART / "dockets_dcd_2015-01-01_2015-02-01.parquet",
+                [_case(1), untyped, _case(3)])
+    ingest_sql.main()                                # creates the rollup, then fills it
+
+    # case 2 gets its NOS code, emptying the (NULL, open) row; case 1 closes
+    write_cases(processed / "cases" / PART / "delta_dcd_20260101T000000Z.parquet",
+                [_case(1, date(2016, 1, 1)), _case(2, date(2016, 1, 1))])
+    ingest_sql.load_processed(get_engine())
+
+    query = text("SELECT nos, closed, n, dtc_sum FROM case_daily_rollup ORDER BY 1, 2")
+    with get_engine().begin() as conn:
+        rollup = conn.execute(query).all()
+        assert rollup == [(442, False, 1, 0), (442, True, 2, 702)]
+        summaries.rebuild(conn)
+        assert conn.execute(query).all() == rollup
+
+
+def test_a_party_keeps_a_row_per_docket(processed, scratch_db):
+    from src.data import ingest_sql, transform
+    from src.utils.db import get_engine
+
+    write_cases(processed / "cases" / PART / "dockets_dcd_2015-01-01_2015-02-01.parquet",
+                [_case(i) for i in range(1, 4)])
+    agency = {"id": 9, "name": "EEOC", "party_types": [
+        {"docket": "/api/rest/v4/dockets/1/", "name": "Plaintiff"},
+        {"docket": "/api/rest/v4/dockets/1/", "name": "Counter-Defendant"},    # first role per docket kept
+        {"docket": 2, "name": "Defendant"}, {"docket": None, "name": "Intervenor"}]}
+    seen: set = set()
+    first = transform._parties_table([agency, {"id": 5, "name": "Doe", "party_types": [{"docket": 3}]}], seen)
+    again = transform._parties_table([agency], seen)                             # repeats within a file drop
+    assert again.num_rows == 0
+    write_rows(processed / "parties" / PART / "parties_dcd_2015-01-01_2015-02-01.parquet",
+               first.to_pylist(), transform.PARTY_SCHEMA)
+
+    ingest_sql.main()
+    with get_engine().connect() as conn:
+        rows = conn.execute(text("SELECT party_id, case_id, role FROM parties ORDER BY 1, 2")).all()
+    assert rows == [(5, 3, None), (9, 1, "plaintiff"), (9, 2, "defendant")]
+
+
+def test_parties_load_after_every_court(processed, scratch_db):
+    from src.data import ingest_sql, transform
+    from src.utils.db import get_engine
+
+    nysd = "court=nysd/year=2015/month=01"
+    write_cases(processed / "cases" / PART / "dockets_dcd_2015-01-01_2015-02-01.parquet", [_case(1)])
+    write_cases(processed / "cases" / nysd / "dockets_nysd_2015-01-01_2015-02-01.parquet",
+                [dict(_case(2), court_slug="nysd")])
+    # both courts' slices carry the agency's rows on both dockets
+    for part, court in ((PART, "dcd"), (nysd, "nysd")):
+        write_rows(processed / "parties" / part / f"parties_{court}_2015-01-01_2015-02-01.parquet",
+                   [{"party_id": 9, "case_id": 1, "name": "EEOC"}, {"party_id": 9, "case_id": 2, "name": "EEOC"}],
+                   transform.PARTY_SCHEMA)
+
+    groups, serial = ingest_sql._work_groups()
+    assert [t for g in groups for _, t in g].count("parties") == 0 and len(serial) == 2
+    ingest_sql.main(jobs=2)
+    engine = get_engine()
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM parties")).scalar() == 2
+    again = ingest_sql.load_processed(engine, jobs=2, reload=True)
+    assert (again["orphans"], again["unchanged"]) == (0, 6)
+
+
+def test_servers_too_old_for_the_schema_are_refused(processed, scratch_db, monkeypatch):
+    from src.data import ingest_sql
+
+    monkeypatch.setattr(ingest_sql, "MIN_SERVER_VERSION", 10**7)
+    with pytest.raises(RuntimeError, match="too old"):
+        ingest_sql.ensure_schema()
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from src.data import nos_map
+
+
+def _regex(values) -> np.ndarray:
+    out = pd.Series(values, dtype=object).str.extract(r"^(\d{3})")[0]
+    return pd.to_numeric(out).fillna(-1).astype(np.int16).to_numpy()
+
+
+def test_parse_codes_matches_regex():
+    values = ["440 Civil Rights: Other", "442", "44", "", None, "x440", "890: Other",
+              "99 Short", "1234", "/00", ":99", "0001"]
+    np.testing.assert_array_equal(nos_map.parse_codes(values), _regex(values))
+
+
+def test_parse_codes_arrow_inputs():
+    values = ["110 Insurance", None, "abc", "870 Taxes"]
+    expect = np.array([110, -1, -1, 870], dtype=np.int16)
+    np.testing.assert_array_equal(nos_map.parse_codes(pa.array(values)), expect)
+    np.testing.assert_array_equal(nos_map.parse_codes(pa.array(values, pa.large_string())), expect)
+    chunked = pa.chunked_array([values[:2], values[2:]])
+    np.testing.assert_array_equal(nos_map.parse_codes(chunked), expect)
+    np.testing.assert_array_equal(nos_map.parse_codes(pa.array(values).slice(2)), expect[2:])
+    assert len(nos_map.parse_codes(pa.chunked_array([], pa.string()))) == 0
+
+
+def test_parse_codes_numeric_passthrough():
+    codes = nos_map.parse_codes(pd.Series([440.0, np.nan, 1200, -5]))
+    np.testing.assert_array_equal(codes, np.array([440, -1, -1, -1], dtype=np.int16))
+    assert codes.dtype == np.int16
+
+
+def test_lookup_and_titles():
+    tid, chapter = nos_map.lookup(np.array([440, 999, -1]))
+    assert tid[0] >= 0 and chapter[0] >= 0
+    assert tid[1] == tid[2] == -1
+    assert list(nos_map.titles(np.array([440, 999]))) == [nos_map.NOS_MAP[440], None]
@@ -0,0 +1,43 @@
+from datetime import date
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.data import transform
+from src.data.transform import SCHEMA, PartitionedWriter
+
+
+def _cases(ids, court: str) -> pa.Table:
+    rows = [{"case_id": i, "court_slug": court, "filing_date": date(2015, 1, 15)} for i in ids]
+    return pa.table({f.name: [r.get(f.name) for r in rows] for f in SCHEMA}, schema=SCHEMA)
+
+
+def test_open_files_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(transform, "ROW_GROUP_ROWS", 2)            # flush every other row
+    writer = PartitionedWriter(tmp_path, "dockets_x", max_open=2)
+    for batch in range(3):                                       # three courts round-robin
+        for court in ("dcd", "nysd", "cand"):
+            writer.write(_cases([10 - 2 * batch, 11 - 2 * batch], court))
+            assert len(writer._writers) <= 2
+    writer.close()
+
+    names = sorted(p.name for p in writer.outputs)
+    assert len(writer.outputs) == len(set(writer.outputs)) > 3    # partitions were reopened
+    assert "dockets_x.parquet" in names and "dockets_x-1.parquet" in names
+    by_court: dict[str, list[int]] = {}
+    for path in writer.outputs:
+        ids = pq.read_table(path)["case_id"]
+        assert ids.to_pylist() == sorted(ids.to_pylist())        # each part file is sorted
+        by_court.setdefault(path.parts[-4], []).extend(ids.to_pylist())
+    assert {c: sorted(v) for c, v in by_court.items()} == {
+        f"court={c}": [6, 7, 8, 9, 10, 11] for c in ("dcd", "nysd", "cand")}
+
+
+def test_abort_removes_every_part_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(transform, "ROW_GROUP_ROWS", 1)
+    writer = PartitionedWriter(tmp_path, "dockets_x", max_open=1)
+    for court in ("dcd", "nysd", "dcd"):
+        writer.write(_cases([1], court))
+    assert len(writer.outputs) == 3
+    writer.abort()
+    assert not any(tmp_path.rglob("*.parquet"))
@@ -0,0 +1,60 @@
+import threading
+from datetime import date
+
+import pytest
+
+from dashboard.query_plan import QueryPlan
+
+
+def top_courts(start, end, codes=None, limit=5):
+    return ["dcd", "nysd"][:limit]
+
+
+def counts(courts, start=None):
+    return {c: len(c) for c in courts}
+
+
+def test_equivalent_calls_are_collapsed():
+    plan = QueryPlan()
+    a = plan.add(top_courts, date(2015, 1, 1), date(2015, 12, 31), [442, 890])
+    b = plan.add(top_courts, date(2015, 1, 1), end=date(2015, 12, 31), codes=[890, 442, 442], limit=5)
+    c = plan.add(top_courts, date(2015, 1, 1), date(2015, 12, 31), [442])
+    assert a is b and a is not c and len(plan) == 2
+    assert plan.add(counts, []) is plan.add(counts, None)          # an empty list means no filter
+
+
+def test_a_request_argument_is_replaced_by_its_result():
+    plan = QueryPlan(max_workers=2)
+    top  = plan.add(top_courts, date(2015, 1, 1), date(2015, 12, 31), limit=1)
+    geo  = plan.add(counts, top, start=date(2015, 1, 1))
+    assert dict(plan.as_completed()) == {top: ["dcd"], geo: {"dcd": 3}}
+
+
+def test_results_are_yielded_as_they_finish():
+    release = threading.Event()
+
+    def slow():
+        assert release.wait(5)
+        return "slow"
+
+    def fast():
+        return "fast"
+
+    plan = QueryPlan(max_workers=2)
+    plan.add(slow)
+    plan.add(fast)
+    order = []
+    for req, value in plan.as_completed():
+        order.append(value)
+        release.set()                          # slow can only finish once fast was drawn
+    assert order == ["fast", "slow"]
+
+
+def test_a_failing_query_raises_from_as_completed():
+    def broken():
+        raise RuntimeError("boom")
+
+    plan = QueryPlan()
+    plan.add(broken)
+    with pytest.raises(RuntimeError, match="boom"):
+        list(plan.as_completed())
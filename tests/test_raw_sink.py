@@ -0,0 +1,51 @@
+import pytest
+
+from src.data import raw_sink
+from src.data.raw_sink import RawSink, iter_records, stem_of
+
+CODECS = ["gz"] + (["zst"] if raw_sink.zstandard else [])
+
+
+def _read(sink: RawSink) -> list[dict]:
+    return [rec for shard in sink.shards for rec in iter_records(shard)]
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_rotates_at_checkpoints(tmp_path, codec):
+    with RawSink(tmp_path, "dockets_dcd", codec=codec, max_rows=3) as sink:
+        for i in range(10):
+            sink.write({"id": i})
+            sink.checkpoint()
+    assert [p.name for p in sink.shards] == [f"dockets_dcd.{i:04d}.jsonl.{codec}" for i in range(4)]
+    assert [r["id"] for r in _read(sink)] == list(range(10))
+    assert stem_of(sink.shards[1]) == "dockets_dcd.0001"
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_resume_drops_rows_past_checkpoint(tmp_path, codec):
+    sink = RawSink(tmp_path, "s", codec=codec, max_rows=4)
+    sink.write_many({"id": i} for i in range(6))
+    state = sink.checkpoint()                       # 6 rows: shard 0 full, now on shard 1
+    sink.write_many({"id": i} for i in range(6, 9))
+    sink.checkpoint()
+    sink.write_many({"id": i} for i in range(9, 12))
+    sink.close()                                    # "crash" after more rows were written
+
+    with RawSink(tmp_path, "s", codec="other", resume=state) as resumed:
+        assert resumed.codec == codec and resumed.rows == 6
+        resumed.write_many({"id": i} for i in range(100, 102))
+    assert [r["id"] for r in _read(resumed)] == list(range(6)) + [100, 101]
+
+
+def test_fresh_start_clears_every_codec(tmp_path):
+    (tmp_path / "s.jsonl").write_text('{"id": -1}\n')              # legacy plain file
+    with RawSink(tmp_path, "s", codec="gz") as old:
+        old.write({"id": 0})
+    with RawSink(tmp_path, "s.other", codec="gz") as other:       # a different stream survives
+        other.write({"id": 0})
+
+    with RawSink(tmp_path, "s", codec="zst" if raw_sink.zstandard else "gz") as sink:
+        sink.write({"id": 1})
+    left = sorted(p.name for p in tmp_path.iterdir())
+    assert left == sorted([sink.shards[0].name, other.shards[0].name])
+    assert [r["id"] for r in _read(sink)] == [1]